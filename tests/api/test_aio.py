@@ -0,0 +1,92 @@
+"""Tests for the asyncio-native API client."""
+
+import asyncio
+import json
+import typing
+
+import httpx
+import pytest
+
+from varfish_cli.api import aio
+from varfish_cli.exceptions import RestApiCallException
+
+
+def _make_client(
+    fake_conn: typing.Tuple[str, str], handler: typing.Callable, max_concurrency: int = 10
+) -> aio.AsyncVarfishClient:
+    host, token = fake_conn
+    return aio.AsyncVarfishClient(
+        server_url=host,
+        api_token=token,
+        max_concurrency=max_concurrency,
+        transport=httpx.MockTransport(handler),
+    )
+
+
+def test_case_list_follows_pages(fake_conn: typing.Tuple[str, str]):
+    host, token = fake_conn
+    with open("tests/cli/data/cases_case-list.len-1.json", "rt") as inputf:
+        page = json.load(inputf)
+    project_uuid = page["results"][0]["project"]
+    second_url = f"{host}/cases/api/case/list/{project_uuid}/?page=2"
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.headers["Authorization"] == f"Token {token}"
+        if request.url.params.get("page") == "2":
+            return httpx.Response(200, json={**page, "next": None})
+        return httpx.Response(200, json={**page, "next": second_url})
+
+    async def run():
+        async with _make_client(fake_conn, handler) as client:
+            return await aio.case_list(client, project_uuid=project_uuid)
+
+    result = asyncio.run(run())
+
+    assert len(result) == 2
+    assert str(result[0].sodar_uuid) == page["results"][0]["sodar_uuid"]
+
+
+def test_error_raises(fake_conn: typing.Tuple[str, str]):
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(400, json={"detail": ["bad", "request"]})
+
+    async def run():
+        async with _make_client(fake_conn, handler) as client:
+            await aio.varannoset_list(client, project_uuid="fake")
+
+    with pytest.raises(RestApiCallException, match="status code 400: bad request"):
+        asyncio.run(run())
+
+
+def test_error_raises_with_text_body(fake_conn: typing.Tuple[str, str]):
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(502, text="Bad Gateway")
+
+    async def run():
+        async with _make_client(fake_conn, handler) as client:
+            await aio.varannoset_list(client, project_uuid="fake")
+
+    with pytest.raises(RestApiCallException, match="status code 502: Bad Gateway$"):
+        asyncio.run(run())
+
+
+def test_concurrency_is_bounded(fake_conn: typing.Tuple[str, str]):
+    in_flight = 0
+    max_in_flight = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return httpx.Response(200, json=[])
+
+    async def run():
+        async with _make_client(fake_conn, handler, max_concurrency=3) as client:
+            return await asyncio.gather(
+                *[aio.bam_qc_file_list(client, case_import_info_uuid=i) for i in range(10)]
+            )
+
+    assert asyncio.run(run()) == [[]] * 10
+    assert max_in_flight == 3
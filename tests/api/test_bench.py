@@ -0,0 +1,41 @@
+"""Micro-benchmarks for the API layer, run with ``pytest -m extra``."""
+
+import json
+import time
+import types
+import typing
+
+import pydantic
+import pytest
+
+from varfish_cli.api.common import validate_response
+from varfish_cli.api.models import Case
+
+
+@pytest.mark.extra
+def test_bench_validate_case_list():
+    with open("tests/cli/data/cases_case-list.len-1.json", "rt") as inputf:
+        case_json = json.load(inputf)["results"][0]
+    response = types.SimpleNamespace(content=json.dumps([case_json] * 10_000).encode("utf-8"))
+
+    def old_path() -> typing.List[Case]:
+        payload = json.loads(response.content)
+        return pydantic.TypeAdapter(typing.List[Case]).validate_python(payload)
+
+    def new_path() -> typing.List[Case]:
+        return validate_response(typing.List[Case], response)
+
+    timings = {}
+    for name, func in (("old", old_path), ("new", new_path)):
+        func()  # warm up
+        start = time.perf_counter()
+        for _ in range(5):
+            result = func()
+        timings[name] = (time.perf_counter() - start) / 5
+        assert len(result) == 10_000
+
+    print(
+        "validate 10k cases: json.loads + new TypeAdapter %.1f ms, cached validate_json %.1f ms"
+        % (timings["old"] * 1000, timings["new"] * 1000)
+    )
+    assert old_path() == new_path()
@@ -0,0 +1,232 @@
+"""Tests for the on-disk response cache."""
+
+import contextlib
+import json
+import os
+import time
+import types
+import typing
+
+import pytest
+from pytest_mock import MockerFixture
+import requests
+from requests_mock.mocker import Mocker as RequestsMocker
+
+from varfish_cli import api
+from varfish_cli.api.cache import CacheEntry, CacheOptions, ResponseCache
+from varfish_cli.api.client import VarfishClient
+from varfish_cli.config import CommonOptions
+
+
+@pytest.fixture
+def project_json() -> typing.List[typing.Any]:
+    with open("tests/cli/data/projects_project-list.len-2.json", "rt") as inputf:
+        return json.load(inputf)
+
+
+@pytest.fixture
+def cache_options(tmp_path) -> CacheOptions:
+    return CacheOptions(enabled=True, cache_dir=str(tmp_path))
+
+
+@pytest.fixture
+def cached_client(fake_conn: typing.Tuple[str, str], cache_options: CacheOptions) -> VarfishClient:
+    host, token = fake_conn
+    return VarfishClient(server_url=host, api_token=token, cache=ResponseCache(cache_options))
+
+
+def test_revalidate_with_etag(
+    requests_mock: RequestsMocker,
+    fake_conn: typing.Tuple[str, str],
+    cached_client: VarfishClient,
+    project_json,
+):
+    host, _ = fake_conn
+    url = f"{host}/project/api/list"
+    m = requests_mock.get(url, json=project_json, headers={"ETag": '"v1"'})
+    first = api.project_list(server_url=host, api_token="ignored", client=cached_client)
+
+    m = requests_mock.get(
+        url, status_code=304, request_headers={"If-None-Match": '"v1"'}, content=b""
+    )
+    second = api.project_list(server_url=host, api_token="ignored", client=cached_client)
+
+    assert m.call_count == 1
+    assert first == second
+    assert len(second) == 2
+
+
+def test_revalidate_with_last_modified(
+    requests_mock: RequestsMocker,
+    fake_conn: typing.Tuple[str, str],
+    cached_client: VarfishClient,
+    project_json,
+):
+    host, _ = fake_conn
+    url = f"{host}/project/api/list"
+    last_modified = "Wed, 21 Oct 2015 07:28:00 GMT"
+    requests_mock.get(url, json=project_json, headers={"Last-Modified": last_modified})
+    cached_client.cached_get(url)
+
+    m = requests_mock.get(
+        url, status_code=304, request_headers={"If-Modified-Since": last_modified}, content=b""
+    )
+    response = cached_client.cached_get(url)
+
+    assert m.call_count == 1
+    assert response.status_code == 200
+    assert response.json() == project_json
+
+
+def test_changed_resource_replaces_entry(
+    requests_mock: RequestsMocker,
+    fake_conn: typing.Tuple[str, str],
+    cached_client: VarfishClient,
+    project_json,
+):
+    host, _ = fake_conn
+    url = f"{host}/project/api/list"
+    requests_mock.get(url, json=[], headers={"ETag": '"v1"'})
+    cached_client.cached_get(url)
+    requests_mock.get(url, json=project_json, headers={"ETag": '"v2"'})
+    cached_client.cached_get(url)
+
+    m = requests_mock.get(url, status_code=304, request_headers={"If-None-Match": '"v2"'})
+    assert cached_client.cached_get(url).json() == project_json
+    assert m.call_count == 1
+
+
+def test_no_validators_not_cached(
+    requests_mock: RequestsMocker,
+    fake_conn: typing.Tuple[str, str],
+    cached_client: VarfishClient,
+    tmp_path,
+    project_json,
+):
+    host, _ = fake_conn
+    requests_mock.get(f"{host}/project/api/list", json=project_json)
+    cached_client.cached_get(f"{host}/project/api/list")
+
+    assert not (tmp_path / "responses").exists()
+
+
+def test_key_depends_on_token_and_url():
+    key = ResponseCache.key("http://example.com/a", "token-1")
+    assert key == ResponseCache.key("http://example.com/a", "token-1")
+    assert key != ResponseCache.key("http://example.com/a", "token-2")
+    assert key != ResponseCache.key("http://example.com/b", "token-1")
+
+
+def test_expired_entry_discarded(cache_options: CacheOptions):
+    cache = ResponseCache(cache_options.model_copy(update={"ttl": 10}))
+    cache.store("key", _response("http://example.com/a", b"[]"))
+    entry = cache.load("key")
+    assert entry is not None
+
+    cache.refresh("key", entry)
+    cache._write("key", entry.model_copy(update={"stored_at": time.time() - 60}))
+
+    assert cache.load("key") is None
+    assert not os.path.exists(cache._entry_path("key"))
+
+
+def test_lru_eviction(cache_options: CacheOptions):
+    cache = ResponseCache(cache_options.model_copy(update={"max_bytes": 4000}))
+    for i, key in enumerate(("a", "b", "c")):
+        cache.store(key, _response(f"http://example.com/{key}", b"x" * 1000))
+        # make sure that modification times differ
+        os.utime(cache._entry_path(key), (1000 + i, 1000 + i))
+    cache.load("a")  # marks "a" as recently used
+
+    cache.store("d", _response("http://example.com/d", b"x" * 1000))
+
+    assert cache.load("b") is None
+    for key in ("a", "c", "d"):
+        assert cache.load(key) is not None
+
+
+def test_common_options_no_cache(fake_conn: typing.Tuple[str, str], cache_options: CacheOptions):
+    host, token = fake_conn
+    enabled = CommonOptions(
+        varfish_server_url=host, varfish_api_token=token, cache_options=cache_options
+    )
+    disabled = CommonOptions(
+        varfish_server_url=host,
+        varfish_api_token=token,
+        cache_options=cache_options.model_copy(update={"enabled": False}),
+    )
+
+    assert enabled.client.cache is not None
+    assert disabled.client.cache is None
+
+
+def test_client_without_cache_passes_through(
+    requests_mock: RequestsMocker, fake_conn: typing.Tuple[str, str], project_json
+):
+    host, token = fake_conn
+    url = f"{host}/project/api/list"
+    m = requests_mock.get(url, json=project_json, headers={"ETag": '"v1"'})
+    client = VarfishClient(server_url=host, api_token=token)
+
+    client.cached_get(url)
+    client.cached_get(url)
+
+    assert m.call_count == 2
+    assert "If-None-Match" not in m.last_request.headers
+
+
+def _response(url: str, content: bytes) -> requests.Response:
+    return CacheEntry(
+        url=url, stored_at=time.time(), headers={"etag": '"x"'}, content=content
+    ).to_response()
+
+
+def test_cache_disabled_by_default():
+    assert not CacheOptions().enabled
+
+
+def test_state_path(tmp_path):
+    assert CacheOptions(cache_dir=str(tmp_path)).state_path("x.sqlite3") == str(
+        tmp_path / "x.sqlite3"
+    )
+    assert CacheOptions(persist_state=False).state_path("x.sqlite3") == ":memory:"
+
+
+def test_corrupt_entry_is_miss(cache_options: CacheOptions):
+    cache = ResponseCache(cache_options)
+    cache.store("a", _response("http://example.com/a", b"x" * 1000))
+    with open(cache._entry_path("a"), "wb") as outputf:
+        outputf.write(b'{"url": "http://example.com/a", "stored_')
+
+    assert cache.load("a") is None
+
+
+def test_entry_evicted_concurrently_is_miss(cache_options: CacheOptions, mocker: MockerFixture):
+    cache = ResponseCache(cache_options)
+    cache.store("a", _response("http://example.com/a", b"x" * 1000))
+    mocker.patch("varfish_cli.api.cache.os.utime", side_effect=FileNotFoundError)
+
+    assert cache.load("a") is None
+
+
+def test_evict_ignores_concurrently_removed_entries(
+    cache_options: CacheOptions, mocker: MockerFixture
+):
+    cache = ResponseCache(cache_options)
+    cache.store("a", _response("http://example.com/a", b"x" * 1000))
+
+    def vanished():
+        raise FileNotFoundError
+
+    gone = types.SimpleNamespace(name="gone.entry", path="gone.entry", stat=vanished)
+    scandir = os.scandir
+
+    @contextlib.contextmanager
+    def scandir_with_gone(path):
+        with scandir(path) as it:
+            yield [gone] + list(it)
+
+    mocker.patch("varfish_cli.api.cache.os.scandir", side_effect=scandir_with_gone)
+    cache.evict()
+
+    assert cache.load("a") is not None
@@ -0,0 +1,83 @@
+"""Tests for the API operations on cases."""
+
+import json
+import typing
+
+import pytest
+from requests_mock.mocker import Mocker as RequestsMocker
+
+from varfish_cli import api
+from varfish_cli.exceptions import RestApiCallException
+
+
+@pytest.fixture
+def case_json() -> typing.Dict[str, typing.Any]:
+    with open("tests/cli/data/cases_case-list.len-1.json", "rt") as inputf:
+        return json.load(inputf)["results"][0]
+
+
+def test_case_list_iter_fetches_pages_by_number(
+    requests_mock: RequestsMocker,
+    fake_conn: typing.Tuple[str, str],
+    case_json: typing.Dict[str, typing.Any],
+):
+    host, token = fake_conn
+    project_uuid = case_json["project"]
+    endpoint = f"{host}/cases/api/case/list/{project_uuid}/"
+
+    def page(request, context):
+        page_no = int(request.qs.get("page", ["1"])[0])
+        assert request.qs["page_size"] == ["100"]
+        results = [{**case_json, "name": f"case-{page_no}-{i}"} for i in range(2)]
+        return {"count": 5, "next": f"{endpoint}?page={page_no + 1}", "results": results}
+
+    m = requests_mock.get(endpoint, json=page)
+
+    res = api.case_list_iter(server_url=host, api_token=token, project_uuid=project_uuid)
+    first = next(res)
+    assert first.name == "case-1-0"
+    assert m.call_count == 1
+
+    names = [first.name] + [case.name for case in res]
+    assert names == ["case-1-0", "case-1-1", "case-2-0", "case-2-1", "case-3-0", "case-3-1"]
+    assert m.call_count == 3
+
+
+def test_case_list_follows_next_without_count(
+    requests_mock: RequestsMocker,
+    fake_conn: typing.Tuple[str, str],
+    case_json: typing.Dict[str, typing.Any],
+):
+    host, token = fake_conn
+    project_uuid = case_json["project"]
+    endpoint = f"{host}/cases/api/case/list/{project_uuid}/"
+    requests_mock.get(
+        endpoint, json={"next": f"{host}/next-page", "previous": None, "results": [case_json]}
+    )
+    requests_mock.get(
+        f"{host}/next-page", json={"next": None, "previous": endpoint, "results": [case_json]}
+    )
+
+    res = api.case_list(server_url=host, api_token=token, project_uuid=project_uuid)
+
+    assert len(res) == 2
+
+
+def test_db_info_file_destroy_text_error(
+    requests_mock: RequestsMocker,
+    fake_conn: typing.Tuple[str, str],
+):
+    host, token = fake_conn
+    requests_mock.delete(
+        f"{host}/importer/api/database-info-file/vs-uuid/file-uuid/",
+        status_code=400,
+        text="Bad Request",
+    )
+
+    with pytest.raises(RestApiCallException, match="status code 400: Bad Request$"):
+        api.db_info_file_destroy(
+            server_url=host,
+            api_token=token,
+            variant_set_import_info_uuid="vs-uuid",
+            db_info_file_uuid="file-uuid",
+        )
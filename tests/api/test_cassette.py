@@ -0,0 +1,82 @@
+"""Tests for the record/replay transport."""
+
+import typing
+
+import pytest
+import requests
+
+from varfish_cli import api
+from varfish_cli.api.cassette import Cassette, RecordingAdapter, ReplayAdapter
+from varfish_cli.api.client import HttpOptions, VarfishClient
+from varfish_cli.config import CommonOptions
+from varfish_cli.exceptions import InvalidConfiguration
+from varfish_cli.standin import StandInServer
+
+TOKEN = "faKeTOKeN"
+
+
+def test_record_and_replay(tmp_path):
+    path = str(tmp_path / "cassette.json")
+    with StandInServer() as server:
+        project = server.store.add_project("Test Project")
+        for i in range(150):
+            server.store.add_case(project["sodar_uuid"], f"case-{i}")
+        url = server.url
+        with VarfishClient(url, TOKEN, transport=RecordingAdapter(path)) as client:
+            recorded_projects = api.project_list(url, TOKEN, client=client)
+            recorded_cases = api.case_list(url, TOKEN, project["sodar_uuid"], client=client)
+
+    assert len(Cassette.load(path).interactions) == 3
+    with VarfishClient(url, TOKEN, transport=ReplayAdapter(path)) as client:
+        assert api.project_list(url, TOKEN, client=client) == recorded_projects
+        assert api.case_list(url, TOKEN, project["sodar_uuid"], client=client) == recorded_cases
+
+
+def test_replay_repeats_in_order(tmp_path):
+    path = str(tmp_path / "cassette.json")
+    with StandInServer() as server:
+        url = f"{server.url}/project/api/list"
+        with VarfishClient(server.url, TOKEN, transport=RecordingAdapter(path)) as client:
+            client.get(url)
+            server.store.add_project("Test Project")
+            client.get(url)
+
+    client = VarfishClient(server.url, TOKEN, transport=ReplayAdapter(path))
+    assert client.get(url).json() == []
+    assert len(client.get(url).json()) == 1
+    assert len(client.get(url).json()) == 1
+
+
+def test_replay_unknown_request(tmp_path):
+    path = tmp_path / "cassette.json"
+    Cassette().save(str(path))
+    client = VarfishClient(
+        "http://varfish.example.com",
+        TOKEN,
+        http_options=HttpOptions(retry_attempts=1),
+        transport=ReplayAdapter(str(path)),
+    )
+
+    with pytest.raises(requests.ConnectionError, match="No recorded response"):
+        client.get("http://varfish.example.com/project/api/list")
+
+
+def test_common_options_cassette(tmp_path, fake_conn: typing.Tuple[str, str]):
+    host, token = fake_conn
+    path = str(tmp_path / "cassette.json")
+    Cassette().save(path)
+
+    recording = CommonOptions(
+        varfish_server_url=host, varfish_api_token=token, record_cassette=path
+    )
+    replaying = CommonOptions(
+        varfish_server_url=host, varfish_api_token=token, replay_cassette=path
+    )
+    both = CommonOptions(
+        varfish_server_url=host, varfish_api_token=token, record_cassette=path, replay_cassette=path
+    )
+
+    assert isinstance(recording.client.session.get_adapter(host), RecordingAdapter)
+    assert isinstance(replaying.client.session.get_adapter(host), ReplayAdapter)
+    with pytest.raises(InvalidConfiguration):
+        both.client
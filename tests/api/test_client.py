@@ -0,0 +1,209 @@
+"""Tests for the pooled HTTP client."""
+
+import gzip
+import json
+import typing
+
+import pydantic
+import pytest
+from pytest_mock import MockerFixture
+import requests
+from requests_mock.mocker import Mocker as RequestsMocker
+
+from tests.conftest import FakeFs
+from varfish_cli import api
+from varfish_cli.api.client import HttpOptions, VarfishClient, get_client, zstandard
+from varfish_cli.config import CommonOptions, load_http_options
+from varfish_cli.exceptions import RestApiCallException
+
+
+def test_client_sets_up_session(fake_conn: typing.Tuple[str, str]):
+    host, token = fake_conn
+    client = VarfishClient(server_url=f"{host}/", api_token=token, verify_ssl=False)
+
+    assert client.server_url == host
+    assert client.session.headers["Authorization"] == f"Token {token}"
+    assert client.session.verify is False
+    assert client.session.get_adapter(host)._pool_maxsize == 10
+
+
+def test_get_client_is_shared(fake_conn: typing.Tuple[str, str]):
+    host, token = fake_conn
+    assert get_client(host, token, True) is get_client(host, token, True)
+    assert get_client(host, token, True) is not get_client(host, token, False)
+
+
+def test_common_options_client_constructed_once(fake_conn: typing.Tuple[str, str]):
+    host, token = fake_conn
+    common_options = CommonOptions(varfish_server_url=host, varfish_api_token=token)
+
+    assert common_options.client is common_options.client
+
+
+def test_reserve_connections(fake_conn: typing.Tuple[str, str]):
+    host, token = fake_conn
+    common_options = CommonOptions(varfish_server_url=host, varfish_api_token=token)
+    common_options.reserve_connections(16)
+    common_options.reserve_connections(4)
+
+    assert common_options.client.session.get_adapter(host)._pool_maxsize == 16
+
+    common_options.reserve_connections(32)
+
+    assert common_options.client.pool_maxsize == 32
+    assert common_options.client.session.get_adapter(host)._pool_maxsize == 32
+
+
+def test_api_function_uses_client(requests_mock: RequestsMocker, fake_conn: typing.Tuple[str, str]):
+    host, token = fake_conn
+    m = requests_mock.get(
+        f"{host}/project/api/list",
+        json=[],
+        request_headers={"Authorization": f"Token {token}"},
+    )
+    client = VarfishClient(server_url=host, api_token=token)
+
+    assert api.project_list(server_url=host, api_token="ignored", client=client) == []
+    assert m.call_count == 1
+
+
+def test_retry_on_transient_status(
+    requests_mock: RequestsMocker, fake_conn: typing.Tuple[str, str], mocker: MockerFixture
+):
+    sleep = mocker.patch("varfish_cli.api.client.time.sleep")
+    host, token = fake_conn
+    m = requests_mock.get(
+        f"{host}/project/api/list",
+        [
+            {"status_code": 503, "headers": {"Retry-After": "7"}},
+            {"status_code": 502},
+            {"status_code": 200, "json": []},
+        ],
+    )
+    client = VarfishClient(
+        server_url=host, api_token=token, http_options=HttpOptions(retry_backoff_factor=1.0)
+    )
+
+    assert api.project_list(server_url=host, api_token=token, client=client) == []
+    assert m.call_count == 3
+    assert sleep.call_args_list[0].args == (7.0,)
+    assert 0 <= sleep.call_args_list[1].args[0] <= 2.0
+
+
+@pytest.mark.parametrize(
+    "retry_after,expected",
+    [("7", 7.0), ("86400", 60.0), ("Wed, 21 Oct 2099 07:28:00 GMT", 60.0)],
+)
+def test_retry_delay_clamps_retry_after(retry_after: str, expected: float):
+    response = requests.Response()
+    response.headers["Retry-After"] = retry_after
+
+    assert HttpOptions(retry_backoff_max=60.0).retry_delay(1, response) == expected
+
+
+def test_retry_gives_up_after_max_attempts(
+    requests_mock: RequestsMocker, fake_conn: typing.Tuple[str, str], mocker: MockerFixture
+):
+    mocker.patch("varfish_cli.api.client.time.sleep")
+    host, token = fake_conn
+    m = requests_mock.get(f"{host}/project/api/list", status_code=503, text="unavailable")
+    client = VarfishClient(
+        server_url=host, api_token=token, http_options=HttpOptions(retry_attempts=3)
+    )
+
+    with pytest.raises(RestApiCallException, match="status code 503"):
+        api.project_list(server_url=host, api_token=token, client=client)
+    assert m.call_count == 3
+
+
+def test_no_retry_for_post(
+    requests_mock: RequestsMocker, fake_conn: typing.Tuple[str, str], mocker: MockerFixture
+):
+    sleep = mocker.patch("varfish_cli.api.client.time.sleep")
+    host, token = fake_conn
+    m = requests_mock.post(f"{host}/some/endpoint", status_code=503)
+    client = VarfishClient(server_url=host, api_token=token)
+
+    assert client.post(f"{host}/some/endpoint").status_code == 503
+    assert m.call_count == 1
+    assert not sleep.called
+
+
+def test_load_http_options(fake_fs: FakeFs, mocker: MockerFixture):
+    fake_fs.fs.create_file(
+        "/varfishrc.toml", contents="[http]\nretry_attempts = 2\nread_timeout = 30.0\n"
+    )
+    mocker.patch("varfish_cli.config.open", fake_fs.open_, create=True)
+    mocker.patch("varfish_cli.config.os", fake_fs.os)
+
+    http_options = load_http_options("/varfishrc.toml")
+
+    assert http_options == HttpOptions(retry_attempts=2, read_timeout=30.0)
+
+
+def test_responses_requested_compressed(
+    requests_mock: RequestsMocker, fake_conn: typing.Tuple[str, str]
+):
+    host, token = fake_conn
+    body = json.dumps([{"x": "y" * 1000}]).encode("utf-8")
+    requests_mock.get(
+        f"{host}/some/endpoint",
+        content=gzip.compress(body),
+        headers={"Content-Encoding": "gzip"},
+    )
+    client = VarfishClient(server_url=host, api_token=token)
+
+    response = client.get(f"{host}/some/endpoint")
+
+    assert "gzip" in requests_mock.last_request.headers["Accept-Encoding"]
+    assert response.content == body
+    assert client.stats.requests == 1
+    assert client.stats.received == len(gzip.compress(body))
+    assert client.stats.received_uncompressed == len(body)
+
+
+@pytest.mark.parametrize("kwarg", ["json", "data"])
+def test_compress_request_body(
+    requests_mock: RequestsMocker, fake_conn: typing.Tuple[str, str], kwarg: str
+):
+    host, token = fake_conn
+    m = requests_mock.put(f"{host}/some/endpoint", json={})
+    client = VarfishClient(
+        server_url=host, api_token=token, http_options=HttpOptions(compress_requests="gzip")
+    )
+    payload = {"pedigree": "x" * 2000, "empty": None}
+
+    client.put(f"{host}/some/endpoint", **{kwarg: payload})
+
+    assert m.last_request.headers["Content-Encoding"] == "gzip"
+    body = gzip.decompress(m.last_request.body)
+    if kwarg == "json":
+        assert m.last_request.headers["Content-Type"] == "application/json"
+        assert json.loads(body) == payload
+    else:
+        assert m.last_request.headers["Content-Type"] == "application/x-www-form-urlencoded"
+        assert body == b"pedigree=" + b"x" * 2000
+    assert client.stats.sent == len(m.last_request.body)
+    assert client.stats.sent_uncompressed == len(body)
+
+
+def test_compress_request_body_skips_small_and_multipart(
+    requests_mock: RequestsMocker, fake_conn: typing.Tuple[str, str]
+):
+    host, token = fake_conn
+    m = requests_mock.post(f"{host}/some/endpoint", json={})
+    client = VarfishClient(
+        server_url=host, api_token=token, http_options=HttpOptions(compress_requests="gzip")
+    )
+
+    client.post(f"{host}/some/endpoint", json={"name": "small"})
+    assert "Content-Encoding" not in m.last_request.headers
+
+    client.post(f"{host}/some/endpoint", data={"x": "y" * 2000}, files={"file": b"data"})
+    assert "Content-Encoding" not in m.last_request.headers
+
+
+@pytest.mark.skipif(zstandard is not None, reason="zstandard is installed")
+def test_zstd_requires_zstandard():
+    with pytest.raises(pydantic.ValidationError, match="zstandard"):
+        HttpOptions(compress_requests="zstd")
@@ -0,0 +1,104 @@
+"""Tests for the streaming multipart encoder."""
+
+import email.parser
+import email.policy
+import http.server
+import io
+import threading
+import tracemalloc
+
+import pytest
+
+from varfish_cli.api.client import VarfishClient
+from varfish_cli.api.multipart import MultipartEncoder
+
+
+def _parse(encoder: MultipartEncoder, body: bytes):
+    message = email.parser.BytesParser(policy=email.policy.HTTP).parsebytes(
+        f"Content-Type: {encoder.content_type}\r\n\r\n".encode("utf-8") + body
+    )
+    return [
+        (
+            part.get_param("name", header="content-disposition"),
+            part.get_filename(),
+            part.get_payload(decode=True),
+        )
+        for part in message.iter_parts()
+    ]
+
+
+def test_multipart_encoder(tmp_path):
+    path = tmp_path / "genotypes.tsv.gz"
+    path.write_bytes(b"\x1f\x8b" + bytes(range(256)) * 100)
+    with open(path, "rb") as inputf:
+        encoder = MultipartEncoder(
+            fields={"name": "genotypes.tsv.gz", "md5": None, "tags": ["a", "b"]},
+            files={"file": inputf, "other": ("other.txt", io.BytesIO(b"other\n"), "text/plain")},
+            buffer_size=1000,
+        )
+        body = b"".join(encoder)
+
+    assert len(body) == len(encoder)
+    assert _parse(encoder, body) == [
+        ("name", None, b"genotypes.tsv.gz"),
+        ("tags", None, b"a"),
+        ("tags", None, b"b"),
+        ("file", "genotypes.tsv.gz", path.read_bytes()),
+        ("other", "other.txt", b"other\n"),
+    ]
+
+
+def test_multipart_encoder_file_changed():
+    fileobj = io.BytesIO(b"data")
+    encoder = MultipartEncoder(files={"file": fileobj})
+    fileobj.write(b"more")
+
+    with pytest.raises(IOError):
+        encoder.read()
+
+
+class _DiscardingHandler(http.server.BaseHTTPRequestHandler):
+    """Reads request bodies in blocks and discards them."""
+
+    received = 0
+
+    def do_POST(self):
+        remaining = int(self.headers["Content-Length"])
+        while remaining:
+            remaining -= len(self.rfile.read(min(remaining, 64 * 1024)))
+        type(self).received = int(self.headers["Content-Length"])
+        self.send_response(201)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+def test_client_upload_bounded_memory(tmp_path):
+    size = 64 * 1024 * 1024
+    path = tmp_path / "large.tsv.gz"
+    with open(path, "wb") as outputf:
+        outputf.truncate(size)
+    httpd = http.server.HTTPServer(("127.0.0.1", 0), _DiscardingHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    client = VarfishClient(f"http://127.0.0.1:{httpd.server_port}", "token")
+
+    tracemalloc.start()
+    try:
+        with open(path, "rb") as inputf:
+            response = client.post(
+                f"{client.server_url}/upload/", data={"name": "large"}, files={"file": inputf}
+            )
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+        client.close()
+        httpd.shutdown()
+        httpd.server_close()
+
+    assert response.status_code == 201
+    assert _DiscardingHandler.received > size
+    assert client.stats.sent == _DiscardingHandler.received
+    assert peak < 4 * 1024 * 1024
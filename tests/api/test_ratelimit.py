@@ -0,0 +1,128 @@
+"""Tests for the client-side rate limiter."""
+
+import threading
+import time
+import typing
+
+import pytest
+from pytest_mock import MockerFixture
+from requests_mock.mocker import Mocker as RequestsMocker
+
+from tests.conftest import FakeFs
+from varfish_cli.api.client import VarfishClient
+from varfish_cli.api.ratelimit import RateLimiter, RateLimitOptions, get_rate_limiter
+from varfish_cli.config import CommonOptions, load_rate_limit_options
+
+
+@pytest.fixture
+def fake_clock(mocker: MockerFixture) -> typing.List[float]:
+    """Replace monotonic clock and ``sleep`` such that sleeping advances the clock."""
+    now = [1000.0]
+    mocker.patch("varfish_cli.api.ratelimit.time.monotonic", side_effect=lambda: now[0])
+
+    def sleep(seconds: float):
+        now[0] += seconds
+
+    mocker.patch("varfish_cli.api.ratelimit.time.sleep", side_effect=sleep)
+    return now
+
+
+def test_token_bucket(fake_clock: typing.List[float]):
+    limiter = RateLimiter(RateLimitOptions(requests_per_second=4.0, burst=2))
+
+    for _ in range(6):
+        with limiter.limit():
+            pass
+
+    # two requests in the burst, four more at four per second
+    assert fake_clock[0] == pytest.approx(1001.0)
+
+
+def test_token_bucket_refills(fake_clock: typing.List[float]):
+    limiter = RateLimiter(RateLimitOptions(requests_per_second=1.0))
+    with limiter.limit():
+        pass
+    fake_clock[0] += 5.0
+
+    with limiter.limit():
+        pass
+
+    # the bucket holds at most one token, so no waiting but no accumulation either
+    assert fake_clock[0] == pytest.approx(1005.0)
+
+
+def test_max_in_flight():
+    limiter = RateLimiter(RateLimitOptions(max_in_flight=2))
+    lock = threading.Lock()
+    in_flight = [0]
+    max_seen = [0]
+
+    def work():
+        with limiter.limit():
+            with lock:
+                in_flight[0] += 1
+                max_seen[0] = max(max_seen[0], in_flight[0])
+            time.sleep(0.01)
+            with lock:
+                in_flight[0] -= 1
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert max_seen[0] == 2
+
+
+def test_limiter_shared_per_server(fake_conn: typing.Tuple[str, str]):
+    host, token = fake_conn
+    options = RateLimitOptions(requests_per_second=5.0, max_in_flight=2)
+    first = CommonOptions(
+        varfish_server_url=host, varfish_api_token=token, rate_limit_options=options
+    )
+    second = CommonOptions(
+        varfish_server_url=host, varfish_api_token=token, rate_limit_options=options
+    )
+
+    assert first.client.rate_limiter is second.client.rate_limiter
+    assert get_rate_limiter("http://other.example.com", options) is not first.client.rate_limiter
+    assert (
+        CommonOptions(varfish_server_url=host, varfish_api_token=token).client.rate_limiter is None
+    )
+
+
+def test_client_requests_limited(
+    requests_mock: RequestsMocker, fake_conn: typing.Tuple[str, str], mocker: MockerFixture
+):
+    host, token = fake_conn
+    requests_mock.get(f"{host}/some/endpoint", json=[])
+    limiter = RateLimiter(RateLimitOptions(requests_per_second=1.0))
+    limit = mocker.spy(limiter, "limit")
+    client = VarfishClient(server_url=host, api_token=token, rate_limiter=limiter)
+
+    client.get(f"{host}/some/endpoint")
+
+    assert limit.call_count == 1
+
+
+def test_load_rate_limit_options(fake_fs: FakeFs, mocker: MockerFixture):
+    fake_fs.fs.create_file(
+        "/varfishrc.toml",
+        contents=(
+            "[rate_limit]\n"
+            "requests_per_second = 20.0\n"
+            "max_in_flight = 8\n"
+            '[rate_limit.servers."https://slow.example.com/"]\n'
+            "requests_per_second = 2.0\n"
+        ),
+    )
+    mocker.patch("varfish_cli.config.open", fake_fs.open_, create=True)
+    mocker.patch("varfish_cli.config.os", fake_fs.os)
+
+    assert load_rate_limit_options("/varfishrc.toml", "https://fast.example.com") == (
+        RateLimitOptions(requests_per_second=20.0, max_in_flight=8)
+    )
+    assert load_rate_limit_options("/varfishrc.toml", "https://slow.example.com") == (
+        RateLimitOptions(requests_per_second=2.0, max_in_flight=8)
+    )
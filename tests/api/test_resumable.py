@@ -0,0 +1,212 @@
+"""Tests for resumable chunked uploads."""
+
+import hashlib
+import typing
+
+import pytest
+from pytest_mock import MockerFixture
+import requests
+
+from varfish_cli import api
+from varfish_cli.api.client import HttpOptions, VarfishClient
+from varfish_cli.api.models import GenotypeFile
+from varfish_cli.api.resumable import ResumeJournal, chunked_upload
+from varfish_cli.exceptions import RestApiCallException
+from varfish_cli.hashing import HashingReader
+from varfish_cli.standin import StandInOptions, StandInServer
+
+TOKEN = "faKeTOKeN"
+
+#: Variant set import info that the files are uploaded to.
+VARIANT_SET_UUID = "104f900b-fa9c-4bd5-a119-35544293fe7f"
+
+
+@pytest.fixture
+def data_path(tmp_path):
+    path = tmp_path / "gts.tsv.gz"
+    path.write_bytes(bytes(range(256)) * 40)
+    return path
+
+
+@pytest.fixture
+def journal(tmp_path) -> typing.Iterator[ResumeJournal]:
+    journal = ResumeJournal(str(tmp_path / "cache" / "uploads.sqlite3"))
+    yield journal
+    journal.close()
+
+
+def _endpoint(server: StandInServer) -> str:
+    return server.url + api.ENDPOINT_GENOTYPE_FILE_CREATE.format(
+        variant_set_import_info_uuid=VARIANT_SET_UUID
+    )
+
+
+def _fields(path) -> typing.Dict[str, typing.Any]:
+    return {"name": path.name, "md5": hashlib.md5(path.read_bytes()).hexdigest()}
+
+
+def test_chunked_upload_through_api(data_path, journal: ResumeJournal):
+    with StandInServer(StandInOptions(chunked_uploads=True)) as server:
+        client = VarfishClient(server.url, TOKEN)
+        with open(data_path, "rb") as inputf:
+            uploaded = api.genotype_file_upload(
+                server.url,
+                TOKEN,
+                VARIANT_SET_UUID,
+                GenotypeFile(**_fields(data_path)),
+                files={"file": inputf},
+                client=client,
+                journal=journal,
+            )
+
+        assert uploaded.name == "gts.tsv.gz"
+        assert server.upload_bytes_received == data_path.stat().st_size
+        assert api.genotype_file_list(server.url, TOKEN, VARIANT_SET_UUID, client=client) == [
+            uploaded
+        ]
+
+
+def test_chunked_upload_fallback(data_path, journal: ResumeJournal):
+    with StandInServer() as server:
+        client = VarfishClient(server.url, TOKEN)
+        with open(data_path, "rb") as inputf:
+            uploaded = api.genotype_file_upload(
+                server.url,
+                TOKEN,
+                VARIANT_SET_UUID,
+                GenotypeFile(**_fields(data_path)),
+                files={"file": inputf},
+                client=client,
+                journal=journal,
+            )
+
+        assert uploaded.name == "gts.tsv.gz"
+        assert server.upload_bytes_received == 0
+
+
+def test_chunked_upload_resumed_from_journal(
+    data_path, journal: ResumeJournal, mocker: MockerFixture
+):
+    with StandInServer(StandInOptions(chunked_uploads=True)) as server:
+        client = VarfishClient(server.url, TOKEN, http_options=HttpOptions(retry_attempts=1))
+        request = client.request
+        patches = []
+
+        def dropping_request(method, url, **kwargs):
+            if method == "PATCH":
+                patches.append(url)
+                if len(patches) == 3:
+                    raise requests.ConnectionError("connection dropped")
+            return request(method, url, **kwargs)
+
+        mocker.patch.object(client, "request", side_effect=dropping_request)
+        with open(data_path, "rb") as inputf:
+            with pytest.raises(requests.ConnectionError):
+                chunked_upload(client, _endpoint(server), _fields(data_path), inputf, journal, 1000)
+        upload_url, offset = journal.get(
+            _endpoint(server), str(data_path), _fields(data_path)["md5"]
+        )
+        assert offset == 2000
+
+        mocker.stopall()
+        with open(data_path, "rb") as inputf:
+            response = chunked_upload(
+                client,
+                _endpoint(server),
+                _fields(data_path),
+                HashingReader(inputf, expected_md5=_fields(data_path)["md5"]),
+                journal,
+                1000,
+            )
+
+        assert response.status_code == 200
+        assert response.json()["file"] == data_path.stat().st_size
+        assert server.upload_bytes_received == data_path.stat().st_size
+        assert journal.get(_endpoint(server), str(data_path), _fields(data_path)["md5"]) is None
+
+
+def test_chunked_upload_retries_failed_chunks(data_path, journal: ResumeJournal):
+    options = StandInOptions(chunked_uploads=True, error_rate=0.3, seed=42)
+    with StandInServer(options) as server:
+        client = VarfishClient(
+            server.url, TOKEN, http_options=HttpOptions(retry_attempts=20, retry_backoff_factor=0)
+        )
+        with open(data_path, "rb") as inputf:
+            response = chunked_upload(
+                client, _endpoint(server), _fields(data_path), inputf, journal, 1000
+            )
+
+        assert response.status_code == 200
+        assert server.upload_bytes_received == data_path.stat().st_size
+
+
+def _failing_requests(
+    client: VarfishClient, mocker: MockerFixture, failing_method: str, status_code: int
+) -> list:
+    """Make ``failing_method`` requests of ``client`` fail with ``status_code``.
+
+    :returns: list of the URLs of the failed requests
+    """
+    request = client.request
+    failed = []
+
+    def failing_request(method, url, **kwargs):
+        if method == failing_method:
+            failed.append(url)
+            response = requests.Response()
+            response.status_code = status_code
+            response._content = b"failed"
+            return response
+        return request(method, url, **kwargs)
+
+    mocker.patch.object(client, "request", side_effect=failing_request)
+    return failed
+
+
+def test_chunked_upload_does_not_retry_client_errors(
+    data_path, journal: ResumeJournal, mocker: MockerFixture
+):
+    with StandInServer(StandInOptions(chunked_uploads=True)) as server:
+        client = VarfishClient(
+            server.url, TOKEN, http_options=HttpOptions(retry_attempts=5, retry_backoff_factor=0)
+        )
+        failed = _failing_requests(client, mocker, "POST", 403)
+        with open(data_path, "rb") as inputf:
+            with pytest.raises(RestApiCallException, match="status code 403: failed"):
+                chunked_upload(client, _endpoint(server), _fields(data_path), inputf, journal, 1000)
+
+    assert len(failed) == 1
+
+
+def test_chunked_upload_out_of_attempts(data_path, journal: ResumeJournal, mocker: MockerFixture):
+    with StandInServer(StandInOptions(chunked_uploads=True)) as server:
+        client = VarfishClient(
+            server.url, TOKEN, http_options=HttpOptions(retry_attempts=3, retry_backoff_factor=0)
+        )
+        failed = _failing_requests(client, mocker, "PATCH", 503)
+        with open(data_path, "rb") as inputf:
+            with pytest.raises(RestApiCallException, match="status code 503: failed"):
+                chunked_upload(client, _endpoint(server), _fields(data_path), inputf, journal, 1000)
+
+    assert len(failed) == 3
+
+
+def test_chunked_upload_progress_counts_confirmed_bytes(data_path, journal: ResumeJournal):
+    options = StandInOptions(chunked_uploads=True, error_rate=0.3, seed=42)
+    counts = []
+    with StandInServer(options) as server:
+        client = VarfishClient(
+            server.url, TOKEN, http_options=HttpOptions(retry_attempts=20, retry_backoff_factor=0)
+        )
+        with open(data_path, "rb") as inputf:
+            api.genotype_file_upload(
+                server.url,
+                TOKEN,
+                VARIANT_SET_UUID,
+                GenotypeFile(**_fields(data_path)),
+                files={"file": HashingReader(inputf, callback=counts.append)},
+                client=client,
+                journal=journal,
+            )
+
+    assert sum(counts) == data_path.stat().st_size
@@ -0,0 +1,50 @@
+"""Micro-benchmarks for the CLI layer, run with ``pytest -m extra``."""
+
+import time
+import typing
+
+import polyleven
+import pytest
+
+from varfish_cli.cli.importer.create import GenotypeFileIndex
+
+
+@pytest.mark.extra
+def test_bench_match_db_infos_to_genotypes():
+    genotypes: typing.List[typing.Tuple[bool, str]] = []
+    db_infos: typing.List[str] = []
+    for no in range(250):
+        prefix = "/data/output/FAM_%03d/bwa.%%s.varfish_annotated.S%03d-N1-DNA1-WGS1" % (no, no)
+        for is_sv, caller in ((False, "gatk_hc"), (True, "delly2")):
+            genotypes.append((is_sv, prefix % caller + ".gts.tsv.gz"))
+            db_infos.append(prefix % caller + ".db-infos.tsv.gz")
+    assert len(genotypes) + len(db_infos) == 1_000
+
+    def old_path() -> typing.List[typing.Optional[bool]]:
+        result = []
+        for db_info in db_infos:
+            best_is_sv = None
+            best_dist = None
+            for is_sv, path in genotypes:
+                dist = polyleven.levenshtein(db_info, path)
+                if best_dist is None or best_dist > dist:
+                    best_is_sv = is_sv
+                    best_dist = dist
+            result.append(best_is_sv)
+        return result
+
+    def new_path() -> typing.List[typing.Optional[bool]]:
+        index = GenotypeFileIndex(genotypes)
+        return [index.is_sv(db_info) for db_info in db_infos]
+
+    timings = {}
+    for name, func in (("old", old_path), ("new", new_path)):
+        start = time.perf_counter()
+        func()
+        timings[name] = time.perf_counter() - start
+
+    print(
+        "match 500 DB info to 500 genotype files: all-pairs Levenshtein %.1f ms, index %.1f ms"
+        % (timings["old"] * 1000, timings["new"] * 1000)
+    )
+    assert old_path() == new_path() == [False, True] * 250
@@ -1,10 +1,18 @@
 """Test CLI for importer API."""
 
+import collections
 import glob
+import gzip
+import hashlib
 import json
+import os
+import shutil
+import threading
+import time
 import types
 import typing
 import uuid
+import zlib
 
 import pytest
 from pytest_mock import MockerFixture
@@ -14,9 +22,35 @@ from syrupy import SnapshotAssertion
 from typer.testing import CliRunner
 
 from tests.conftest import FakeFs
+from varfish_cli import api
+from varfish_cli.api import models
+from varfish_cli.api.cache import CacheOptions
 from varfish_cli.cli import app
 from varfish_cli.cli.importer import cli_caseimportinfo_create
+from varfish_cli.cli.importer.batch import (
+    BatchCaseImporter,
+    BatchImportEntry,
+    format_results,
+    load_manifest,
+)
+from varfish_cli.cli.importer.create import (
+    EXPECTED_GTS,
+    CaseImporter,
+    CaseImportOptions,
+    FileProbe,
+    FileType,
+    FileTypeGuesser,
+    GenotypeFileIndex,
+    PathWithTimestamp,
+    RemoteFileIndex,
+    expand_paths,
+    pair_md5_sidecars,
+)
+from varfish_cli.cli.importer.validate import FileValidator, split_file
 from varfish_cli.config import CommonOptions
+from varfish_cli.exceptions import InvalidConfiguration, RestApiCallException
+from varfish_cli.hashing import Md5Cache
+from varfish_cli.standin import StandInServer
 
 
 @pytest.fixture
@@ -164,7 +198,7 @@ def test_caseimportinfo_create_raw_func_call(
         paths=list(sorted(glob.glob("tests/data/importer/*"))),
     )
 
-    assert m_any.call_count == 10
+    assert m_any.call_count == 8
     assert m_case_import_info.call_count == 1
     assert m_case_bam_qc_file.call_count == 1
     assert m_case_variant_set_import_info_create.call_count == 2
@@ -174,3 +208,663 @@ def test_caseimportinfo_create_raw_func_call(
     assert m_case_import_info_update.call_count == 1
 
     mocker.stopall()
+
+
+def test_upload_files_parallel(mocker: MockerFixture, fake_conn: typing.Tuple[str, str]):
+    """Files are uploaded concurrently but each variant set is marked uploaded after its files."""
+    host, token = fake_conn
+    importer = CaseImporter(
+        options=CaseImportOptions(
+            paths=[],
+            genomebuild=models.GenomeBuild.GRCH37,
+            strip_family_regex="^FAM_",
+            project_uuid=uuid.uuid4(),
+            resubmit=False,
+            force_fresh=False,
+            case_name_suffix="",
+            index=None,
+            jobs=4,
+        ),
+        common_options=CommonOptions(varfish_server_url=host, varfish_api_token=token),
+    )
+
+    def paths(*names):
+        return [PathWithTimestamp(path=name, mtime=0.0) for name in names]
+
+    importer.paths_bam_qc = paths("bam-qc")
+    importer.paths_genotype = paths("gts")
+    importer.paths_database_info = paths("db-infos")
+    importer.paths_genotype_sv = paths("gts-sv")
+    importer.paths_database_info_sv = paths("db-infos-sv")
+
+    variant_sets = {
+        variant_type: models.VariantSetImportInfo(
+            sodar_uuid=uuid.uuid4(),
+            genomebuild=models.GenomeBuild.GRCH37,
+            variant_type=variant_type,
+        )
+        for variant_type in models.CaseVariantType
+    }
+    mocker.patch.object(
+        importer,
+        "_create_variant_set_import_info",
+        side_effect=lambda _, variant_type: variant_sets[variant_type],
+    )
+
+    lock = threading.Lock()
+    events = []
+    running = [0, 0]  # current, maximum
+
+    def perform_file_upload(path, uuid_value, **kwargs):
+        with lock:
+            running[0] += 1
+            running[1] = max(running)
+        time.sleep(0.05)
+        with lock:
+            running[0] -= 1
+            events.append((path, uuid_value))
+        return f"md5-{path}"
+
+    mocker.patch.object(importer, "_perform_file_upload", side_effect=perform_file_upload)
+    update = mocker.patch(
+        "varfish_cli.cli.importer.create.api.variant_set_import_info_update",
+        side_effect=lambda variant_set_import_info_uuid, **kwargs: events.append(
+            ("UPLOADED", variant_set_import_info_uuid)
+        ),
+    )
+
+    good_md5s = importer._upload_files(
+        models.CaseImportInfo(
+            sodar_uuid=uuid.uuid4(),
+            release=models.GenomeBuild.GRCH37,
+            name="case",
+            index="index",
+            pedigree=[],
+        )
+    )
+
+    assert sorted(good_md5s) == sorted(
+        f"md5-{name}" for name in ("bam-qc", "gts", "db-infos", "gts-sv", "db-infos-sv")
+    )
+    assert running[1] == 4
+    assert update.call_count == 2
+    for variant_set in variant_sets.values():
+        positions = [i for i, (_, key) in enumerate(events) if key == variant_set.sodar_uuid]
+        assert events[positions[-1]][0] == "UPLOADED"
+        assert len(positions) == 3
+
+
+def test_remote_file_index(mocker: MockerFixture, fake_conn: typing.Tuple[str, str]):
+    host, token = fake_conn
+    container_uuid = uuid.uuid4()
+    existing = models.GenotypeFile(name="a.tsv.gz", md5="a" * 32, sodar_uuid=uuid.uuid4())
+    uploaded = models.GenotypeFile(name="b.tsv.gz", md5="b" * 32, sodar_uuid=uuid.uuid4())
+    api_list_func = mocker.Mock(return_value=[existing])
+    index = RemoteFileIndex(CommonOptions(varfish_server_url=host, varfish_api_token=token))
+
+    def files():
+        return index.files(api_list_func, "variant_set_import_info_uuid", container_uuid)
+
+    assert files() == {existing.md5: [existing]}
+    index.add(api_list_func, container_uuid, uploaded)
+    index.remove(api_list_func, container_uuid, existing)
+
+    assert files() == {uploaded.md5: [uploaded]}
+    assert api_list_func.call_count == 1
+    assert api_list_func.call_args.kwargs["variant_set_import_info_uuid"] == container_uuid
+
+
+def test_file_md5_sidecar_or_computed(tmp_path, fake_conn: typing.Tuple[str, str]):
+    host, token = fake_conn
+    importer = CaseImporter(
+        options=CaseImportOptions(
+            paths=[],
+            genomebuild=models.GenomeBuild.GRCH37,
+            strip_family_regex="^FAM_",
+            project_uuid=uuid.uuid4(),
+            resubmit=False,
+            force_fresh=False,
+            case_name_suffix="",
+            index=None,
+        ),
+        common_options=CommonOptions(
+            varfish_server_url=host,
+            varfish_api_token=token,
+            cache_options=CacheOptions(cache_dir=str(tmp_path / "cache")),
+        ),
+    )
+    with_sidecar = tmp_path / "with-sidecar.tsv"
+    with_sidecar.write_text("data\n")
+    (tmp_path / "with-sidecar.tsv.md5").write_text("0123456789abcdef  with-sidecar.tsv\n")
+    without_sidecar = tmp_path / "without-sidecar.tsv"
+    without_sidecar.write_text("data\n")
+
+    assert importer._file_md5(str(with_sidecar)) == "0123456789abcdef"
+    assert importer._file_md5(str(without_sidecar)) == hashlib.md5(b"data\n").hexdigest()
+    assert (tmp_path / "cache" / "md5sums.sqlite3").exists()
+
+
+def test_load_manifest(tmp_path):
+    (tmp_path / "manifest.tsv").write_text(
+        "name\tpaths\tindex\nfam1\ta.ped,/data/a.gts.tsv.gz\t\n\tb.ped\tb-index\n"
+    )
+    (tmp_path / "manifest.json").write_text(
+        json.dumps([{"name": "fam1", "paths": ["a.ped", "/data/a.gts.tsv.gz"]}])
+    )
+
+    entries = load_manifest(str(tmp_path / "manifest.tsv"))
+
+    assert [entry.label for entry in entries] == ["fam1", "b.ped"]
+    assert entries[0].paths == [str(tmp_path / "a.ped"), "/data/a.gts.tsv.gz"]
+    assert entries[1].index == "b-index"
+    assert load_manifest(str(tmp_path / "manifest.json"))[0] == entries[0]
+
+
+def test_batch_case_importer(tmp_path, mocker: MockerFixture):
+    paths = sorted(glob.glob(os.path.abspath("tests/data/importer/*")))
+    with StandInServer() as server:
+        project = server.store.add_project()
+        common_options = CommonOptions(
+            varfish_server_url=server.url,
+            varfish_api_token="faKeTOKeN",
+            cache_options=CacheOptions(enabled=False),
+        )
+        list_spy = mocker.spy(api, "case_import_info_list")
+        batch_importer = BatchCaseImporter(
+            entries=[
+                BatchImportEntry(name="complete", paths=paths),
+                BatchImportEntry(name="no-ped", paths=[p for p in paths if ".gts." in p]),
+            ],
+            options=CaseImportOptions(
+                paths=[],
+                genomebuild=models.GenomeBuild.GRCH37,
+                strip_family_regex="^FAM_",
+                project_uuid=project["sodar_uuid"],
+                resubmit=False,
+                force_fresh=False,
+                case_name_suffix="",
+                index=None,
+            ),
+            common_options=common_options,
+            parallel_cases=2,
+        )
+
+        results = batch_importer.run()
+
+        assert [(result.name, result.ok) for result in results] == [
+            ("complete", True),
+            ("no-ped", False),
+        ]
+        assert list_spy.call_count == 1
+        assert results[0].bytes_sent > 0
+        assert results[1].bytes_sent == 0
+        assert len(server.store.objects["genotypefile"]) == 2
+        assert "no-ped" in format_results(results)
+
+
+def test_batch_case_importer_closes_md5_cache_on_error(tmp_path, mocker: MockerFixture):
+    mocker.patch.object(api, "case_import_info_list", side_effect=RestApiCallException("down"))
+    close_spy = mocker.spy(Md5Cache, "close")
+    batch_importer = BatchCaseImporter(
+        entries=[BatchImportEntry(name="fam1", paths=[])],
+        options=CaseImportOptions(
+            paths=[],
+            genomebuild=models.GenomeBuild.GRCH37,
+            strip_family_regex="^FAM_",
+            project_uuid=uuid.uuid4(),
+            resubmit=False,
+            force_fresh=False,
+            case_name_suffix="",
+            index=None,
+        ),
+        common_options=CommonOptions(
+            varfish_server_url="http://varfish.example.com",
+            varfish_api_token="faKeTOKeN",
+            cache_options=CacheOptions(cache_dir=str(tmp_path)),
+        ),
+    )
+
+    with pytest.raises(RestApiCallException):
+        batch_importer.run()
+
+    assert close_spy.call_count == 1
+
+
+def test_purge_old_files_concurrent(mocker: MockerFixture, fake_conn: typing.Tuple[str, str]):
+    """All stale files are removed concurrently and errors are reported in a fixed order."""
+    host, token = fake_conn
+    importer = CaseImporter(
+        options=CaseImportOptions(
+            paths=[],
+            genomebuild=models.GenomeBuild.GRCH37,
+            strip_family_regex="^FAM_",
+            project_uuid=uuid.uuid4(),
+            resubmit=False,
+            force_fresh=False,
+            case_name_suffix="",
+            index=None,
+            jobs=8,
+        ),
+        common_options=CommonOptions(varfish_server_url=host, varfish_api_token=token),
+    )
+    variant_sets = [
+        models.VariantSetImportInfo(
+            sodar_uuid=uuid.uuid4(),
+            genomebuild=models.GenomeBuild.GRCH37,
+            variant_type=variant_type,
+        )
+        for variant_type in models.CaseVariantType
+    ]
+    genotype_files = {
+        variant_set.sodar_uuid: [
+            models.GenotypeFile(name=f"gts-{i}.tsv.gz", md5=f"{i:032d}", sodar_uuid=uuid.uuid4())
+            for i in range(4)
+        ]
+        for variant_set in variant_sets
+    }
+    patch = "varfish_cli.cli.importer.create.api."
+    mocker.patch(patch + "variant_set_import_info_list", return_value=variant_sets)
+    mocker.patch(patch + "bam_qc_file_list", return_value=[])
+    mocker.patch(patch + "effects_file_list", return_value=[])
+    mocker.patch(patch + "db_info_file_list", return_value=[])
+    mocker.patch(
+        patch + "genotype_file_list",
+        side_effect=lambda variant_set_import_info_uuid, **kwargs: genotype_files[
+            variant_set_import_info_uuid
+        ],
+    )
+
+    lock = threading.Lock()
+    running = [0, 0]  # current, maximum
+    destroyed = []
+
+    def genotype_file_destroy(genotype_file_uuid, **kwargs):
+        with lock:
+            running[0] += 1
+            running[1] = max(running)
+        time.sleep(0.05)
+        with lock:
+            running[0] -= 1
+            destroyed.append(genotype_file_uuid)
+        if genotype_file_uuid in (files[1].sodar_uuid for files in genotype_files.values()):
+            raise RestApiCallException(f"cannot remove {genotype_file_uuid}")
+
+    mocker.patch(patch + "genotype_file_destroy", side_effect=genotype_file_destroy)
+
+    with pytest.raises(RestApiCallException) as e:
+        importer._purge_old_files(
+            models.CaseImportInfo(
+                sodar_uuid=uuid.uuid4(),
+                release=models.GenomeBuild.GRCH37,
+                name="case",
+                index="index",
+                pedigree=[],
+            ),
+            good_md5s=[f"{0:032d}"],
+        )
+
+    assert len(destroyed) == 6
+    assert running[1] > 1
+    failed = [files[1] for files in genotype_files.values()]
+    assert str(e.value).splitlines()[1:] == [
+        f"- removing {f.name} ({f.sodar_uuid}): cannot remove {f.sodar_uuid}" for f in failed
+    ]
+
+
+def test_plan(tmp_path):
+    paths = sorted(glob.glob(os.path.abspath("tests/data/importer/*")))
+    with StandInServer() as server:
+        project = server.store.add_project()
+        common_options = CommonOptions(
+            varfish_server_url=server.url,
+            varfish_api_token="faKeTOKeN",
+            cache_options=CacheOptions(enabled=False),
+        )
+
+        def importer(resubmit: bool):
+            return CaseImporter(
+                options=CaseImportOptions(
+                    paths=paths,
+                    genomebuild=models.GenomeBuild.GRCH37,
+                    strip_family_regex="^FAM_",
+                    project_uuid=project["sodar_uuid"],
+                    resubmit=resubmit,
+                    force_fresh=False,
+                    case_name_suffix="",
+                    index=None,
+                ),
+                common_options=common_options,
+            )
+
+        fresh_plan = importer(resubmit=False).plan()
+
+        assert server.store.objects["caseimportinfo"] == {}
+        assert [(a.action, a.kind) for a in fresh_plan.actions] == [
+            ("create", "case import info"),
+            ("upload", "BAM QC file"),
+            ("create", "variant set import info"),
+            ("upload", "genotype file"),
+            ("upload", "db info file"),
+            ("update", "variant set import info"),
+            ("create", "variant set import info"),
+            ("upload", "genotype file"),
+            ("upload", "db info file"),
+            ("update", "variant set import info"),
+            ("update", "case import info"),
+        ]
+        assert fresh_plan.upload_bytes == sum(
+            os.path.getsize(p)
+            for p in paths
+            if not p.endswith((".ped", ".md5", ".feature-effects.tsv.gz"))  # SV effects are ignored
+        )
+
+        case_importer = importer(resubmit=False)
+        assert case_importer.run() == 0
+        assert case_importer.stats.bytes_sent == fresh_plan.upload_bytes
+        assert case_importer.stats.bytes_skipped == 0
+        assert list(case_importer.stats.phases) == [
+            "classify files",
+            "check genome build",
+            "create case import info",
+            "upload files",
+            "purge old files",
+            "submit",
+        ]
+        assert "bytes sent" in case_importer.stats.summary()
+        variant_set_uuid = next(iter(server.store.objects["variantsetimportinfo"]))
+        server.store.add(
+            "genotypefile", variant_set_uuid, {"name": "stale.tsv.gz", "md5": "0" * 32}
+        )
+        request_count = server.request_count
+        resubmit_plan = importer(resubmit=True).plan()
+
+        actions = [(a.action, a.kind, a.name) for a in resubmit_plan.actions]
+        assert ("delete", "genotype file", "stale.tsv.gz") in actions
+        assert {a.action for a in resubmit_plan.actions} == {"update", "skip", "delete"}
+        assert resubmit_plan.upload_bytes == 0
+        assert "1 delete" in resubmit_plan.format()
+        # one listing of case import infos and variant sets, one per file container and kind
+        assert server.request_count - request_count == 2 + 1 + 2 * 3
+
+
+def test_plan_missing_ped_returns_none():
+    paths = sorted(
+        p for p in glob.glob(os.path.abspath("tests/data/importer/*")) if not p.endswith(".ped")
+    )
+    with StandInServer() as server:
+        project = server.store.add_project()
+        plan = CaseImporter(
+            options=CaseImportOptions(
+                paths=paths,
+                genomebuild=models.GenomeBuild.GRCH37,
+                strip_family_regex="^FAM_",
+                project_uuid=project["sodar_uuid"],
+                resubmit=False,
+                force_fresh=False,
+                case_name_suffix="",
+                index=None,
+            ),
+            common_options=CommonOptions(
+                varfish_server_url=server.url,
+                varfish_api_token="faKeTOKeN",
+                cache_options=CacheOptions(enabled=False),
+            ),
+        ).plan()
+
+    assert plan is None
+
+
+def test_file_probe():
+    path = glob.glob(os.path.abspath("tests/data/importer/*.gts.tsv.gz"))[0]
+    probe = FileProbe(path)
+
+    assert FileTypeGuesser().guess_probe(probe) == FileType.GTS
+    assert probe.release == "GRCh37"
+    assert probe.sample_keys
+    assert probe.sample_keys == set(probe.dict_col("genotype").keys())
+
+
+def test_plan_opens_each_file_once(tmp_path, mocker: MockerFixture):
+    paths = sorted(glob.glob(os.path.abspath("tests/data/importer/*")))
+    spy = mocker.spy(gzip, "open")
+    with StandInServer() as server:
+        project = server.store.add_project()
+        CaseImporter(
+            options=CaseImportOptions(
+                paths=paths,
+                genomebuild=models.GenomeBuild.GRCH37,
+                strip_family_regex="^FAM_",
+                project_uuid=project["sodar_uuid"],
+                resubmit=False,
+                force_fresh=False,
+                case_name_suffix="",
+                index=None,
+            ),
+            common_options=CommonOptions(
+                varfish_server_url=server.url,
+                varfish_api_token="faKeTOKeN",
+                cache_options=CacheOptions(enabled=False),
+            ),
+        ).plan()
+
+    opened = collections.Counter(call.args[0] for call in spy.call_args_list)
+    assert opened
+    assert set(opened.values()) == {1}
+
+
+def test_expand_paths_and_pair_md5_sidecars(tmp_path):
+    for name in (
+        "a/x.tsv.gz",
+        "a/x.tsv.gz.md5",
+        "a/b/y.ped",
+        "a/.hidden",
+        "z.tsv.gz",
+        "z.tsv.gz.md5",
+    ):
+        (tmp_path / name).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / name).write_text("data\n")
+    (tmp_path / "orphan.md5").write_text("data\n")
+
+    paths = expand_paths([str(tmp_path / "a"), str(tmp_path / "z.tsv.gz"), str(tmp_path / "*.md5")])
+
+    assert paths == [
+        str(tmp_path / name)
+        for name in ("a/b/y.ped", "a/x.tsv.gz", "a/x.tsv.gz.md5", "z.tsv.gz", "z.tsv.gz.md5")
+    ] + [str(tmp_path / "orphan.md5")]
+    data_paths, sidecars = pair_md5_sidecars(paths)
+    assert data_paths == [
+        str(tmp_path / name) for name in ("a/b/y.ped", "a/x.tsv.gz", "z.tsv.gz", "orphan.md5")
+    ]
+    assert sidecars == {
+        str(tmp_path / "a/b/y.ped"): None,
+        str(tmp_path / "a/x.tsv.gz"): str(tmp_path / "a/x.tsv.gz.md5"),
+        str(tmp_path / "z.tsv.gz"): str(tmp_path / "z.tsv.gz.md5"),
+        str(tmp_path / "orphan.md5"): None,
+    }
+
+
+def test_split_files_by_role_directory(fake_conn: typing.Tuple[str, str]):
+    host, token = fake_conn
+    importer = CaseImporter(
+        options=CaseImportOptions(
+            paths=[os.path.abspath("tests/data/importer")],
+            genomebuild=models.GenomeBuild.GRCH37,
+            strip_family_regex="^FAM_",
+            project_uuid=uuid.uuid4(),
+            resubmit=False,
+            force_fresh=False,
+            case_name_suffix="",
+            index=None,
+        ),
+        common_options=CommonOptions(varfish_server_url=host, varfish_api_token=token),
+    )
+
+    importer._split_files_by_role()
+
+    assert importer.path_ped.basename == "Case_3_index-N1-DNA1-WGS1.ped"
+    assert len(importer.paths_genotype) == 1
+    assert len(importer.paths_genotype_sv) == 1
+    assert len(importer.paths_bam_qc) == 1
+    assert len(importer.probes) == 7  # no probing of paired MD5 sidecars
+    assert all(importer.md5_sidecars.values())
+    assert importer._validate_files()
+
+
+def test_genotype_file_index():
+    index = GenotypeFileIndex(
+        [
+            (False, "/a/bwa.gatk_hc.varfish_annotated.S1-N1-DNA1-WGS1.gts.tsv.gz"),
+            (True, "/a/bwa.delly2.varfish_annotated.S1-N1-DNA1-WGS1.gts.tsv.gz"),
+            (False, "/b/bwa.gatk_hc.varfish_annotated.S2-N1-DNA1-WGS1.gts.tsv.gz"),
+            (True, "/b/bwa.manta.varfish_annotated.S2-N1-DNA1-WGS1.gts.tsv.gz"),
+        ]
+    )
+
+    # same path up to the kind
+    assert index.is_sv("/a/bwa.delly2.varfish_annotated.S1-N1-DNA1-WGS1.db-infos.tsv.gz") is True
+    assert index.is_sv("/a/bwa.gatk_hc.varfish_annotated.S1-N1-DNA1-WGS1.db-infos.tsv.gz") is False
+    # same file name in another directory
+    assert index.is_sv("/c/bwa.manta.varfish_annotated.S2-N1-DNA1-WGS1.db-infos.tsv") is True
+    # same caller and sample
+    assert index.is_sv("/c/bwa_mem2.manta.annotated.S2-N1-DNA1-WGS1.db-infos.tsv.gz") is True
+    # edit distance among the files of the sample
+    assert index.is_sv("/b/bwa.gatk_hc_x.varfish_annotated.S2-N1-DNA1-WGS1.db-infos.tsv") is False
+    assert GenotypeFileIndex([]).is_sv("/a/x.db-infos.tsv.gz") is None
+
+
+def _bgzip(data: bytes, block_size: int = 1000) -> bytes:
+    """Compress ``data`` in bgzip blocks of ``block_size`` uncompressed bytes."""
+    result = b""
+    for offset in range(0, len(data) + 1, block_size):
+        chunk = data[offset : offset + block_size]
+        compressor = zlib.compressobj(6, zlib.DEFLATED, -15)
+        deflated = compressor.compress(chunk) + compressor.flush()
+        header = b"\x1f\x8b\x08\x04\x00\x00\x00\x00\x00\xff\x06\x00BC\x02\x00"
+        header += (len(deflated) + 25).to_bytes(2, "little")
+        trailer = zlib.crc32(chunk).to_bytes(4, "little") + len(chunk).to_bytes(4, "little")
+        result += header + deflated + trailer
+    return result
+
+
+def _genotype_rows(count: int, invalid: typing.Dict[int, str]) -> bytes:
+    lines = ["\t".join(EXPECTED_GTS)]
+    for no in range(count):
+        values = {key: "." for key in EXPECTED_GTS}
+        values["release"] = "GRCh37"
+        values["genotype"] = '{"""S1""":{"""gt""":"""0/1"""},"""S2""":{"""gt""":"""0/0"""}}'
+        if invalid.get(no) == "release":
+            values["release"] = "GRCh38"
+        elif invalid.get(no) == "samples":
+            values["genotype"] = '{"""S1""":{"""gt""":"""0/1"""}}'
+        line = "\t".join(values[key] for key in EXPECTED_GTS)
+        if invalid.get(no) == "columns":
+            line += "\textra"
+        lines.append(line)
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+@pytest.mark.parametrize("compression", ["plain", "gzip", "bgzip"])
+def test_file_validator(tmp_path, compression: str):
+    data = _genotype_rows(500, {0: "release", 137: "samples", 499: "columns"})
+    path = tmp_path / ("gts.tsv" if compression == "plain" else "gts.tsv.gz")
+    if compression == "gzip":
+        path.write_bytes(gzip.compress(data))
+    elif compression == "bgzip":
+        path.write_bytes(_bgzip(data))
+    else:
+        path.write_bytes(data)
+    (tmp_path / "case.ped").write_text("FAM\tS1\t0\t0\t1\t2\nFAM\tS2\t0\t0\t2\t1\n")
+    chunks = split_file(str(path), compression, 512)
+    assert (len(chunks) == 1) == (compression == "gzip")
+
+    validator = FileValidator(
+        paths=[str(path)],
+        genomebuild=models.GenomeBuild.GRCH37,
+        paths_ped=[str(tmp_path / "case.ped")],
+        jobs=2,
+        chunk_size=512,
+    )
+    (result,) = validator.run()
+
+    assert result.rows == 500
+    assert result.error_count == 3
+    assert result.errors == [
+        "line 2: expected release GRCh37 but found GRCh38",
+        "line 139: samples in genotype column ['S1'] do not match ['S1', 'S2']",
+        "line 501: expected %d columns but found %d" % (len(EXPECTED_GTS), len(EXPECTED_GTS) + 1),
+    ]
+    assert validator.rows_per_second > 0
+
+
+def test_importer_validate(runner: CliRunner, fake_fs_configured: FakeFs, mocker: MockerFixture):
+    mocker.patch("varfish_cli.config.open", fake_fs_configured.open_, create=True)
+    mocker.patch("varfish_cli.config.os", fake_fs_configured.os)
+
+    result = runner.invoke(app, ["importer", "validate", "--jobs", "2", "tests/data/importer"])
+
+    assert result.exit_code == 0, result.output
+    assert "gts.tsv.gz" in result.output
+    assert "total" in result.output
+
+
+def test_importer_validate_without_server(
+    runner: CliRunner, fake_fs_empty_config: FakeFs, mocker: MockerFixture, monkeypatch
+):
+    mocker.patch("varfish_cli.config.open", fake_fs_empty_config.open_, create=True)
+    mocker.patch("varfish_cli.config.os", fake_fs_empty_config.os)
+    monkeypatch.delenv("VARFISH_SERVER_URL", raising=False)
+    monkeypatch.delenv("VARFISH_API_TOKEN", raising=False)
+
+    result = runner.invoke(app, ["importer", "validate", "--jobs", "2", "tests/data/importer"])
+
+    assert result.exit_code == 0, result.output
+    assert "total" in result.output
+    with pytest.raises(InvalidConfiguration):
+        runner.invoke(app, ["importer", "caseimportinfo-list", str(uuid.uuid4())])
+
+
+def test_split_files_by_role_directory_with_binary_files(
+    tmp_path, fake_conn: typing.Tuple[str, str]
+):
+    host, token = fake_conn
+    shutil.copytree("tests/data/importer", tmp_path / "importer")
+    (tmp_path / "importer" / "sample.bam.bai").write_bytes(os.urandom(4096))
+    (tmp_path / "importer" / "broken.tsv.gz").write_bytes(os.urandom(4096))
+    importer = CaseImporter(
+        options=CaseImportOptions(
+            paths=[str(tmp_path / "importer")],
+            genomebuild=models.GenomeBuild.GRCH37,
+            strip_family_regex="^FAM_",
+            project_uuid=uuid.uuid4(),
+            resubmit=False,
+            force_fresh=False,
+            case_name_suffix="",
+            index=None,
+        ),
+        common_options=CommonOptions(varfish_server_url=host, varfish_api_token=token),
+    )
+
+    importer._split_files_by_role()
+
+    assert importer.path_ped.basename == "Case_3_index-N1-DNA1-WGS1.ped"
+    assert len(importer.paths_genotype) == 1
+    assert str(tmp_path / "importer" / "sample.bam.bai") not in importer.probes
+    assert importer.probes[str(tmp_path / "importer" / "broken.tsv.gz")].header == []
+
+
+def test_importer_validate_multiple_families(
+    runner: CliRunner, fake_fs_configured: FakeFs, tmp_path, mocker: MockerFixture
+):
+    mocker.patch("varfish_cli.config.open", fake_fs_configured.open_, create=True)
+    mocker.patch("varfish_cli.config.os", fake_fs_configured.os)
+    shutil.copytree("tests/data/importer", tmp_path / "case_3")
+    (tmp_path / "case_3" / "sample.bam.bai").write_bytes(os.urandom(4096))
+    (tmp_path / "other").mkdir()
+    (tmp_path / "other" / "other.ped").write_text("FAM\tS1\t0\t0\t1\t2\nFAM\tS2\t0\t0\t2\t1\n")
+    (tmp_path / "other" / "other.gts.tsv.gz").write_bytes(gzip.compress(_genotype_rows(10, {})))
+
+    result = runner.invoke(app, ["importer", "validate", "--jobs", "2", str(tmp_path)])
+
+    assert result.exit_code == 0, result.output
+    assert "other.gts.tsv.gz" in result.output
+    assert "Case_3_index-N1-DNA1-WGS1.gts.tsv.gz" in result.output
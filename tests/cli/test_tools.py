@@ -1,12 +1,25 @@
 """Tests for the varfish_cli.tools module."""
 
+import concurrent.futures
+import gzip
+import hashlib
+import io
+import shutil
+
+import pytest
 from pytest_mock import MockerFixture
 from syrupy import SnapshotAssertion
 from typer.testing import CliRunner
 
+from tests.cli.test_importer import _bgzip
 from tests.conftest import FakeFs
 from varfish_cli.cli import app
 from varfish_cli.cli.tools import load_bam_qc
+from varfish_cli.cli.tools.recompress import (
+    compress_parallel,
+    recompress_file,
+    recompress_files,
+)
 
 
 def test_load_bam_qc(
@@ -55,3 +68,89 @@ def test_dragen_to_bam_qc(
 
     with open(f"{tmpdir}/OUT.tsv", "rt") as f:
         assert f.read() == snapshot
+
+
+@pytest.mark.parametrize("size", [0, 1, 4096, 100_000])
+def test_compress_parallel(size: int):
+    data = b"".join(b"%d\tchr1\t%d\tA\tC\n" % (i % 7, i) for i in range(size))[:size]
+    outputf = io.BytesIO()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+        md5 = compress_parallel(
+            io.BytesIO(data), outputf, executor, block_size=1000, max_in_flight=3
+        )
+
+    assert gzip.decompress(outputf.getvalue()) == data
+    assert md5 == hashlib.md5(outputf.getvalue()).hexdigest()
+
+
+def test_recompress_file(tmp_path):
+    data = b"".join(b"%d\tchr1\t%d\tA\tC\n" % (i % 7, i) for i in range(100_000))
+    path = tmp_path / "x.gts.tsv.gz"
+    path.write_bytes(gzip.compress(data, compresslevel=1))
+    size_before = path.stat().st_size
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+        result = recompress_file(str(path), executor, block_size=10_000)
+        again = recompress_file(str(path), executor, block_size=10_000)
+
+    assert result.replaced
+    assert (result.size_before, result.size_after) == (size_before, path.stat().st_size)
+    assert gzip.decompress(path.read_bytes()) == data
+    assert (tmp_path / "x.gts.tsv.gz.md5").read_text() == "%s  x.gts.tsv.gz\n" % (
+        hashlib.md5(path.read_bytes()).hexdigest()
+    )
+    assert not again.replaced
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_recompress_file_keeps_original_on_mismatch(tmp_path, mocker: MockerFixture):
+    data = b"".join(b"%d\tchr1\t%d\tA\tC\n" % (i % 7, i) for i in range(100_000))
+    path = tmp_path / "x.gts.tsv.gz"
+    original = gzip.compress(data, compresslevel=1)
+    path.write_bytes(original)
+    mocker.patch("varfish_cli.cli.tools.recompress._content_md5", return_value="0" * 32)
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+        result = recompress_file(str(path), executor, block_size=10_000)
+
+    assert not result.verified
+    assert not result.replaced
+    assert path.read_bytes() == original
+    assert (tmp_path / "x.gts.tsv.gz.md5").read_text() == "%s  x.gts.tsv.gz\n" % (
+        hashlib.md5(original).hexdigest()
+    )
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_recompress_files_skips_bgzip(tmp_path):
+    shutil.copytree("tests/data/importer", tmp_path / "importer")
+    path = next((tmp_path / "importer").glob("*.gts.tsv.gz"))
+    original = _bgzip(gzip.decompress(path.read_bytes()))
+    path.write_bytes(original)
+
+    results = recompress_files([str(tmp_path / "importer")], jobs=2)
+
+    assert results
+    assert str(path) not in [result.path for result in results]
+    assert path.read_bytes() == original
+
+
+def test_recompress(
+    runner: CliRunner,
+    fake_fs_configured: FakeFs,
+    tmp_path,
+    mocker: MockerFixture,
+):
+    mocker.patch("varfish_cli.config.open", fake_fs_configured.open_, create=True)
+    mocker.patch("varfish_cli.config.os", fake_fs_configured.os)
+    shutil.copytree("tests/data/importer", tmp_path / "importer")
+
+    result = runner.invoke(app, ["tools", "recompress", "-j", "2", str(tmp_path / "importer")])
+
+    assert result.exit_code == 0, result.output
+    assert "gts.tsv.gz" in result.output
+    assert "feature-effects" not in result.output
+    assert "total" in result.output
+    for path in (tmp_path / "importer").glob("*.gts.tsv.gz"):
+        with gzip.open(path, "rt") as inputf:
+            assert inputf.read()
@@ -0,0 +1,75 @@
+"""Tests for MD5 computation and caching."""
+
+import hashlib
+import os
+
+import pytest
+from pytest_mock import MockerFixture
+
+from varfish_cli import hashing
+from varfish_cli.exceptions import Md5Mismatch
+from varfish_cli.hashing import HashingReader, Md5Cache, compute_md5
+
+
+def test_compute_md5(tmp_path):
+    path = tmp_path / "data.bin"
+    data = os.urandom(10_000)
+    path.write_bytes(data)
+
+    assert compute_md5(str(path), buffer_size=1024) == hashlib.md5(data).hexdigest()
+
+
+def test_md5_cache_persistent(tmp_path, mocker: MockerFixture):
+    compute = mocker.spy(hashing, "compute_md5")
+    path = tmp_path / "data.txt"
+    path.write_bytes(b"hello\n")
+    db_path = str(tmp_path / "cache" / "md5sums.sqlite3")
+
+    first = Md5Cache(db_path)
+    assert first.md5(str(path)) == hashlib.md5(b"hello\n").hexdigest()
+    first.close()
+    second = Md5Cache(db_path)
+    assert second.md5(str(path)) == hashlib.md5(b"hello\n").hexdigest()
+    assert compute.call_count == 1
+
+    path.write_bytes(b"changed\n")
+    os.utime(path, (0, 12345))
+    assert second.md5(str(path)) == hashlib.md5(b"changed\n").hexdigest()
+    assert compute.call_count == 2
+
+
+def test_hashing_reader(tmp_path):
+    path = tmp_path / "data.bin"
+    path.write_bytes(b"x" * 10000)
+    with open(path, "rb") as inputf:
+        counts = []
+        reader = HashingReader(
+            inputf, expected_md5=hashlib.md5(b"x" * 10000).hexdigest(), callback=counts.append
+        )
+        chunks = iter(lambda: reader.read(4096), b"")
+        assert b"".join(chunks) == b"x" * 10000
+    assert counts == [4096, 4096, 1808]
+    assert reader.md5 == hashlib.md5(b"x" * 10000).hexdigest()
+    assert reader.name == str(path)
+
+
+def test_hashing_reader_mismatch(tmp_path):
+    path = tmp_path / "data.bin"
+    path.write_bytes(b"data\n")
+    with open(path, "rb") as inputf:
+        reader = HashingReader(inputf, expected_md5="0" * 32)
+        with pytest.raises(Md5Mismatch):
+            reader.read()
+
+
+def test_hashing_reader_seek(tmp_path):
+    path = tmp_path / "data.bin"
+    data = os.urandom(10_000)
+    path.write_bytes(data)
+    with open(path, "rb") as inputf:
+        reader = HashingReader(inputf, expected_md5=hashlib.md5(data).hexdigest())
+        reader.seek(6000)
+        reader.read(1000)
+        reader.seek(2000)
+        assert reader.read() == data[2000:]
+    assert reader.md5 == hashlib.md5(data).hexdigest()
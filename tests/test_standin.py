@@ -0,0 +1,116 @@
+"""Tests for the stand-in VarFish server."""
+
+import io
+import time
+import typing
+import uuid
+
+import pytest
+
+from varfish_cli import api
+from varfish_cli.api.client import HttpOptions, VarfishClient
+from varfish_cli.api.models import (
+    BamQcFile,
+    CaseImportInfo,
+    GenomeBuild,
+    PedigreeMember,
+)
+from varfish_cli.exceptions import RestApiCallException
+from varfish_cli.standin import StandInOptions, StandInServer
+
+TOKEN = "faKeTOKeN"
+
+
+@pytest.fixture
+def standin() -> typing.Iterator[StandInServer]:
+    with StandInServer() as server:
+        yield server
+
+
+def _client(server: StandInServer, **kwargs: typing.Any) -> VarfishClient:
+    return VarfishClient(server_url=server.url, api_token=TOKEN, **kwargs)
+
+
+def test_project_and_case_list(standin: StandInServer):
+    project = standin.store.add_project("Test Project")
+    for i in range(250):
+        standin.store.add_case(project["sodar_uuid"], f"case-{i}")
+    client = _client(standin)
+
+    projects = api.project_list(standin.url, TOKEN, client=client)
+    cases = api.case_list(standin.url, TOKEN, project["sodar_uuid"], client=client)
+
+    assert [p.title for p in projects] == ["Test Project"]
+    assert [c.name for c in cases] == [f"case-{i}" for i in range(250)]
+
+
+def test_case_import_info_and_files(standin: StandInServer):
+    project = standin.store.add_project()
+    client = _client(standin, http_options=HttpOptions(compress_requests="gzip"))
+    pedigree = [
+        PedigreeMember(name="index", father="0", mother="0", sex=1, affected=2, has_gt_entries=True)
+    ]
+    data = CaseImportInfo(
+        release=GenomeBuild.GRCH37, name="case", index="index", pedigree=pedigree * 20
+    )
+
+    created = api.case_import_info_create(
+        standin.url, TOKEN, project["sodar_uuid"], data, client=client
+    )
+    updated = api.case_import_info_update(
+        standin.url,
+        TOKEN,
+        project["sodar_uuid"],
+        created.sodar_uuid,
+        created.model_copy(update={"notes": "updated"}),
+        client=client,
+    )
+    uploaded = api.bam_qc_file_upload(
+        standin.url,
+        TOKEN,
+        created.sodar_uuid,
+        BamQcFile(name="qc.json", md5="d41d8cd98f00b204e9800998ecf8427e"),
+        files={"file": io.BytesIO(b"{}")},
+        client=client,
+    )
+    files = api.bam_qc_file_list(standin.url, TOKEN, created.sodar_uuid, client=client)
+    api.bam_qc_file_destroy(
+        standin.url, TOKEN, created.sodar_uuid, uploaded.sodar_uuid, client=client
+    )
+
+    assert created.project == uuid.UUID(project["sodar_uuid"])
+    assert updated.notes == "updated"
+    assert files == [uploaded]
+    assert api.bam_qc_file_list(standin.url, TOKEN, created.sodar_uuid, client=client) == []
+    assert client.stats.sent < client.stats.sent_uncompressed
+
+
+def test_requires_token(standin: StandInServer):
+    client = VarfishClient(server_url=standin.url, api_token=TOKEN)
+    client.session.headers.pop("Authorization")
+
+    assert client.get(f"{standin.url}/project/api/list").status_code == 401
+
+
+def test_latency():
+    with StandInServer(StandInOptions(latency=0.05)) as server:
+        started = time.monotonic()
+        api.project_list(server.url, TOKEN, client=_client(server))
+        assert time.monotonic() - started >= 0.05
+
+
+def test_error_injection():
+    with StandInServer(StandInOptions(error_rate=1.0)) as server:
+        client = _client(server, http_options=HttpOptions(retry_attempts=3))
+        with pytest.raises(RestApiCallException, match="503"):
+            api.project_list(server.url, TOKEN, client=client)
+        assert server.request_count == 3
+
+
+def test_error_injection_retried():
+    with StandInServer(StandInOptions(error_rate=0.5, seed=42)) as server:
+        project = server.store.add_project()
+        client = _client(server, http_options=HttpOptions(retry_attempts=20))
+        for _ in range(10):
+            api.project_retrieve(server.url, TOKEN, project["sodar_uuid"], client=client)
+        assert server.request_count > 10
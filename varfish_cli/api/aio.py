@@ -0,0 +1,612 @@
+"""Asyncio-native access to the VarFish Server API.
+
+This mirrors the blocking functions in ``varfish_cli.api`` but uses ``httpx``
+such that many API calls can be in flight at the same time without using
+threads.  The number of concurrent requests per host is bounded by a semaphore.
+"""
+
+import asyncio
+import json
+import typing
+import uuid
+
+import httpx
+from logzero import logger
+import pydantic
+
+from varfish_cli.api import case, varannos
+from varfish_cli.api.common import Page, validate_response
+from varfish_cli.api.models import (
+    BamQcFile,
+    Case,
+    CaseGeneAnnotationFile,
+    CaseImportInfo,
+    DatabaseInfoFile,
+    EffectsFile,
+    GenotypeFile,
+    VarAnnoSetEntryV1,
+    VarAnnoSetV1,
+    VariantSetImportInfo,
+)
+from varfish_cli.common import strip_trailing_slash
+from varfish_cli.exceptions import RestApiCallException
+
+#: Default number of concurrent requests per host.
+DEFAULT_MAX_CONCURRENCY = 10
+
+#: Type variable for the models returned by the helpers below.
+ModelType = typing.TypeVar("ModelType")
+
+
+class AsyncVarfishClient:
+    """Asynchronous HTTP client for the VarFish Server API.
+
+    Wraps an ``httpx.AsyncClient`` with preset authorization header and limits
+    the number of concurrent requests per host to ``max_concurrency``.
+    """
+
+    def __init__(
+        self,
+        server_url: str,
+        api_token: str,
+        verify_ssl: bool = True,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        transport: typing.Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        #: Base URL of the VarFish server, without trailing slash.
+        self.server_url = strip_trailing_slash(server_url)
+        #: Maximal number of concurrent requests per host.
+        self.max_concurrency = max_concurrency
+        #: The underlying ``httpx`` client.
+        self.client = httpx.AsyncClient(
+            headers={"Authorization": "Token %s" % api_token},
+            verify=verify_ssl,
+            limits=httpx.Limits(max_connections=max_concurrency),
+            transport=transport,
+        )
+        #: Semaphores limiting concurrent requests, by host.
+        self._semaphores: typing.Dict[str, asyncio.Semaphore] = {}
+
+    def _semaphore(self, url: str) -> asyncio.Semaphore:
+        host = httpx.URL(url).host
+        if host not in self._semaphores:
+            self._semaphores[host] = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphores[host]
+
+    async def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """Perform request with ``method`` against ``url``."""
+        async with self._semaphore(url):
+            logger.debug("Sending %s request to end point %s", method, url)
+            return await self.client.request(method, url, **kwargs)
+
+    async def aclose(self):
+        """Close the underlying client and its connections."""
+        await self.client.aclose()
+
+    async def __aenter__(self) -> "AsyncVarfishClient":
+        return self
+
+    async def __aexit__(self, *args: typing.Any):
+        await self.aclose()
+
+
+def _raise_for_status(response: httpx.Response):
+    if not response.is_success:
+        try:
+            msg = "REST API returned status code %d: %s" % (
+                response.status_code,
+                " ".join([" ".join(v) for v in response.json().values()]),
+            )
+        except json.JSONDecodeError:
+            msg = "REST API returned status code %d: %s" % (response.status_code, response.text)
+        raise RestApiCallException(msg)
+
+
+def _form_data(model: pydantic.BaseModel) -> typing.Dict[str, typing.Any]:
+    """Convert ``model`` to form data as sent by the blocking API functions."""
+    result = {}
+    for key, value in model.model_dump(mode="json").items():
+        if value is None:
+            continue
+        elif isinstance(value, dict):
+            result[key] = json.dumps(value)
+        else:
+            result[key] = value
+    return result
+
+
+async def _send(
+    client: AsyncVarfishClient, method: str, path: str, type_: typing.Type[ModelType], **kwargs
+) -> ModelType:
+    result = await client.request(method, f"{client.server_url}{path}", **kwargs)
+    _raise_for_status(result)
+    return validate_response(type_, result)
+
+
+async def _get(
+    client: AsyncVarfishClient, path: str, type_: typing.Type[ModelType], **kwargs
+) -> ModelType:
+    return await _send(client, "GET", path, type_, **kwargs)
+
+
+async def _delete(client: AsyncVarfishClient, path: str):
+    result = await client.request("DELETE", f"{client.server_url}{path}")
+    _raise_for_status(result)
+
+
+async def _upload(
+    client: AsyncVarfishClient,
+    path: str,
+    data: pydantic.BaseModel,
+    files: typing.Dict[str, typing.BinaryIO],
+) -> typing.Any:
+    return await _send(client, "POST", path, type(data), data=_form_data(data), files=files)
+
+
+async def case_list(
+    client: AsyncVarfishClient, project_uuid: typing.Union[str, uuid.UUID]
+) -> typing.List[Case]:
+    """Listing of cases from a project UUID."""
+    endpoint = "%s%s" % (
+        client.server_url,
+        case.ENDPOINT_CASE_LIST.format(project_uuid=project_uuid),
+    )
+    params: typing.Optional[typing.Dict[str, typing.Any]] = {"page_size": 100}
+    result_data: typing.List[Case] = []
+    while endpoint:
+        result = await client.request("GET", endpoint, params=params)
+        _raise_for_status(result)
+        try:
+            page = validate_response(Page[Case], result)
+        except pydantic.ValidationError as e:
+            raise RestApiCallException(
+                f"Call against {endpoint} did not return paginated object: {result.text}"
+            ) from e
+        result_data += page.results
+        endpoint, params = page.next, None
+    return result_data
+
+
+async def case_import_info_list(
+    client: AsyncVarfishClient,
+    project_uuid: typing.Union[str, uuid.UUID],
+    owner: typing.Optional[str] = None,
+) -> typing.List[CaseImportInfo]:
+    """Listing case import infos from a project UUID."""
+    return await _get(
+        client,
+        case.ENDPOINT_CASE_IMPORT_INFO_LIST.format(project_uuid=project_uuid),
+        typing.List[CaseImportInfo],
+        params={"owner": owner} if owner else None,
+    )
+
+
+async def case_import_info_retrieve(
+    client: AsyncVarfishClient,
+    project_uuid: typing.Union[str, uuid.UUID],
+    info_uuid: typing.Union[str, uuid.UUID],
+) -> CaseImportInfo:
+    return await _get(
+        client,
+        case.ENDPOINT_CASE_IMPORT_INFO_RETRIEVE.format(
+            project_uuid=project_uuid, case_import_info_uuid=info_uuid
+        ),
+        CaseImportInfo,
+    )
+
+
+async def case_import_info_create(
+    client: AsyncVarfishClient,
+    project_uuid: typing.Union[str, uuid.UUID],
+    data: CaseImportInfo,
+) -> CaseImportInfo:
+    """Create new CaseImportInfo on server."""
+    return await _send(
+        client,
+        "POST",
+        case.ENDPOINT_CASE_IMPORT_INFO_CREATE.format(project_uuid=project_uuid),
+        CaseImportInfo,
+        json=data.model_dump(mode="json"),
+    )
+
+
+async def case_import_info_update(
+    client: AsyncVarfishClient,
+    project_uuid: typing.Union[str, uuid.UUID],
+    case_import_info_uuid: typing.Union[str, uuid.UUID],
+    data: CaseImportInfo,
+) -> CaseImportInfo:
+    """Update CaseImportInfo on server."""
+    return await _send(
+        client,
+        "PUT",
+        case.ENDPOINT_CASE_IMPORT_INFO_UPDATE.format(
+            project_uuid=project_uuid, case_import_info_uuid=case_import_info_uuid
+        ),
+        CaseImportInfo,
+        json=data.model_dump(mode="json"),
+    )
+
+
+async def variant_set_import_info_list(
+    client: AsyncVarfishClient, case_import_info_uuid: typing.Union[str, uuid.UUID]
+) -> typing.List[VariantSetImportInfo]:
+    """List variant set import infos."""
+    return await _get(
+        client,
+        case.ENDPOINT_VARIANT_SET_IMPORT_INFO_LIST.format(
+            case_import_info_uuid=case_import_info_uuid
+        ),
+        typing.List[VariantSetImportInfo],
+    )
+
+
+async def variant_set_import_info_create(
+    client: AsyncVarfishClient,
+    case_import_info_uuid: typing.Union[str, uuid.UUID],
+    data: VariantSetImportInfo,
+) -> VariantSetImportInfo:
+    """Create variant set import info."""
+    return await _send(
+        client,
+        "POST",
+        case.ENDPOINT_VARIANT_SET_IMPORT_INFO_CREATE.format(
+            case_import_info_uuid=case_import_info_uuid
+        ),
+        VariantSetImportInfo,
+        json=data.model_dump(mode="json"),
+    )
+
+
+async def variant_set_import_info_update(
+    client: AsyncVarfishClient,
+    case_import_info_uuid: typing.Union[str, uuid.UUID],
+    variant_set_import_info_uuid: typing.Union[str, uuid.UUID],
+    data: VariantSetImportInfo,
+) -> VariantSetImportInfo:
+    """Update variant set import info."""
+    return await _send(
+        client,
+        "PUT",
+        case.ENDPOINT_VARIANT_SET_IMPORT_INFO_UPDATE.format(
+            case_import_info_uuid=case_import_info_uuid,
+            variant_set_import_info_uuid=variant_set_import_info_uuid,
+        ),
+        VariantSetImportInfo,
+        json=data.model_dump(mode="json"),
+    )
+
+
+async def bam_qc_file_list(
+    client: AsyncVarfishClient, case_import_info_uuid: typing.Union[str, uuid.UUID]
+) -> typing.List[BamQcFile]:
+    return await _get(
+        client,
+        case.ENDPOINT_BAM_QC_FILE_LIST.format(case_import_info_uuid=case_import_info_uuid),
+        typing.List[BamQcFile],
+    )
+
+
+async def bam_qc_file_upload(
+    client: AsyncVarfishClient,
+    case_import_info_uuid: typing.Union[str, uuid.UUID],
+    data: BamQcFile,
+    files: typing.Dict[str, typing.BinaryIO],
+) -> BamQcFile:
+    return await _upload(
+        client,
+        case.ENDPOINT_BAM_QC_FILE_CREATE.format(case_import_info_uuid=case_import_info_uuid),
+        data,
+        files,
+    )
+
+
+async def bam_qc_file_destroy(
+    client: AsyncVarfishClient,
+    case_import_info_uuid: typing.Union[str, uuid.UUID],
+    bam_qc_file_uuid: typing.Union[str, uuid.UUID],
+):
+    await _delete(
+        client,
+        case.ENDPOINT_BAM_QC_FILE_DESTROY.format(
+            case_import_info_uuid=case_import_info_uuid, bam_qc_file_uuid=bam_qc_file_uuid
+        ),
+    )
+
+
+async def case_gene_annotation_file_list(
+    client: AsyncVarfishClient, case_import_info_uuid: typing.Union[str, uuid.UUID]
+) -> typing.List[CaseGeneAnnotationFile]:
+    return await _get(
+        client,
+        case.ENDPOINT_CASE_GENE_ANNOTATION_FILE_LIST.format(
+            case_import_info_uuid=case_import_info_uuid
+        ),
+        typing.List[CaseGeneAnnotationFile],
+    )
+
+
+async def case_gene_annotation_file_upload(
+    client: AsyncVarfishClient,
+    case_import_info_uuid: typing.Union[str, uuid.UUID],
+    data: CaseGeneAnnotationFile,
+    files: typing.Dict[str, typing.BinaryIO],
+) -> CaseGeneAnnotationFile:
+    return await _upload(
+        client,
+        case.ENDPOINT_CASE_GENE_ANNOTATION_FILE_CREATE.format(
+            case_import_info_uuid=case_import_info_uuid
+        ),
+        data,
+        files,
+    )
+
+
+async def case_gene_annotation_file_destroy(
+    client: AsyncVarfishClient,
+    case_import_info_uuid: typing.Union[str, uuid.UUID],
+    case_gene_annotation_file_uuid: typing.Union[str, uuid.UUID],
+):
+    await _delete(
+        client,
+        case.ENDPOINT_CASE_GENE_ANNOTATION_FILE_DESTROY.format(
+            case_import_info_uuid=case_import_info_uuid,
+            case_gene_annotation_file_uuid=case_gene_annotation_file_uuid,
+        ),
+    )
+
+
+async def genotype_file_list(
+    client: AsyncVarfishClient, variant_set_import_info_uuid: typing.Union[str, uuid.UUID]
+) -> typing.List[GenotypeFile]:
+    return await _get(
+        client,
+        case.ENDPOINT_GENOTYPE_FILE_LIST.format(
+            variant_set_import_info_uuid=variant_set_import_info_uuid
+        ),
+        typing.List[GenotypeFile],
+    )
+
+
+async def genotype_file_upload(
+    client: AsyncVarfishClient,
+    variant_set_import_info_uuid: typing.Union[str, uuid.UUID],
+    data: GenotypeFile,
+    files: typing.Dict[str, typing.BinaryIO],
+) -> GenotypeFile:
+    return await _upload(
+        client,
+        case.ENDPOINT_GENOTYPE_FILE_CREATE.format(
+            variant_set_import_info_uuid=variant_set_import_info_uuid
+        ),
+        data,
+        files,
+    )
+
+
+async def genotype_file_destroy(
+    client: AsyncVarfishClient,
+    variant_set_import_info_uuid: typing.Union[str, uuid.UUID],
+    genotype_file_uuid: typing.Union[str, uuid.UUID],
+):
+    await _delete(
+        client,
+        case.ENDPOINT_GENOTYPE_FILE_DESTROY.format(
+            variant_set_import_info_uuid=variant_set_import_info_uuid,
+            genotype_file_uuid=genotype_file_uuid,
+        ),
+    )
+
+
+async def effects_file_list(
+    client: AsyncVarfishClient, variant_set_import_info_uuid: typing.Union[str, uuid.UUID]
+) -> typing.List[EffectsFile]:
+    return await _get(
+        client,
+        case.ENDPOINT_EFFECTS_FILE_LIST.format(
+            variant_set_import_info_uuid=variant_set_import_info_uuid
+        ),
+        typing.List[EffectsFile],
+    )
+
+
+async def effects_file_upload(
+    client: AsyncVarfishClient,
+    variant_set_import_info_uuid: typing.Union[str, uuid.UUID],
+    data: EffectsFile,
+    files: typing.Dict[str, typing.BinaryIO],
+) -> EffectsFile:
+    return await _upload(
+        client,
+        case.ENDPOINT_EFFECTS_FILE_CREATE.format(
+            variant_set_import_info_uuid=variant_set_import_info_uuid
+        ),
+        data,
+        files,
+    )
+
+
+async def effects_file_destroy(
+    client: AsyncVarfishClient,
+    variant_set_import_info_uuid: typing.Union[str, uuid.UUID],
+    effects_file_uuid: typing.Union[str, uuid.UUID],
+):
+    await _delete(
+        client,
+        case.ENDPOINT_EFFECTS_FILE_DESTROY.format(
+            variant_set_import_info_uuid=variant_set_import_info_uuid,
+            effects_file_uuid=effects_file_uuid,
+        ),
+    )
+
+
+async def db_info_file_list(
+    client: AsyncVarfishClient, variant_set_import_info_uuid: typing.Union[str, uuid.UUID]
+) -> typing.List[DatabaseInfoFile]:
+    return await _get(
+        client,
+        case.ENDPOINT_DB_INFO_FILE_LIST.format(
+            variant_set_import_info_uuid=variant_set_import_info_uuid
+        ),
+        typing.List[DatabaseInfoFile],
+    )
+
+
+async def db_info_file_upload(
+    client: AsyncVarfishClient,
+    variant_set_import_info_uuid: typing.Union[str, uuid.UUID],
+    data: DatabaseInfoFile,
+    files: typing.Dict[str, typing.BinaryIO],
+) -> DatabaseInfoFile:
+    return await _upload(
+        client,
+        case.ENDPOINT_DB_INFO_FILE_CREATE.format(
+            variant_set_import_info_uuid=variant_set_import_info_uuid
+        ),
+        data,
+        files,
+    )
+
+
+async def db_info_file_destroy(
+    client: AsyncVarfishClient,
+    variant_set_import_info_uuid: typing.Union[str, uuid.UUID],
+    db_info_file_uuid: typing.Union[str, uuid.UUID],
+):
+    await _delete(
+        client,
+        case.ENDPOINT_DB_INFO_FILE_DESTROY.format(
+            variant_set_import_info_uuid=variant_set_import_info_uuid,
+            db_info_file_uuid=db_info_file_uuid,
+        ),
+    )
+
+
+async def varannoset_list(
+    client: AsyncVarfishClient, project_uuid: typing.Union[str, uuid.UUID]
+) -> typing.List[VarAnnoSetV1]:
+    """Listing of varannosets from a project UUID."""
+    return await _get(
+        client,
+        varannos.ENDPOINT_VARANNOSET_LISTCREATE.format(project_uuid=project_uuid),
+        typing.List[VarAnnoSetV1],
+    )
+
+
+async def varannoset_create(
+    client: AsyncVarfishClient,
+    project_uuid: typing.Union[str, uuid.UUID],
+    payload: VarAnnoSetV1,
+) -> VarAnnoSetV1:
+    """Creating of varannosets inside a project."""
+    return await _send(
+        client,
+        "POST",
+        varannos.ENDPOINT_VARANNOSET_LISTCREATE.format(project_uuid=project_uuid),
+        VarAnnoSetV1,
+        data=_form_data(payload),
+    )
+
+
+async def varannoset_retrieve(
+    client: AsyncVarfishClient, varannoset_uuid: typing.Union[str, uuid.UUID]
+) -> VarAnnoSetV1:
+    """Retrieve varannoset from its UUID."""
+    return await _get(
+        client,
+        varannos.ENDPOINT_VARANNOSET_RETRIEVEUPDATEDESTROY.format(varannoset_uuid=varannoset_uuid),
+        VarAnnoSetV1,
+    )
+
+
+async def varannoset_update(
+    client: AsyncVarfishClient,
+    varannoset_uuid: typing.Union[str, uuid.UUID],
+    payload: VarAnnoSetV1,
+) -> VarAnnoSetV1:
+    """Update single varannoset at its UUID."""
+    return await _send(
+        client,
+        "PATCH",
+        varannos.ENDPOINT_VARANNOSET_RETRIEVEUPDATEDESTROY.format(varannoset_uuid=varannoset_uuid),
+        VarAnnoSetV1,
+        data=_form_data(payload),
+    )
+
+
+async def varannoset_destroy(
+    client: AsyncVarfishClient, varannoset_uuid: typing.Union[str, uuid.UUID]
+) -> None:
+    """Delete varannoset at its UUID."""
+    await _delete(
+        client,
+        varannos.ENDPOINT_VARANNOSET_RETRIEVEUPDATEDESTROY.format(varannoset_uuid=varannoset_uuid),
+    )
+
+
+async def varannosetentry_list(
+    client: AsyncVarfishClient, varannoset_uuid: typing.Union[str, uuid.UUID]
+) -> typing.List[VarAnnoSetEntryV1]:
+    """Listing of varannosetentries from a varannoset UUID."""
+    return await _get(
+        client,
+        varannos.ENDPOINT_VARANNOSETENTRY_LISTCREATE.format(varannoset_uuid=varannoset_uuid),
+        typing.List[VarAnnoSetEntryV1],
+    )
+
+
+async def varannosetentry_create(
+    client: AsyncVarfishClient,
+    varannoset_uuid: typing.Union[str, uuid.UUID],
+    payload: VarAnnoSetEntryV1,
+) -> VarAnnoSetEntryV1:
+    """Creating of varannosetentries inside a varannoset."""
+    return await _send(
+        client,
+        "POST",
+        varannos.ENDPOINT_VARANNOSETENTRY_LISTCREATE.format(varannoset_uuid=varannoset_uuid),
+        VarAnnoSetEntryV1,
+        data=_form_data(payload),
+    )
+
+
+async def varannosetentry_retrieve(
+    client: AsyncVarfishClient, varannosetentry_uuid: typing.Union[str, uuid.UUID]
+) -> VarAnnoSetEntryV1:
+    """Retrieve varannosetentry from its UUID."""
+    return await _get(
+        client,
+        varannos.ENDPOINT_VARANNOSETENTRY_RETRIEVEUPDATEDESTROY.format(
+            varannosetentry_uuid=varannosetentry_uuid
+        ),
+        VarAnnoSetEntryV1,
+    )
+
+
+async def varannosetentry_update(
+    client: AsyncVarfishClient,
+    varannosetentry_uuid: typing.Union[str, uuid.UUID],
+    payload: VarAnnoSetEntryV1,
+) -> VarAnnoSetEntryV1:
+    """Update single varannosetentry at its UUID."""
+    return await _send(
+        client,
+        "PATCH",
+        varannos.ENDPOINT_VARANNOSETENTRY_RETRIEVEUPDATEDESTROY.format(
+            varannosetentry_uuid=varannosetentry_uuid
+        ),
+        VarAnnoSetEntryV1,
+        data=_form_data(payload),
+    )
+
+
+async def varannosetentry_destroy(
+    client: AsyncVarfishClient, varannosetentry_uuid: typing.Union[str, uuid.UUID]
+) -> None:
+    """Delete varannosetentry at its UUID."""
+    await _delete(
+        client,
+        varannos.ENDPOINT_VARANNOSETENTRY_RETRIEVEUPDATEDESTROY.format(
+            varannosetentry_uuid=varannosetentry_uuid
+        ),
+    )
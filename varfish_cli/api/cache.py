@@ -0,0 +1,166 @@
+"""On-disk cache for responses of the VarFish Server API.
+
+Entries are keyed by the request URL and a hash of the API token.  They are
+revalidated with conditional requests (``If-None-Match``/``If-Modified-Since``)
+on each use, discarded after a configurable TTL, and the least recently used
+entries are evicted when the cache grows beyond its size limit.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+import typing
+
+from logzero import logger
+import pydantic
+import requests
+from requests.structures import CaseInsensitiveDict
+
+#: Default directory for caching.
+DEFAULT_CACHE_DIR = os.path.join(os.environ.get("XDG_CACHE_HOME", "~/.cache"), "varfish-cli")
+
+#: Response headers that are stored with the cached body.
+CACHED_HEADERS = ("content-type", "etag", "last-modified")
+
+
+class CacheOptions(pydantic.BaseModel):
+    """Cache settings, read from the ``[cache]`` section of the configuration file."""
+
+    model_config = pydantic.ConfigDict(frozen=True)
+
+    #: Whether the response cache is enabled, off by default as responses contain case data.
+    enabled: bool = False
+    #: Whether to keep MD5 sums of import files and the state of chunked uploads on disk.
+    persist_state: bool = True
+    #: Directory to store cached data in.
+    cache_dir: str = DEFAULT_CACHE_DIR
+    #: Maximal size of cached responses in bytes.
+    max_bytes: int = 256 * 1024 * 1024
+    #: Maximal age of cached responses in seconds.
+    ttl: float = 7 * 24 * 60 * 60
+
+    def state_path(self, filename: str) -> str:
+        """Return path of the state database ``filename``, ``":memory:"`` if not persisted."""
+        return os.path.join(self.cache_dir, filename) if self.persist_state else ":memory:"
+
+
+class CacheEntry(pydantic.BaseModel):
+    """A cached response."""
+
+    #: The request URL including query parameters.
+    url: str
+    #: Point in time of storing or last successful revalidation.
+    stored_at: float
+    #: Selected response headers, lower case names.
+    headers: typing.Dict[str, str]
+    #: The response body.
+    content: bytes
+
+    def to_response(self) -> requests.Response:
+        """Construct ``requests.Response`` from the cached data."""
+        response = requests.Response()
+        response.status_code = 200
+        response.url = self.url
+        response.headers = CaseInsensitiveDict(self.headers)
+        response._content = self.content
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        return response
+
+
+class ResponseCache:
+    """Size-bounded on-disk cache of responses with ETag/Last-Modified validators."""
+
+    def __init__(self, options: CacheOptions):
+        #: Directory with the cache files.
+        self.path = os.path.join(os.path.expanduser(options.cache_dir), "responses")
+        #: Maximal size in bytes.
+        self.max_bytes = options.max_bytes
+        #: Maximal age of entries in seconds.
+        self.ttl = options.ttl
+        #: Guards eviction against concurrent writers from the same process.
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(url: str, api_token: str) -> str:
+        """Return cache key for ``url`` requested with ``api_token``."""
+        token_hash = hashlib.sha256(api_token.encode("utf-8")).hexdigest()
+        return hashlib.sha256(f"{token_hash} {url}".encode("utf-8")).hexdigest()
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.path, f"{key}.entry")
+
+    def load(self, key: str) -> typing.Optional[CacheEntry]:
+        """Load entry for ``key``, ``None`` if there is no entry or it has expired."""
+        path = self._entry_path(key)
+        try:
+            with open(path, "rb") as inputf:
+                meta = json.loads(inputf.readline())
+                content = inputf.read()
+            entry = CacheEntry(content=content, **meta)
+        except (OSError, ValueError, TypeError):  # missing, truncated, or corrupt
+            return None
+        if time.time() - entry.stored_at > self.ttl:
+            logger.debug("discarding expired cache entry for %s", entry.url)
+            self._remove(path)
+            return None
+        try:
+            os.utime(path)  # mark as recently used
+        except FileNotFoundError:  # evicted by another process
+            return None
+        return entry
+
+    def store(self, key: str, response: requests.Response):
+        """Store ``response`` for ``key`` if it carries validators for revalidation."""
+        headers = {k: response.headers[k] for k in CACHED_HEADERS if k in response.headers}
+        if "etag" not in headers and "last-modified" not in headers:
+            return
+        self._write(
+            key,
+            CacheEntry(
+                url=response.url, stored_at=time.time(), headers=headers, content=response.content
+            ),
+        )
+
+    def refresh(self, key: str, entry: CacheEntry):
+        """Mark ``entry`` as freshly revalidated."""
+        self._write(key, entry.model_copy(update={"stored_at": time.time()}))
+
+    def _write(self, key: str, entry: CacheEntry):
+        """Atomically write ``entry`` and evict old entries if necessary."""
+        os.makedirs(self.path, exist_ok=True)
+        meta = entry.model_dump(mode="json", exclude={"content"})
+        fd, tmp_path = tempfile.mkstemp(dir=self.path, suffix=".tmp")
+        with os.fdopen(fd, "wb") as outputf:
+            outputf.write(json.dumps(meta).encode("utf-8") + b"\n")
+            outputf.write(entry.content)
+        os.replace(tmp_path, self._entry_path(key))
+        self.evict()
+
+    def _remove(self, path: str):
+        try:
+            os.remove(path)
+        except OSError:  # pragma: no cover
+            pass
+
+    def evict(self):
+        """Evict least recently used entries until the cache fits into ``max_bytes``."""
+        with self._lock:
+            entries = []
+            with os.scandir(self.path) as it:
+                for dir_entry in it:
+                    if dir_entry.name.endswith(".entry"):
+                        try:
+                            stat = dir_entry.stat()
+                        except FileNotFoundError:  # removed by another process
+                            continue
+                        entries.append((stat.st_mtime, stat.st_size, dir_entry.path))
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                logger.debug("evicting cache entry %s", path)
+                self._remove(path)
+                total -= size
@@ -1,5 +1,8 @@
 """Implementation of API operations on cases."""
 
+import collections
+import concurrent.futures
+import itertools
 from json import JSONDecodeError
 import typing
 import uuid
@@ -10,7 +13,8 @@ import requests
 from simplejson import JSONDecodeError as SimpleJSONDecodeError
 
 from varfish_cli.api import models
-from varfish_cli.api.common import raise_for_status
+from varfish_cli.api.client import VarfishClient, get_client
+from varfish_cli.api.common import Page, raise_for_status, validate_response
 from varfish_cli.api.models import (
     BamQcFile,
     Case,
@@ -21,12 +25,23 @@ from varfish_cli.api.models import (
     GenotypeFile,
     VariantSetImportInfo,
 )
+from varfish_cli.api.resumable import (
+    ResumeJournal,
+    chunked_upload,
+    supports_chunked_upload,
+)
 from varfish_cli.common import strip_trailing_slash
+from varfish_cli.hashing import HashingReader
 
 from ..exceptions import RestApiCallException
 
 ACCEPT_API_VARFISH = ""
 
+#: Number of cases to request per page.
+CASE_LIST_PAGE_SIZE = 100
+#: Number of pages to fetch concurrently when the total count is known.
+PAGINATION_MAX_WORKERS = 4
+
 
 #: End point for listing cases.
 ENDPOINT_CASE_LIST = "/cases/api/case/list/{project_uuid}/"
@@ -120,27 +135,79 @@ def _construct_rest_api_call_exception(
             " ".join([" ".join(v) for v in response.json().values()]),
         )
     except (JSONDecodeError, SimpleJSONDecodeError):
-        msg = "REST API returned status code %d: %s" % (response.status_code, response.content)
+        msg = "REST API returned status code %d: %s" % (response.status_code, response.text)
     return RestApiCallException(msg)
 
 
-def _paginated_request(endpoint, result_data=None, **kwargs):
-    if not endpoint:
-        return result_data
+def _paginated_request(
+    client: VarfishClient,
+    endpoint: str,
+    item_type: typing.Any,
+    params: typing.Optional[typing.Dict[str, typing.Any]] = None,
+    max_workers: int = PAGINATION_MAX_WORKERS,
+    cached: bool = False,
+) -> typing.Iterator[typing.List[typing.Any]]:
+    """Yield the ``results`` of each page of a paginated end point as ``item_type``, in order.
+
+    If the first page reports the total ``count`` then the remaining pages are
+    fetched concurrently by page number.  Otherwise, the ``next`` links are
+    followed one by one.  With ``cached``, pages go through the client's response cache.
+    """
+    get = client.cached_get if cached else client.get
+
+    def fetch_page(url: str, params: typing.Optional[typing.Dict[str, typing.Any]]):
+        result = get(url, params=params)
+        raise_for_status(result)
+        try:
+            return validate_response(Page[item_type], result)
+        except pydantic.ValidationError as e:
+            raise RestApiCallException(
+                f"Call against {url} did not return paginated object: {result.text}"
+            ) from e
+
+    first_page = fetch_page(endpoint, params)
+    yield first_page.results
+    if not first_page.next:
+        return
+
+    if not first_page.count or not first_page.results:
+        next_url = first_page.next
+        while next_url:
+            page = fetch_page(next_url, None)
+            yield page.results
+            next_url = page.next
+        return
+
+    page_count = -(-first_page.count // len(first_page.results))
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending: typing.Deque[concurrent.futures.Future] = collections.deque()
+        for page_no in range(2, page_count + 1):
+            pending.append(
+                executor.submit(fetch_page, endpoint, {**(params or {}), "page": page_no})
+            )
+            if len(pending) >= max_workers:
+                yield pending.popleft().result().results
+        while pending:
+            yield pending.popleft().result().results
 
-    if result_data is None:
-        result_data = []
 
-    result = requests.get(endpoint, **kwargs)
-    raise_for_status(result)
-    result_json = result.json()
-    if "results" in result_json and "next" in result_json:
-        result_data += result_json["results"]
-        return _paginated_request(result_json["next"], result_data=result_data, **kwargs)
-    else:
-        raise RestApiCallException(
-            f"Call against {endpoint} did not return paginated object: {result_json}"
+def case_list_iter(
+    server_url: str,
+    api_token: str,
+    project_uuid: typing.Union[str, uuid.UUID],
+    verify_ssl: bool = True,
+    client: typing.Optional[VarfishClient] = None,
+) -> typing.Iterator[Case]:
+    """Iterate cases from a project UUID, yielding as soon as each page arrives."""
+    server_url = strip_trailing_slash(server_url)
+    endpoint = "%s%s" % (server_url, ENDPOINT_CASE_LIST.format(project_uuid=project_uuid))
+    logger.debug("Sending GET request to end point %s", endpoint)
+    client = client or get_client(server_url, api_token, verify_ssl)
+    yield from itertools.chain.from_iterable(
+        _paginated_request(
+            client, endpoint, Case, params={"page_size": CASE_LIST_PAGE_SIZE}, cached=True
         )
+    )
 
 
 def case_list(
@@ -148,16 +215,18 @@ def case_list(
     api_token: str,
     project_uuid: typing.Union[str, uuid.UUID],
     verify_ssl: bool = True,
+    client: typing.Optional[VarfishClient] = None,
 ) -> typing.List[Case]:
     """Listing of cases from a project UUID."""
-    server_url = strip_trailing_slash(server_url)
-    endpoint = "%s%s" % (server_url, ENDPOINT_CASE_LIST.format(project_uuid=project_uuid))
-    logger.debug("Sending GET request to end point %s", endpoint)
-    headers = {"Authorization": "Token %s" % api_token}
-    result = _paginated_request(
-        endpoint, headers=headers, verify=verify_ssl, params={"page_size": 100}
+    return list(
+        case_list_iter(
+            server_url=server_url,
+            api_token=api_token,
+            project_uuid=project_uuid,
+            verify_ssl=verify_ssl,
+            client=client,
+        )
     )
-    return pydantic.TypeAdapter(typing.List[Case]).validate_python(result)
 
 
 def case_retrieve(
@@ -165,14 +234,15 @@ def case_retrieve(
     api_token: str,
     case_uuid: typing.Union[str, uuid.UUID],
     verify_ssl: bool = True,
+    client: typing.Optional[VarfishClient] = None,
 ) -> CaseImportInfo:
     server_url = strip_trailing_slash(server_url)
     endpoint = "%s%s" % (server_url, ENDPOINT_CASE_RETRIEVE.format(case_uuid=case_uuid))
     logger.debug("Sending GET request to end point %s", endpoint)
-    headers = {"Authorization": "Token %s" % api_token}
-    result = requests.get(endpoint, headers=headers, verify=verify_ssl)
+    client = client or get_client(server_url, api_token, verify_ssl)
+    result = client.cached_get(endpoint)
     raise_for_status(result)
-    return pydantic.TypeAdapter(CaseImportInfo).validate_python(result.json())
+    return validate_response(CaseImportInfo, result)
 
 
 def case_import_info_list(
@@ -181,6 +251,7 @@ def case_import_info_list(
     project_uuid: typing.Union[str, uuid.UUID],
     owner=None,
     verify_ssl: bool = True,
+    client: typing.Optional[VarfishClient] = None,
 ) -> typing.List[CaseImportInfo]:
     """Listing case import infos from a project UUID."""
     server_url = strip_trailing_slash(server_url)
@@ -188,15 +259,15 @@ def case_import_info_list(
         server_url,
         ENDPOINT_CASE_IMPORT_INFO_LIST.format(project_uuid=project_uuid),
     )
-    headers = {"Authorization": "Token %s" % api_token}
+    client = client or get_client(server_url, api_token, verify_ssl)
     if owner:
         params = {"owner": owner}
     else:
         params = None
     logger.debug("Sending GET request to end point %s, params: %s", endpoint, params)
-    result = requests.get(endpoint, headers=headers, params=params, verify=verify_ssl)
+    result = client.get(endpoint, params=params)
     raise_for_status(result)
-    return pydantic.TypeAdapter(typing.List[CaseImportInfo]).validate_python(result.json())
+    return validate_response(typing.List[CaseImportInfo], result)
 
 
 def case_import_info_retrieve(
@@ -205,6 +276,7 @@ def case_import_info_retrieve(
     project_uuid: typing.Union[str, uuid.UUID],
     info_uuid: typing.Union[str, uuid.UUID],
     verify_ssl: bool = True,
+    client: typing.Optional[VarfishClient] = None,
 ) -> CaseImportInfo:
     server_url = strip_trailing_slash(server_url)
     endpoint = "%s%s" % (
@@ -213,11 +285,11 @@ def case_import_info_retrieve(
             project_uuid=project_uuid, case_import_info_uuid=info_uuid
         ),
     )
-    headers = {"Authorization": "Token %s" % api_token}
+    client = client or get_client(server_url, api_token, verify_ssl)
     logger.debug("Sending GET request to end point %s", endpoint)
-    result = requests.get(endpoint, headers=headers, verify=verify_ssl)
+    result = client.get(endpoint)
     raise_for_status(result)
-    return pydantic.TypeAdapter(CaseImportInfo).validate_python(result.json())
+    return validate_response(CaseImportInfo, result)
 
 
 def case_import_info_create(
@@ -226,6 +298,7 @@ def case_import_info_create(
     project_uuid: typing.Union[str, uuid.UUID],
     data: models.CaseImportInfo,
     verify_ssl: bool = True,
+    client: typing.Optional[VarfishClient] = None,
 ) -> CaseImportInfo:
     """Create new CaseImportInfo on server."""
     server_url = strip_trailing_slash(server_url)
@@ -234,13 +307,11 @@ def case_import_info_create(
         ENDPOINT_CASE_IMPORT_INFO_CREATE.format(project_uuid=project_uuid),
     )
     logger.debug("Sending POST request to end point %s", endpoint)
-    headers = {"Authorization": "Token %s" % api_token}
+    client = client or get_client(server_url, api_token, verify_ssl)
     logger.debug("json=%s", data.model_dump(mode="json"))
-    result = requests.post(
-        endpoint, headers=headers, json=data.model_dump(mode="json"), verify=verify_ssl
-    )
+    result = client.post(endpoint, json=data.model_dump(mode="json"))
     raise_for_status(result)
-    return pydantic.TypeAdapter(CaseImportInfo).validate_python(result.json())
+    return validate_response(CaseImportInfo, result)
 
 
 def case_import_info_update(
@@ -250,6 +321,7 @@ def case_import_info_update(
     case_import_info_uuid: typing.Union[str, uuid.UUID],
     data: models.CaseImportInfo,
     verify_ssl: bool = True,
+    client: typing.Optional[VarfishClient] = None,
 ) -> CaseImportInfo:
     """Update CaseImportInfo on server."""
     server_url = strip_trailing_slash(server_url)
@@ -260,13 +332,11 @@ def case_import_info_update(
         ),
     )
     logger.debug("Sending PUT request to end point %s", endpoint)
-    headers = {"Authorization": "Token %s" % api_token}
+    client = client or get_client(server_url, api_token, verify_ssl)
     logger.debug("json=%s", data.model_dump(mode="json"))
-    result = requests.put(
-        endpoint, headers=headers, json=data.model_dump(mode="json"), verify=verify_ssl
-    )
+    result = client.put(endpoint, json=data.model_dump(mode="json"))
     raise_for_status(result)
-    return pydantic.TypeAdapter(CaseImportInfo).validate_python(result.json())
+    return validate_response(CaseImportInfo, result)
 
 
 def variant_set_import_info_list(
@@ -274,6 +344,7 @@ def variant_set_import_info_list(
     api_token: str,
     case_import_info_uuid: typing.Union[str, uuid.UUID],
     verify_ssl: bool = True,
+    client: typing.Optional[VarfishClient] = None,
 ) -> typing.List[VariantSetImportInfo]:
     """List variant set import infos."""
     server_url = strip_trailing_slash(server_url)
@@ -282,10 +353,10 @@ def variant_set_import_info_list(
         ENDPOINT_VARIANT_SET_IMPORT_INFO_LIST.format(case_import_info_uuid=case_import_info_uuid),
     )
     logger.debug("Sending GET request to end point %s", endpoint)
-    headers = {"Authorization": "Token %s" % api_token}
-    result = requests.get(endpoint, headers=headers, verify=verify_ssl)
+    client = client or get_client(server_url, api_token, verify_ssl)
+    result = client.get(endpoint)
     raise_for_status(result)
-    return pydantic.TypeAdapter(typing.List[VariantSetImportInfo]).validate_python(result.json())
+    return validate_response(typing.List[VariantSetImportInfo], result)
 
 
 def variant_set_import_info_create(
@@ -294,6 +365,7 @@ def variant_set_import_info_create(
     case_import_info_uuid: typing.Union[str, uuid.UUID],
     data: VariantSetImportInfo,
     verify_ssl: bool = True,
+    client: typing.Optional[VarfishClient] = None,
 ) -> typing.List[VariantSetImportInfo]:
     """Create variant set import info."""
     server_url = strip_trailing_slash(server_url)
@@ -302,12 +374,10 @@ def variant_set_import_info_create(
         ENDPOINT_VARIANT_SET_IMPORT_INFO_CREATE.format(case_import_info_uuid=case_import_info_uuid),
     )
     logger.debug("Sending POST request to end point %s", endpoint)
-    headers = {"Authorization": "Token %s" % api_token}
-    result = requests.post(
-        endpoint, headers=headers, json=data.model_dump(mode="json"), verify=verify_ssl
-    )
+    client = client or get_client(server_url, api_token, verify_ssl)
+    result = client.post(endpoint, json=data.model_dump(mode="json"))
     raise_for_status(result)
-    return pydantic.TypeAdapter(VariantSetImportInfo).validate_python(result.json())
+    return validate_response(VariantSetImportInfo, result)
 
 
 def variant_set_import_info_update(
@@ -317,6 +387,7 @@ def variant_set_import_info_update(
     variant_set_import_info_uuid: typing.Union[str, uuid.UUID],
     data: VariantSetImportInfo,
     verify_ssl: bool = True,
+    client: typing.Optional[VarfishClient] = None,
 ) -> VariantSetImportInfo:
     """Create variant set import info."""
     server_url = strip_trailing_slash(server_url)
@@ -328,13 +399,11 @@ def variant_set_import_info_update(
         ),
     )
     logger.debug("Sending PUT request to end point %s", endpoint)
-    headers = {"Authorization": "Token %s" % api_token}
+    client = client or get_client(server_url, api_token, verify_ssl)
     logger.debug("json=%s", data.model_dump(mode="json"))
-    result = requests.put(
-        endpoint, headers=headers, json=data.model_dump(mode="json"), verify=verify_ssl
-    )
+    result = client.put(endpoint, json=data.model_dump(mode="json"))
     raise_for_status(result)
-    return pydantic.TypeAdapter(VariantSetImportInfo).validate_python(result.json())
+    return validate_response(VariantSetImportInfo, result)
 
 
 def bam_qc_file_list(
@@ -342,6 +411,7 @@ def bam_qc_file_list(
     api_token: str,
     case_import_info_uuid: typing.Union[str, uuid.UUID],
     verify_ssl: bool = True,
+    client: typing.Optional[VarfishClient] = None,
 ) -> typing.List[BamQcFile]:
     server_url = strip_trailing_slash(server_url)
     endpoint = "%s%s" % (
@@ -349,10 +419,38 @@ def bam_qc_file_list(
         ENDPOINT_BAM_QC_FILE_LIST.format(case_import_info_uuid=case_import_info_uuid),
     )
     logger.debug("Sending GET request to end point %s", endpoint)
-    headers = {"Authorization": "Token %s" % api_token}
-    result = requests.get(endpoint, headers=headers, verify=verify_ssl)
+    client = client or get_client(server_url, api_token, verify_ssl)
+    result = client.get(endpoint)
     raise_for_status(result)
-    return pydantic.TypeAdapter(typing.List[BamQcFile]).validate_python(result.json())
+    return validate_response(typing.List[BamQcFile], result)
+
+
+def _file_upload(
+    client: VarfishClient,
+    endpoint: str,
+    data: pydantic.BaseModel,
+    files: typing.Dict[str, typing.BinaryIO],
+    journal: typing.Optional[ResumeJournal],
+) -> requests.Response:
+    """Upload file, in resumable chunks if ``journal`` is given and the server supports it.
+
+    For chunked uploads, the progress callback of a ``HashingReader`` is called with the
+    bytes confirmed by the server instead of the bytes read, which includes re-sent chunks.
+    """
+    if journal is not None and supports_chunked_upload(client, endpoint):
+        fileobj = files["file"]
+        callback = None
+        if isinstance(fileobj, HashingReader):
+            callback, fileobj.callback = fileobj.callback, None
+        return chunked_upload(
+            client,
+            endpoint,
+            data.model_dump(mode="json"),
+            fileobj,
+            journal,
+            callback=callback,
+        )
+    return client.post(endpoint, data=data.model_dump(mode="json"), files=files)
 
 
 def bam_qc_file_upload(
@@ -362,6 +460,8 @@ def bam_qc_file_upload(
     data: BamQcFile,
     files: typing.Dict[str, typing.BinaryIO],
     verify_ssl: bool = True,
+    client: typing.Optional[VarfishClient] = None,
+    journal: typing.Optional[ResumeJournal] = None,
 ) -> BamQcFile:
     server_url = strip_trailing_slash(server_url)
     endpoint = "%s%s" % (
@@ -369,12 +469,10 @@ def bam_qc_file_upload(
         ENDPOINT_BAM_QC_FILE_CREATE.format(case_import_info_uuid=case_import_info_uuid),
     )
     logger.debug("Sending POST request to end point %s", endpoint)
-    headers = {"Authorization": "Token %s" % api_token}
-    result = requests.post(
-        endpoint, headers=headers, data=data.model_dump(mode="json"), files=files, verify=verify_ssl
-    )
+    client = client or get_client(server_url, api_token, verify_ssl)
+    result = _file_upload(client, endpoint, data, files, journal)
     raise_for_status(result)
-    return pydantic.TypeAdapter(BamQcFile).validate_python(result.json())
+    return validate_response(BamQcFile, result)
 
 
 def bam_qc_file_destroy(
@@ -383,6 +481,7 @@ def bam_qc_file_destroy(
     case_import_info_uuid: typing.Union[str, uuid.UUID],
     bam_qc_file_uuid: typing.Union[str, uuid.UUID],
     verify_ssl: bool = True,
+    client: typing.Optional[VarfishClient] = None,
 ):
     server_url = strip_trailing_slash(server_url)
     endpoint = "%s%s" % (
@@ -392,17 +491,9 @@ def bam_qc_file_destroy(
         ),
     )
     logger.debug("Sending DELETE request to end point %s", endpoint)
-    headers = {"Authorization": "Token %s" % api_token}
-    result = requests.delete(endpoint, headers=headers, verify=verify_ssl)
-    if not result.ok:
-        try:
-            msg = "REST API returned status code %d: %s" % (
-                result.status_code,
-                " ".join([" ".join(v) for v in result.json().values()]),
-            )
-        except (JSONDecodeError, SimpleJSONDecodeError):
-            msg = "REST API returned status code %d: %s" % (result.status_code, result.content)
-        raise RestApiCallException(msg)
+    client = client or get_client(server_url, api_token, verify_ssl)
+    result = client.delete(endpoint)
+    raise_for_status(result)
 
 
 def case_gene_annotation_file_list(
@@ -410,6 +501,7 @@ def case_gene_annotation_file_list(
     api_token: str,
     case_import_info_uuid: typing.Union[str, uuid.UUID],
     verify_ssl: bool = True,
+    client: typing.Optional[VarfishClient] = None,
 ) -> typing.List[CaseGeneAnnotationFile]:
     server_url = strip_trailing_slash(server_url)
     endpoint = "%s%s" % (
@@ -417,10 +509,10 @@ def case_gene_annotation_file_list(
         ENDPOINT_CASE_GENE_ANNOTATION_FILE_LIST.format(case_import_info_uuid=case_import_info_uuid),
     )
     logger.debug("Sending GET request to end point %s", endpoint)
-    headers = {"Authorization": "Token %s" % api_token}
-    result = requests.get(endpoint, headers=headers, verify=verify_ssl)
+    client = client or get_client(server_url, api_token, verify_ssl)
+    result = client.get(endpoint)
     raise_for_status(result)
-    return pydantic.TypeAdapter(typing.List[CaseGeneAnnotationFile]).validate_python(result.json())
+    return validate_response(typing.List[CaseGeneAnnotationFile], result)
 
 
 def case_gene_annotation_file_upload(
@@ -430,6 +522,8 @@ def case_gene_annotation_file_upload(
     data: CaseGeneAnnotationFile,
     files: typing.Dict[str, typing.BinaryIO],
     verify_ssl: bool = True,
+    client: typing.Optional[VarfishClient] = None,
+    journal: typing.Optional[ResumeJournal] = None,
 ) -> CaseGeneAnnotationFile:
     server_url = strip_trailing_slash(server_url)
     endpoint = "%s%s" % (
@@ -439,12 +533,10 @@ def case_gene_annotation_file_upload(
         ),
     )
     logger.debug("Sending POST request to end point %s", endpoint)
-    headers = {"Authorization": "Token %s" % api_token}
-    result = requests.post(
-        endpoint, headers=headers, data=data.model_dump(mode="json"), files=files, verify=verify_ssl
-    )
+    client = client or get_client(server_url, api_token, verify_ssl)
+    result = _file_upload(client, endpoint, data, files, journal)
     raise_for_status(result)
-    return pydantic.TypeAdapter(CaseGeneAnnotationFile).validate_python(result.json())
+    return validate_response(CaseGeneAnnotationFile, result)
 
 
 def case_gene_annotation_file_destroy(
@@ -453,6 +545,7 @@ def case_gene_annotation_file_destroy(
     case_import_info_uuid: typing.Union[str, uuid.UUID],
     case_gene_annotation_file_uuid: typing.Union[str, uuid.UUID],
     verify_ssl: bool = True,
+    client: typing.Optional[VarfishClient] = None,
 ):
     server_url = strip_trailing_slash(server_url)
     endpoint = "%s%s" % (
@@ -463,17 +556,9 @@ def case_gene_annotation_file_destroy(
         ),
     )
     logger.debug("Sending DELETE request to end point %s", endpoint)
-    headers = {"Authorization": "Token %s" % api_token}
-    result = requests.delete(endpoint, headers=headers, verify=verify_ssl)
-    if not result.ok:
-        try:
-            msg = "REST API returned status code %d: %s" % (
-                result.status_code,
-                " ".join([" ".join(v) for v in result.json().values()]),
-            )
-        except (JSONDecodeError, SimpleJSONDecodeError):
-            msg = "REST API returned status code %d: %s" % (result.status_code, result.content)
-        raise RestApiCallException(msg)
+    client = client or get_client(server_url, api_token, verify_ssl)
+    result = client.delete(endpoint)
+    raise_for_status(result)
 
 
 def genotype_file_list(
@@ -481,6 +566,7 @@ def genotype_file_list(
     api_token: str,
     variant_set_import_info_uuid: typing.Union[str, uuid.UUID],
     verify_ssl: bool = True,
+    client: typing.Optional[VarfishClient] = None,
 ) -> typing.List[GenotypeFile]:
     server_url = strip_trailing_slash(server_url)
     endpoint = "%s%s" % (
@@ -490,10 +576,10 @@ def genotype_file_list(
         ),
     )
     logger.debug("Sending GET request to end point %s", endpoint)
-    headers = {"Authorization": "Token %s" % api_token}
-    result = requests.get(endpoint, headers=headers, verify=verify_ssl)
+    client = client or get_client(server_url, api_token, verify_ssl)
+    result = client.get(endpoint)
     raise_for_status(result)
-    return pydantic.TypeAdapter(typing.List[GenotypeFile]).validate_python(result.json())
+    return validate_response(typing.List[GenotypeFile], result)
 
 
 def genotype_file_upload(
@@ -503,6 +589,8 @@ def genotype_file_upload(
     data: GenotypeFile,
     files: typing.Dict[str, typing.BinaryIO],
     verify_ssl: bool = True,
+    client: typing.Optional[VarfishClient] = None,
+    journal: typing.Optional[ResumeJournal] = None,
 ) -> GenotypeFile:
     server_url = strip_trailing_slash(server_url)
     endpoint = "%s%s" % (
@@ -512,12 +600,10 @@ def genotype_file_upload(
         ),
     )
     logger.debug("Sending POST request to end point %s", endpoint)
-    headers = {"Authorization": "Token %s" % api_token}
-    result = requests.post(
-        endpoint, headers=headers, data=data.model_dump(mode="json"), files=files, verify=verify_ssl
-    )
+    client = client or get_client(server_url, api_token, verify_ssl)
+    result = _file_upload(client, endpoint, data, files, journal)
     raise_for_status(result)
-    return pydantic.TypeAdapter(GenotypeFile).validate_python(result.json())
+    return validate_response(GenotypeFile, result)
 
 
 def genotype_file_destroy(
@@ -526,6 +612,7 @@ def genotype_file_destroy(
     variant_set_import_info_uuid: typing.Union[str, uuid.UUID],
     genotype_file_uuid: typing.Union[str, uuid.UUID],
     verify_ssl: bool = True,
+    client: typing.Optional[VarfishClient] = None,
 ):
     server_url = strip_trailing_slash(server_url)
     endpoint = "%s%s" % (
@@ -536,17 +623,9 @@ def genotype_file_destroy(
         ),
     )
     logger.debug("Sending DELETE request to end point %s", endpoint)
-    headers = {"Authorization": "Token %s" % api_token}
-    result = requests.delete(endpoint, headers=headers, verify=verify_ssl)
-    if not result.ok:
-        try:
-            msg = "REST API returned status code %d: %s" % (
-                result.status_code,
-                " ".join([" ".join(v) for v in result.json().values()]),
-            )
-        except (JSONDecodeError, SimpleJSONDecodeError):
-            msg = "REST API returned status code %d: %s" % (result.status_code, result.content)
-        raise RestApiCallException(msg)
+    client = client or get_client(server_url, api_token, verify_ssl)
+    result = client.delete(endpoint)
+    raise_for_status(result)
 
 
 def effects_file_list(
@@ -554,6 +633,7 @@ def effects_file_list(
     api_token: str,
     variant_set_import_info_uuid: typing.Union[str, uuid.UUID],
     verify_ssl: bool = True,
+    client: typing.Optional[VarfishClient] = None,
 ) -> typing.List[EffectsFile]:
     server_url = strip_trailing_slash(server_url)
     endpoint = "%s%s" % (
@@ -563,10 +643,10 @@ def effects_file_list(
         ),
     )
     logger.debug("Sending GET request to end point %s", endpoint)
-    headers = {"Authorization": "Token %s" % api_token}
-    result = requests.get(endpoint, headers=headers, verify=verify_ssl)
+    client = client or get_client(server_url, api_token, verify_ssl)
+    result = client.get(endpoint)
     raise_for_status(result)
-    return pydantic.TypeAdapter(typing.List[EffectsFile]).validate_python(result.json())
+    return validate_response(typing.List[EffectsFile], result)
 
 
 def effects_file_upload(
@@ -576,6 +656,8 @@ def effects_file_upload(
     data: EffectsFile,
     files: typing.Dict[str, typing.BinaryIO],
     verify_ssl: bool = True,
+    client: typing.Optional[VarfishClient] = None,
+    journal: typing.Optional[ResumeJournal] = None,
 ) -> EffectsFile:
     server_url = strip_trailing_slash(server_url)
     endpoint = "%s%s" % (
@@ -585,12 +667,10 @@ def effects_file_upload(
         ),
     )
     logger.debug("Sending POST request to end point %s", endpoint)
-    headers = {"Authorization": "Token %s" % api_token}
-    result = requests.post(
-        endpoint, headers=headers, data=data.model_dump(mode="json"), files=files, verify=verify_ssl
-    )
+    client = client or get_client(server_url, api_token, verify_ssl)
+    result = _file_upload(client, endpoint, data, files, journal)
     raise_for_status(result)
-    return pydantic.TypeAdapter(EffectsFile).validate_python(result.json())
+    return validate_response(EffectsFile, result)
 
 
 def effects_file_destroy(
@@ -599,6 +679,7 @@ def effects_file_destroy(
     variant_set_import_info_uuid: typing.Union[str, uuid.UUID],
     effects_file_uuid: typing.Union[str, uuid.UUID],
     verify_ssl: bool = True,
+    client: typing.Optional[VarfishClient] = None,
 ):
     server_url = strip_trailing_slash(server_url)
     endpoint = "%s%s" % (
@@ -609,17 +690,9 @@ def effects_file_destroy(
         ),
     )
     logger.debug("Sending DELETE request to end point %s", endpoint)
-    headers = {"Authorization": "Token %s" % api_token}
-    result = requests.delete(endpoint, headers=headers, verify=verify_ssl)
-    if not result.ok:
-        try:
-            msg = "REST API returned status code %d: %s" % (
-                result.status_code,
-                " ".join([" ".join(v) for v in result.json().values()]),
-            )
-        except (JSONDecodeError, SimpleJSONDecodeError):
-            msg = "REST API returned status code %d: %s" % (result.status_code, result.content)
-        raise RestApiCallException(msg)
+    client = client or get_client(server_url, api_token, verify_ssl)
+    result = client.delete(endpoint)
+    raise_for_status(result)
 
 
 def db_info_file_list(
@@ -627,6 +700,7 @@ def db_info_file_list(
     api_token: str,
     variant_set_import_info_uuid: typing.Union[str, uuid.UUID],
     verify_ssl: bool = True,
+    client: typing.Optional[VarfishClient] = None,
 ) -> typing.List[DatabaseInfoFile]:
     server_url = strip_trailing_slash(server_url)
     endpoint = "%s%s" % (
@@ -636,10 +710,10 @@ def db_info_file_list(
         ),
     )
     logger.debug("Sending GET request to end point %s", endpoint)
-    headers = {"Authorization": "Token %s" % api_token}
-    result = requests.get(endpoint, headers=headers, verify=verify_ssl)
+    client = client or get_client(server_url, api_token, verify_ssl)
+    result = client.get(endpoint)
     raise_for_status(result)
-    return pydantic.TypeAdapter(typing.List[DatabaseInfoFile]).validate_python(result.json())
+    return validate_response(typing.List[DatabaseInfoFile], result)
 
 
 def db_info_file_upload(
@@ -649,6 +723,8 @@ def db_info_file_upload(
     data: DatabaseInfoFile,
     files: typing.Dict[str, typing.BinaryIO],
     verify_ssl: bool = True,
+    client: typing.Optional[VarfishClient] = None,
+    journal: typing.Optional[ResumeJournal] = None,
 ) -> DatabaseInfoFile:
     server_url = strip_trailing_slash(server_url)
     endpoint = "%s%s" % (
@@ -658,12 +734,10 @@ def db_info_file_upload(
         ),
     )
     logger.debug("Sending POST request to end point %s", endpoint)
-    headers = {"Authorization": "Token %s" % api_token}
-    result = requests.post(
-        endpoint, headers=headers, data=data.model_dump(mode="json"), files=files, verify=verify_ssl
-    )
+    client = client or get_client(server_url, api_token, verify_ssl)
+    result = _file_upload(client, endpoint, data, files, journal)
     raise_for_status(result)
-    return pydantic.TypeAdapter(DatabaseInfoFile).validate_python(result.json())
+    return validate_response(DatabaseInfoFile, result)
 
 
 def db_info_file_destroy(
@@ -672,6 +746,7 @@ def db_info_file_destroy(
     variant_set_import_info_uuid: typing.Union[str, uuid.UUID],
     db_info_file_uuid: typing.Union[str, uuid.UUID],
     verify_ssl: bool = True,
+    client: typing.Optional[VarfishClient] = None,
 ):
     server_url = strip_trailing_slash(server_url)
     endpoint = "%s%s" % (
@@ -682,14 +757,6 @@ def db_info_file_destroy(
         ),
     )
     logger.debug("Sending DELETE request to end point %s", endpoint)
-    headers = {"Authorization": "Token %s" % api_token}
-    result = requests.delete(endpoint, headers=headers, verify=verify_ssl)
-    if not result.ok:
-        try:
-            msg = "REST API returned status code %d: %s" % (
-                result.status_code,
-                " ".join([" ".join(v) for v in result.json().values()]),
-            )
-        except JSONDecodeError:
-            msg = "REST API returned status code %d: %s" % (result.status_code, result.content)
-        raise RestApiCallException(msg)
+    client = client or get_client(server_url, api_token, verify_ssl)
+    result = client.delete(endpoint)
+    raise_for_status(result)
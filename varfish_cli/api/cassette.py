@@ -0,0 +1,127 @@
+"""Record/replay transport for the VarFish Server API.
+
+``RecordingAdapter`` records all exchanges with a server to a cassette file and
+``ReplayAdapter`` serves the recorded responses again without any network access.
+Both are mounted as ``requests`` transport adapters by ``VarfishClient``.
+"""
+
+import base64
+import collections
+import json
+import threading
+import typing
+
+from logzero import logger
+import pydantic
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+#: Response headers that are not recorded as the content is stored decoded.
+SKIPPED_HEADERS = ("content-encoding", "content-length", "transfer-encoding", "connection")
+
+
+class CassetteInteraction(pydantic.BaseModel):
+    """A recorded request/response exchange."""
+
+    #: HTTP method of the request.
+    method: str
+    #: URL of the request including query parameters.
+    url: str
+    #: Response status code.
+    status_code: int
+    #: Response reason phrase.
+    reason: typing.Optional[str] = None
+    #: Response headers.
+    headers: typing.Dict[str, str] = {}
+    #: Base64 encoded response body.
+    content: str = ""
+
+
+class Cassette(pydantic.BaseModel):
+    """A sequence of recorded exchanges."""
+
+    #: The recorded exchanges, in order.
+    interactions: typing.List[CassetteInteraction] = []
+
+    @classmethod
+    def load(cls, path: str) -> "Cassette":
+        with open(path, "rt") as inputf:
+            return cls.model_validate_json(inputf.read())
+
+    def save(self, path: str):
+        with open(path, "wt") as outputf:
+            json.dump(self.model_dump(mode="json"), outputf, indent=2)
+            outputf.write("\n")
+
+
+class RecordingAdapter(HTTPAdapter):
+    """Transport adapter that records all exchanges and writes them to ``path`` on close."""
+
+    def __init__(self, path: str, **kwargs: typing.Any):
+        super().__init__(**kwargs)
+        #: Path to the cassette file.
+        self.path = path
+        #: The recorded exchanges.
+        self.cassette = Cassette()
+        self._lock = threading.Lock()
+
+    def send(self, request: requests.PreparedRequest, **kwargs: typing.Any) -> requests.Response:
+        response = super().send(request, **kwargs)
+        interaction = CassetteInteraction(
+            method=request.method,
+            url=request.url,
+            status_code=response.status_code,
+            reason=response.reason,
+            headers={k: v for k, v in response.headers.items() if k.lower() not in SKIPPED_HEADERS},
+            content=base64.b64encode(response.content).decode("ascii"),
+        )
+        with self._lock:
+            self.cassette.interactions.append(interaction)
+        return response
+
+    def close(self):
+        super().close()
+        with self._lock:
+            logger.debug(
+                "writing %d interactions to %s", len(self.cassette.interactions), self.path
+            )
+            self.cassette.save(self.path)
+
+
+class ReplayAdapter(BaseAdapter):
+    """Transport adapter that serves responses from a cassette file.
+
+    Requests are matched by method and URL; repeated requests to the same URL are
+    answered with the recorded responses in order, repeating the last one.
+    """
+
+    def __init__(self, path: str):
+        super().__init__()
+        self._lock = threading.Lock()
+        self._queues: typing.Dict[
+            typing.Tuple[str, str], typing.Deque[CassetteInteraction]
+        ] = collections.defaultdict(collections.deque)
+        for interaction in Cassette.load(path).interactions:
+            self._queues[(interaction.method, interaction.url)].append(interaction)
+
+    def send(self, request: requests.PreparedRequest, **kwargs: typing.Any) -> requests.Response:
+        with self._lock:
+            queue = self._queues.get((request.method, request.url))
+            if not queue:
+                raise requests.ConnectionError(
+                    f"No recorded response for {request.method} {request.url}", request=request
+                )
+            interaction = queue.popleft() if len(queue) > 1 else queue[0]
+        response = requests.Response()
+        response.status_code = interaction.status_code
+        response.reason = interaction.reason
+        response.headers = CaseInsensitiveDict(interaction.headers)
+        response._content = base64.b64decode(interaction.content)
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self):
+        pass
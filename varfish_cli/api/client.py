@@ -0,0 +1,365 @@
+"""Pooled HTTP client for accessing the VarFish Server API."""
+
+import datetime
+import email.utils
+import functools
+import gzip
+import json
+import random
+import threading
+import time
+import typing
+import urllib.parse
+
+from logzero import logger
+import pydantic
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+from varfish_cli.api.cache import ResponseCache
+from varfish_cli.api.multipart import MultipartEncoder
+from varfish_cli.api.ratelimit import RateLimiter
+from varfish_cli.common import strip_trailing_slash
+
+#: Default number of connections to keep alive per host.
+DEFAULT_POOL_MAXSIZE = 10
+
+#: HTTP methods that are idempotent and thus safe to retry.
+RETRY_METHODS = ("GET", "HEAD", "OPTIONS", "PUT", "DELETE")
+#: HTTP status codes that indicate a transient problem worth retrying.
+RETRY_STATUS_CODES = (429, 502, 503, 504)
+#: HTTP methods whose request bodies may be compressed.
+COMPRESS_METHODS = ("POST", "PUT", "PATCH")
+
+
+class HttpOptions(pydantic.BaseModel):
+    """HTTP client settings, read from the ``[http]`` section of the configuration file."""
+
+    model_config = pydantic.ConfigDict(frozen=True)
+
+    #: Maximal number of attempts for idempotent requests, including the first one.
+    retry_attempts: int = 5
+    #: Base delay in seconds for the exponential backoff between attempts.
+    retry_backoff_factor: float = 0.5
+    #: Maximal delay in seconds between attempts, also for delays given by ``Retry-After``.
+    retry_backoff_max: float = 60.0
+    #: Timeout in seconds for establishing a connection.
+    connect_timeout: float = 10.0
+    #: Timeout in seconds for waiting for data from the server.
+    read_timeout: float = 300.0
+    #: Compress JSON and form request bodies with ``"gzip"`` or ``"zstd"``; the server
+    #: must support this, so it is disabled by default.
+    compress_requests: typing.Optional[typing.Literal["gzip", "zstd"]] = None
+    #: Request bodies smaller than this number of bytes are sent uncompressed.
+    compress_min_bytes: int = 1024
+
+    @pydantic.field_validator("compress_requests")
+    @classmethod
+    def _check_zstandard(cls, value: typing.Optional[str]) -> typing.Optional[str]:
+        if value == "zstd" and zstandard is None:
+            raise ValueError("zstd compression requires the 'zstandard' package")
+        return value
+
+    def retry_delay(self, attempt: int, response: typing.Optional[requests.Response]) -> float:
+        """Return seconds to wait after the failed ``attempt`` (starting at 1).
+
+        Honours the ``Retry-After`` header of ``response`` up to ``retry_backoff_max`` and
+        uses exponential backoff with full jitter otherwise.
+        """
+        retry_after = None
+        if response is not None:
+            retry_after = _parse_retry_after(response.headers.get("Retry-After"))
+        if retry_after is not None:
+            return min(self.retry_backoff_max, retry_after)
+        backoff = min(self.retry_backoff_max, self.retry_backoff_factor * 2 ** (attempt - 1))
+        return random.uniform(0, backoff)
+
+
+def _parse_retry_after(value: typing.Optional[str]) -> typing.Optional[float]:
+    """Parse ``Retry-After`` header value given in seconds or as HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, (when - datetime.datetime.now(datetime.timezone.utc)).total_seconds())
+
+
+def _compress(data: bytes, encoding: str) -> bytes:
+    """Compress ``data`` with the given content ``encoding``."""
+    if encoding == "gzip":
+        return gzip.compress(data, compresslevel=6)
+    else:
+        return zstandard.ZstdCompressor().compress(data)
+
+
+class TransferStats:
+    """Thread-safe counters of bytes transferred by a ``VarfishClient``.
+
+    Bytes "on the wire" are counted as sent/received, i.e., after compression,
+    along with the uncompressed sizes to show the savings.
+    """
+
+    def __init__(self):
+        #: Number of requests performed, including retries.
+        self.requests = 0
+        #: Bytes of request bodies sent.
+        self.sent = 0
+        #: Bytes of request bodies before compression.
+        self.sent_uncompressed = 0
+        #: Bytes of response bodies received.
+        self.received = 0
+        #: Bytes of response bodies after decompression.
+        self.received_uncompressed = 0
+        self._lock = threading.Lock()
+
+    def record(self, response: requests.Response, sent_uncompressed: typing.Optional[int]):
+        """Record transfer of ``response`` and its request."""
+        body = response.request.body if response.request is not None else None
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        sent = len(body) if isinstance(body, (bytes, MultipartEncoder)) else 0
+        received_uncompressed = len(response.content)
+        try:
+            received = response.raw.tell()
+        except AttributeError:  # not read from the network, e.g., replayed
+            received = received_uncompressed
+        with self._lock:
+            self.requests += 1
+            self.sent += sent
+            self.sent_uncompressed += sent if sent_uncompressed is None else sent_uncompressed
+            self.received += received
+            self.received_uncompressed += received_uncompressed
+
+    def summary(self) -> str:
+        """Return human-readable summary of the transfer."""
+        return (
+            "%d requests, sent %d bytes (%d uncompressed), received %d bytes (%d uncompressed)"
+            % (
+                self.requests,
+                self.sent,
+                self.sent_uncompressed,
+                self.received,
+                self.received_uncompressed,
+            )
+        )
+
+
+class VarfishClient:
+    """HTTP client for the VarFish Server API.
+
+    Owns a ``requests.Session`` with a sized connection pool such that TCP/TLS
+    connections are kept alive between API calls and the ``Authorization`` header
+    is set up only once.  Idempotent requests that fail with a transient error are
+    retried as configured in ``http_options``.  Responses are requested compressed
+    and request bodies are compressed if enabled in ``http_options``.
+
+    A custom ``transport`` adapter replaces the pooled ``HTTPAdapter``, e.g., for
+    recording and replaying exchanges, see ``varfish_cli.api.cassette``.
+    """
+
+    def __init__(
+        self,
+        server_url: str,
+        api_token: str,
+        verify_ssl: bool = True,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        http_options: typing.Optional[HttpOptions] = None,
+        cache: typing.Optional[ResponseCache] = None,
+        rate_limiter: typing.Optional[RateLimiter] = None,
+        transport: typing.Optional[BaseAdapter] = None,
+    ):
+        #: Base URL of the VarFish server, without trailing slash.
+        self.server_url = strip_trailing_slash(server_url)
+        #: Whether to verify SSL certificates.
+        self.verify_ssl = verify_ssl
+        #: Retry and timeout settings.
+        self.http_options = http_options or HttpOptions()
+        #: Optional cache for ``cached_get``.
+        self.cache = cache
+        #: Optional limiter that each request is sent through.
+        self.rate_limiter = rate_limiter
+        #: API token, used for keying cache entries.
+        self._api_token = api_token
+        #: Number of connections kept alive per host.
+        self.pool_maxsize = pool_maxsize
+        #: Whether a custom transport adapter is used instead of the pooled ``HTTPAdapter``.
+        self._custom_transport = transport is not None
+        #: The underlying session.
+        self.session = requests.Session()
+        self._mount(transport or HTTPAdapter(pool_maxsize=pool_maxsize))
+        self.session.headers.update(
+            {"Authorization": "Token %s" % api_token, "Accept-Encoding": ACCEPT_ENCODING}
+        )
+        self.session.verify = verify_ssl
+        #: Counters of transferred bytes.
+        self.stats = TransferStats()
+
+    def _mount(self, adapter: BaseAdapter):
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def reserve_connections(self, count: int):
+        """Grow the connection pool to keep at least ``count`` connections alive per host.
+
+        This should be called before using the client from ``count`` threads at once as
+        otherwise surplus connections are discarded.
+        """
+        if self._custom_transport or count <= self.pool_maxsize:
+            return
+        self.pool_maxsize = count
+        self._mount(HTTPAdapter(pool_maxsize=count))
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Perform request with ``method`` against ``url``, retrying idempotent requests."""
+        kwargs.setdefault("verify", self.verify_ssl)
+        kwargs.setdefault(
+            "timeout", (self.http_options.connect_timeout, self.http_options.read_timeout)
+        )
+        if kwargs.get("files"):
+            self._encode_multipart(kwargs)
+        sent_uncompressed = None
+        if self.http_options.compress_requests and method in COMPRESS_METHODS:
+            sent_uncompressed = self._compress_body(kwargs)
+        max_attempts = self.http_options.retry_attempts if method in RETRY_METHODS else 1
+        attempt = 1
+        while True:
+            try:
+                if self.rate_limiter is None:
+                    response = self.session.request(method, url, **kwargs)
+                else:
+                    with self.rate_limiter.limit():
+                        response = self.session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt >= max_attempts:
+                    raise
+                response, problem = None, str(e)
+            else:
+                if not kwargs.get("stream"):
+                    self.stats.record(response, sent_uncompressed)
+                if response.status_code not in RETRY_STATUS_CODES or attempt >= max_attempts:
+                    return response
+                problem = "status code %d" % response.status_code
+            delay = self.http_options.retry_delay(attempt, response)
+            logger.warning(
+                "%s %s failed (%s), retrying in %.1fs (attempt %d of %d)",
+                method,
+                url,
+                problem,
+                delay,
+                attempt,
+                max_attempts,
+            )
+            time.sleep(delay)
+            attempt += 1
+
+    def _encode_multipart(self, kwargs: typing.Dict[str, typing.Any]):
+        """Replace ``data`` and ``files`` in the ``request()`` ``kwargs`` by a streaming body.
+
+        This keeps memory usage constant when uploading large files.
+        """
+        body = MultipartEncoder(fields=kwargs.pop("data", None), files=kwargs.pop("files"))
+        kwargs["data"] = body
+        kwargs["headers"] = {**(kwargs.get("headers") or {}), "Content-Type": body.content_type}
+
+    def _compress_body(self, kwargs: typing.Dict[str, typing.Any]) -> typing.Optional[int]:
+        """Replace JSON or form body in the ``request()`` ``kwargs`` by its compressed form.
+
+        Multipart uploads are left alone as the uploaded files are compressed already.
+
+        :returns: size of the uncompressed body or ``None`` if it was not compressed
+        """
+        if kwargs.get("json") is not None:
+            content_type = "application/json"
+            body = json.dumps(kwargs["json"]).encode("utf-8")
+        elif isinstance(kwargs.get("data"), dict):
+            content_type = "application/x-www-form-urlencoded"
+            fields = {k: v for k, v in kwargs["data"].items() if v is not None}
+            body = urllib.parse.urlencode(fields, doseq=True).encode("utf-8")
+        else:
+            return None
+        if len(body) < self.http_options.compress_min_bytes:
+            return None
+        encoding = self.http_options.compress_requests
+        kwargs.pop("json", None)
+        kwargs["data"] = _compress(body, encoding)
+        kwargs["headers"] = {
+            **(kwargs.get("headers") or {}),
+            "Content-Type": content_type,
+            "Content-Encoding": encoding,
+        }
+        return len(body)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def cached_get(
+        self, url: str, params: typing.Optional[typing.Dict[str, typing.Any]] = None, **kwargs
+    ) -> requests.Response:
+        """GET ``url`` through the response cache, if any.
+
+        Cached entries are revalidated with a conditional request and served from
+        the cache if the server answers with "304 Not Modified".
+        """
+        if self.cache is None:
+            return self.get(url, params=params, **kwargs)
+        url = requests.Request("GET", url, params=params).prepare().url
+        key = self.cache.key(url, self._api_token)
+        entry = self.cache.load(key)
+        headers = dict(kwargs.pop("headers", None) or {})
+        if entry is not None:
+            if "etag" in entry.headers:
+                headers["If-None-Match"] = entry.headers["etag"]
+            if "last-modified" in entry.headers:
+                headers["If-Modified-Since"] = entry.headers["last-modified"]
+        response = self.get(url, headers=headers, **kwargs)
+        if response.status_code == 304 and entry is not None:
+            logger.debug("using cached response for %s", url)
+            self.cache.refresh(key, entry)
+            return entry.to_response()
+        elif response.status_code == 200:
+            self.cache.store(key, response)
+        return response
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def put(self, url: str, **kwargs) -> requests.Response:
+        return self.request("PUT", url, **kwargs)
+
+    def patch(self, url: str, **kwargs) -> requests.Response:
+        return self.request("PATCH", url, **kwargs)
+
+    def delete(self, url: str, **kwargs) -> requests.Response:
+        return self.request("DELETE", url, **kwargs)
+
+    def close(self):
+        """Close the underlying session and its connection pool."""
+        self.session.close()
+
+    def __enter__(self) -> "VarfishClient":
+        return self
+
+    def __exit__(self, *args: typing.Any):
+        self.close()
+
+
+@functools.lru_cache(maxsize=None)
+def get_client(server_url: str, api_token: str, verify_ssl: bool = True) -> VarfishClient:
+    """Return process-wide shared client for the given connection settings.
+
+    This is used by the functions in ``varfish_cli.api`` when no explicit client
+    is passed such that connections are also reused in this case.
+    """
+    return VarfishClient(server_url=server_url, api_token=api_token, verify_ssl=verify_ssl)
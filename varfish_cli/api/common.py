@@ -1,9 +1,43 @@
+import functools
 from json import JSONDecodeError
+import typing
 
+import pydantic
 from simplejson import JSONDecodeError as SimpleJSONDecodeError
 
 from varfish_cli.exceptions import RestApiCallException
 
+#: Type variable for items in paginated responses.
+ItemType = typing.TypeVar("ItemType")
+
+
+class Page(pydantic.BaseModel, typing.Generic[ItemType]):
+    """One page of a paginated response."""
+
+    #: Total number of items, if reported by the server.
+    count: typing.Optional[int] = None
+    #: URL of the next page, if any.
+    next: typing.Optional[str]
+    #: URL of the previous page, if any.
+    previous: typing.Optional[str] = None
+    #: The items on this page.
+    results: typing.List[ItemType]
+
+
+@functools.lru_cache(maxsize=None)
+def type_adapter(type_: typing.Any) -> pydantic.TypeAdapter:
+    """Return the shared ``TypeAdapter`` for ``type_``.
+
+    Building an adapter constructs the validator, so adapters are only built once
+    per type.
+    """
+    return pydantic.TypeAdapter(type_)
+
+
+def validate_response(type_: typing.Any, response) -> typing.Any:
+    """Validate the body of ``response`` as ``type_`` directly from its raw bytes."""
+    return type_adapter(type_).validate_json(response.content)
+
 
 def raise_for_status(response):
     if not response.ok:
@@ -13,5 +47,5 @@ def raise_for_status(response):
                 " ".join([" ".join(v) for v in response.json().values()]),
             )
         except (JSONDecodeError, SimpleJSONDecodeError):
-            msg = "REST API returned status code %d: %s" % (response.status_code, response.content)
+            msg = "REST API returned status code %d: %s" % (response.status_code, response.text)
         raise RestApiCallException(msg)
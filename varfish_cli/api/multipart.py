@@ -0,0 +1,148 @@
+"""Streaming encoding of ``multipart/form-data`` request bodies.
+
+``requests`` builds multipart bodies in memory such that uploading a file needs
+memory proportional to its size.  ``MultipartEncoder`` provides the same body as
+a file-like object that is read by the HTTP client in blocks, reading from the
+uploaded files only as needed.
+"""
+
+import os
+import typing
+import uuid
+
+from requests.utils import super_len
+
+#: Default size of the blocks returned when iterating over the body.
+DEFAULT_BUFFER_SIZE = 64 * 1024
+
+
+def _quote(value: str) -> str:
+    """Quote parameter value in a part header as done by browsers (and ``urllib3``)."""
+    return value.replace("\n", "%0A").replace("\r", "%0D").replace('"', "%22")
+
+
+def _field_values(value: typing.Any) -> typing.List[bytes]:
+    """Return encoded values of a form field, skipping ``None`` as ``requests`` does."""
+    values = value if isinstance(value, (list, tuple)) else [value]
+    return [v if isinstance(v, bytes) else str(v).encode("utf-8") for v in values if v is not None]
+
+
+def _file_size(fileobj: typing.BinaryIO) -> int:
+    """Return number of bytes remaining in ``fileobj``."""
+    try:
+        return os.fstat(fileobj.fileno()).st_size - fileobj.tell()
+    except (AttributeError, OSError):  # not backed by a file, e.g., ``io.BytesIO``
+        return super_len(fileobj)
+
+
+class _FileSegment:
+    """A file in the body, with its size determined when encoding starts."""
+
+    def __init__(self, fileobj: typing.BinaryIO):
+        #: The file to read from.
+        self.fileobj = fileobj
+        #: Number of bytes that will be read from the file.
+        self.size = _file_size(fileobj)
+        #: Number of bytes read so far.
+        self.offset = 0
+
+    def read(self, size: int) -> bytes:
+        data = self.fileobj.read(size)
+        self.offset += len(data)
+        if self.offset > self.size or (not data and self.offset != self.size):
+            raise IOError(
+                "size of %s changed during upload (%d bytes expected, %d bytes read)"
+                % (getattr(self.fileobj, "name", "file"), self.size, self.offset)
+            )
+        return data
+
+
+class MultipartEncoder:
+    """File-like ``multipart/form-data`` body for ``requests``.
+
+    The ``fields`` and ``files`` arguments have the same meaning as the ``data``
+    and ``files`` arguments of ``requests.post()``; file values are file objects
+    or ``(filename, fileobj)`` / ``(filename, fileobj, content_type)`` tuples.
+    The total length is known in advance such that ``Content-Length`` is sent.
+
+    Files are read until their end, e.g., such that ``HashingReader`` can verify
+    their checksum.  The body can only be read once.
+    """
+
+    def __init__(
+        self,
+        fields: typing.Optional[typing.Mapping[str, typing.Any]] = None,
+        files: typing.Optional[typing.Mapping[str, typing.Any]] = None,
+        boundary: typing.Optional[str] = None,
+        buffer_size: int = DEFAULT_BUFFER_SIZE,
+    ):
+        #: The boundary between parts.
+        self.boundary = boundary or uuid.uuid4().hex
+        #: Value for the ``Content-Type`` header.
+        self.content_type = "multipart/form-data; boundary=%s" % self.boundary
+        #: Size of the blocks returned when iterating.
+        self.buffer_size = buffer_size
+        self._segments: typing.List[typing.Union[bytes, _FileSegment]] = []
+        for name, value in (fields or {}).items():
+            for data in _field_values(value):
+                self._segments.append(self._part_header(name) + data + b"\r\n")
+        for name, value in (files or {}).items():
+            if isinstance(value, (list, tuple)):
+                filename, fileobj, content_type = (list(value) + [None])[:3]
+            else:
+                filename, fileobj, content_type = getattr(value, "name", name), value, None
+            filename = str(filename).replace("\\", "/").rsplit("/", 1)[-1]
+            self._segments.append(
+                self._part_header(name, filename, content_type or "application/octet-stream")
+            )
+            self._segments.append(_FileSegment(fileobj))
+            self._segments.append(b"\r\n")
+        self._segments.append(("--%s--\r\n" % self.boundary).encode("ascii"))
+        self._length = sum(
+            segment.size if isinstance(segment, _FileSegment) else len(segment)
+            for segment in self._segments
+        )
+        self._index = 0
+
+    def _part_header(
+        self,
+        name: str,
+        filename: typing.Optional[str] = None,
+        content_type: typing.Optional[str] = None,
+    ) -> bytes:
+        lines = ["--%s" % self.boundary]
+        disposition = 'form-data; name="%s"' % _quote(name)
+        if filename is not None:
+            disposition += '; filename="%s"' % _quote(filename)
+        lines.append("Content-Disposition: %s" % disposition)
+        if content_type:
+            lines.append("Content-Type: %s" % content_type)
+        return ("\r\n".join(lines) + "\r\n\r\n").encode("utf-8")
+
+    def __len__(self) -> int:
+        return self._length
+
+    def read(self, size: typing.Optional[int] = -1) -> bytes:
+        """Read up to ``size`` bytes of the body, all remaining bytes if negative."""
+        if size is None or size < 0:
+            return b"".join(iter(lambda: self.read(self.buffer_size), b""))
+        chunks = []
+        while size > 0 and self._index < len(self._segments):
+            segment = self._segments[self._index]
+            if isinstance(segment, _FileSegment):
+                data = segment.read(size)
+                if not data:
+                    self._index += 1
+                    continue
+            else:
+                data = segment[:size]
+                if len(data) < len(segment):
+                    self._segments[self._index] = segment[size:]
+                else:
+                    self._index += 1
+            chunks.append(data)
+            size -= len(data)
+        return b"".join(chunks)
+
+    def __iter__(self) -> typing.Iterator[bytes]:
+        return iter(lambda: self.read(self.buffer_size), b"")
@@ -4,10 +4,9 @@ import typing
 import uuid
 
 from logzero import logger
-import pydantic
-import requests
 
-from varfish_cli.api.common import raise_for_status
+from varfish_cli.api.client import VarfishClient, get_client
+from varfish_cli.api.common import raise_for_status, validate_response
 from varfish_cli.api.models import Project
 from varfish_cli.common import strip_trailing_slash
 
@@ -23,15 +22,16 @@ def project_list(
     server_url: str,
     api_token: str,
     verify_ssl: bool = True,
+    client: typing.Optional[VarfishClient] = None,
 ) -> typing.List[Project]:
     """Listing of all projects that a user has access to."""
     server_url = strip_trailing_slash(server_url)
     endpoint = f"{server_url}{ENDPOINT_PROJECT_LIST}"
     logger.debug("Sending GET request to end point %s", endpoint)
-    headers = {"Authorization": "Token %s" % api_token}
-    result = requests.get(endpoint, headers=headers, verify=verify_ssl)
+    client = client or get_client(server_url, api_token, verify_ssl)
+    result = client.cached_get(endpoint)
     raise_for_status(result)
-    return pydantic.TypeAdapter(typing.List[Project]).validate_python(result.json())
+    return validate_response(typing.List[Project], result)
 
 
 def project_retrieve(
@@ -39,12 +39,13 @@ def project_retrieve(
     api_token: str,
     project_uuid: typing.Union[str, uuid.UUID],
     verify_ssl: bool = True,
+    client: typing.Optional[VarfishClient] = None,
 ) -> typing.List[Project]:
     """Listing of all projects that a user has access to."""
     server_url = strip_trailing_slash(server_url)
     endpoint = f"{server_url}{ENDPOINT_PROJECT_RETRIEVE}".format(project_uuid=project_uuid)
     logger.debug("Sending GET request to end point %s", endpoint)
-    headers = {"Authorization": "Token %s" % api_token}
-    result = requests.get(endpoint, headers=headers, verify=verify_ssl)
+    client = client or get_client(server_url, api_token, verify_ssl)
+    result = client.cached_get(endpoint)
     raise_for_status(result)
-    return pydantic.TypeAdapter(Project).validate_python(result.json())
+    return validate_response(Project, result)
@@ -0,0 +1,83 @@
+"""Client-side rate limiting of requests to the VarFish Server API.
+
+The limits are enforced per server and shared by all threads of the process such
+that parallel bulk operations do not overload the server.
+"""
+
+import contextlib
+import functools
+import threading
+import time
+import typing
+
+import pydantic
+
+
+class RateLimitOptions(pydantic.BaseModel):
+    """Rate limit settings, read from the ``[rate_limit]`` section of the configuration file."""
+
+    model_config = pydantic.ConfigDict(frozen=True)
+
+    #: Maximal sustained number of requests per second, unlimited if ``None``.
+    requests_per_second: typing.Optional[pydantic.PositiveFloat] = None
+    #: Number of requests that may be sent in a burst, defaults to one second's worth.
+    burst: typing.Optional[pydantic.PositiveInt] = None
+    #: Maximal number of concurrent requests in flight, unlimited if ``None``.
+    max_in_flight: typing.Optional[pydantic.PositiveInt] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.requests_per_second is not None or self.max_in_flight is not None
+
+
+class RateLimiter:
+    """Token bucket rate limiter combined with a limit on requests in flight.
+
+    Use ``with limiter.limit(): ...`` around each request.  The limiter is thread-safe.
+    """
+
+    def __init__(self, options: RateLimitOptions):
+        #: Tokens added to the bucket per second, ``None`` for no rate limit.
+        self.rate = options.requests_per_second
+        #: Capacity of the bucket.
+        self.burst = options.burst or max(1, int(self.rate or 1))
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self._in_flight = (
+            threading.BoundedSemaphore(options.max_in_flight) if options.max_in_flight else None
+        )
+
+    def _take_token(self):
+        """Block until a token is available and take it."""
+        if self.rate is None:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+    @contextlib.contextmanager
+    def limit(self) -> typing.Iterator[None]:
+        """Context manager that waits until a request may be sent and tracks it as in flight."""
+        self._take_token()
+        if self._in_flight is not None:
+            self._in_flight.acquire()
+        try:
+            yield
+        finally:
+            if self._in_flight is not None:
+                self._in_flight.release()
+
+
+@functools.lru_cache(maxsize=None)
+def get_rate_limiter(server_url: str, options: RateLimitOptions) -> RateLimiter:
+    """Return the process-wide rate limiter for ``server_url`` with the given ``options``."""
+    _ = server_url
+    return RateLimiter(options)
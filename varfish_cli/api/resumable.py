@@ -0,0 +1,267 @@
+"""Resumable chunked uploads using the tus protocol.
+
+Servers that support chunked uploads on a file creation end point announce this
+with a ``Tus-Resumable`` header in the response to an ``OPTIONS`` request, see
+https://tus.io/protocols/resumable-upload.  An upload is created with a ``POST``
+that carries the form fields as ``Upload-Metadata``, and the file is then sent in
+``PATCH`` requests of ``chunk_size`` bytes.  The response to the last chunk is the
+created object as for the plain multipart upload.
+
+Confirmed offsets are stored in a ``ResumeJournal`` such that an interrupted
+upload continues where it left off, also in a later run.
+"""
+
+import base64
+import os
+import sqlite3
+import threading
+import time
+import typing
+import urllib.parse
+
+from logzero import logger
+import requests
+
+from varfish_cli.api.client import RETRY_STATUS_CODES, VarfishClient
+from varfish_cli.api.common import raise_for_status
+
+#: Version of the tus protocol spoken.
+TUS_VERSION = "1.0.0"
+#: Default number of bytes sent per request.
+DEFAULT_CHUNK_SIZE = 8 * 1024 * 1024
+#: HTTP status codes upon which the upload is resumed from the offset confirmed by the server.
+RESUME_STATUS_CODES = RETRY_STATUS_CODES + (409,)
+#: File name of the resume journal database in the cache directory.
+UPLOAD_JOURNAL_FILENAME = "uploads.sqlite3"
+
+
+class ResumeJournal:
+    """Persistent, thread-safe journal of the confirmed offsets of chunked uploads.
+
+    Entries are keyed by end point, file path, and MD5 sum such that a changed file
+    is uploaded from the start.
+    """
+
+    def __init__(self, path: str):
+        #: Path to the SQLite database, ``":memory:"`` for a journal that is not persisted.
+        self.path = path if path == ":memory:" else os.path.expanduser(path)
+        self._lock = threading.Lock()
+        self._conn: typing.Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            if self.path != ":memory:":
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS uploads (endpoint TEXT, path TEXT, md5 TEXT, "
+                "upload_url TEXT, offset INTEGER, PRIMARY KEY (endpoint, path, md5))"
+            )
+        return self._conn
+
+    def get(self, endpoint: str, path: str, md5: str) -> typing.Optional[typing.Tuple[str, int]]:
+        """Return upload URL and confirmed offset of the upload, if any."""
+        with self._lock:
+            row = (
+                self._connect()
+                .execute(
+                    "SELECT upload_url, offset FROM uploads "
+                    "WHERE endpoint = ? AND path = ? AND md5 = ?",
+                    (endpoint, path, md5),
+                )
+                .fetchone()
+            )
+        return (row[0], row[1]) if row else None
+
+    def put(self, endpoint: str, path: str, md5: str, upload_url: str, offset: int):
+        """Record the confirmed ``offset`` of the upload."""
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO uploads (endpoint, path, md5, upload_url, offset) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (endpoint, path, md5, upload_url, offset),
+                )
+
+    def remove(self, endpoint: str, path: str, md5: str):
+        """Remove the upload, e.g., after it has been completed."""
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute(
+                    "DELETE FROM uploads WHERE endpoint = ? AND path = ? AND md5 = ?",
+                    (endpoint, path, md5),
+                )
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+def supports_chunked_upload(client: VarfishClient, endpoint: str) -> bool:
+    """Return whether the server accepts chunked uploads at ``endpoint``."""
+    try:
+        response = client.request("OPTIONS", endpoint, headers={"Tus-Resumable": TUS_VERSION})
+    except (requests.ConnectionError, requests.Timeout):
+        return False
+    return response.ok and "Tus-Resumable" in response.headers
+
+
+def _encode_metadata(fields: typing.Dict[str, typing.Any]) -> str:
+    return ",".join(
+        "%s %s" % (key, base64.b64encode(str(value).encode("utf-8")).decode("ascii"))
+        for key, value in fields.items()
+        if value is not None
+    )
+
+
+def _create_upload(
+    client: VarfishClient, endpoint: str, fields: typing.Dict[str, typing.Any], size: int
+) -> str:
+    """Create upload and return its URL."""
+    response = client.post(
+        endpoint,
+        headers={
+            "Tus-Resumable": TUS_VERSION,
+            "Upload-Length": str(size),
+            "Upload-Metadata": _encode_metadata(fields),
+        },
+    )
+    response.raise_for_status()
+    return urllib.parse.urljoin(endpoint, response.headers["Location"])
+
+
+def _upload_offset(client: VarfishClient, upload_url: str) -> typing.Optional[int]:
+    """Return offset confirmed by the server or ``None`` if the upload is gone."""
+    response = client.request("HEAD", upload_url, headers={"Tus-Resumable": TUS_VERSION})
+    if response.status_code in (404, 410):
+        return None
+    response.raise_for_status()
+    return int(response.headers["Upload-Offset"])
+
+
+def chunked_upload(
+    client: VarfishClient,
+    endpoint: str,
+    fields: typing.Dict[str, typing.Any],
+    fileobj: typing.BinaryIO,
+    journal: ResumeJournal,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    callback: typing.Optional[typing.Callable[[int], None]] = None,
+) -> requests.Response:
+    """Upload ``fileobj`` with form ``fields`` in chunks, resuming a previous upload.
+
+    Chunks that fail with a connection error, a timeout, or one of ``RESUME_STATUS_CODES``
+    are retried from the offset confirmed by the server as configured in the
+    ``http_options`` of ``client``.  ``fileobj`` must support ``seek()``.  ``callback``
+    is called with the number of bytes newly confirmed by the server, such that re-sent
+    chunks are counted once.
+
+    :returns: the response to the last chunk
+    :raises RestApiCallException: on other HTTP errors or when running out of attempts
+    """
+    path = os.path.realpath(fileobj.name)
+    md5 = fields.get("md5") or ""
+    size = os.fstat(fileobj.fileno()).st_size
+    upload_url, offset = journal.get(endpoint, path, md5) or (None, 0)
+    # whether to ask the server for the offset of the upload before sending chunks
+    resync = upload_url is not None
+    confirmed = 0
+
+    def confirm(new_offset: int):
+        nonlocal confirmed
+        if callback is not None and new_offset > confirmed:
+            callback(new_offset - confirmed)
+        confirmed = max(confirmed, new_offset)
+
+    max_attempts = client.http_options.retry_attempts
+    attempt = 1
+    while True:
+        try:
+            if resync:
+                offset = _upload_offset(client, upload_url)
+                resync = False
+                if offset is not None and attempt == 1:
+                    logger.info("- resuming upload of %s at byte %d of %d", path, offset, size)
+            if upload_url is None or offset is None:
+                upload_url, offset = _create_upload(client, endpoint, fields, size), 0
+                journal.put(endpoint, path, md5, upload_url, offset)
+            confirm(offset)
+            response = _send_chunks(
+                client,
+                upload_url,
+                fileobj,
+                offset,
+                size,
+                chunk_size,
+                journal,
+                (endpoint, path, md5),
+                confirm,
+            )
+            break
+        except (requests.ConnectionError, requests.Timeout, requests.HTTPError) as e:
+            response = getattr(e, "response", None)
+            resumable = response is None or response.status_code in RESUME_STATUS_CODES
+            if not resumable or attempt >= max_attempts:
+                if response is not None:
+                    raise_for_status(response)
+                raise
+            delay = client.http_options.retry_delay(attempt, response)
+            logger.warning(
+                "upload of %s failed (%s), resuming in %.1fs (attempt %d of %d)",
+                path,
+                e,
+                delay,
+                attempt,
+                max_attempts,
+            )
+            time.sleep(delay)
+            attempt += 1
+            resync = upload_url is not None
+    journal.remove(endpoint, path, md5)
+    return response
+
+
+def _send_chunks(
+    client: VarfishClient,
+    upload_url: str,
+    fileobj: typing.BinaryIO,
+    offset: int,
+    size: int,
+    chunk_size: int,
+    journal: ResumeJournal,
+    key: typing.Tuple[str, str, str],
+    confirm: typing.Callable[[int], None],
+) -> requests.Response:
+    """Send the file from ``offset`` on and return the response to the last chunk.
+
+    ``confirm`` is called with each offset confirmed by the server.
+    """
+    fileobj.seek(offset)
+    while True:
+        chunk = fileobj.read(min(chunk_size, size - offset))
+        at_end = offset + len(chunk) >= size
+        if (not chunk and not at_end) or (at_end and fileobj.read(1)):
+            raise IOError("size of %s changed during upload" % fileobj.name)
+        response = client.request(
+            "PATCH",
+            upload_url,
+            data=chunk,
+            headers={
+                "Tus-Resumable": TUS_VERSION,
+                "Upload-Offset": str(offset),
+                "Content-Type": "application/offset+octet-stream",
+            },
+        )
+        if response.status_code in RESUME_STATUS_CODES:
+            response.raise_for_status()
+        elif not response.ok:
+            return response
+        offset = int(response.headers["Upload-Offset"])
+        journal.put(*key, upload_url, offset)
+        confirm(offset)
+        if offset >= size:
+            return response
@@ -5,10 +5,9 @@ import typing
 import uuid
 
 from logzero import logger
-import pydantic
-import requests
 
-from varfish_cli.api.common import raise_for_status
+from varfish_cli.api.client import VarfishClient, get_client
+from varfish_cli.api.common import raise_for_status, validate_response
 from varfish_cli.api.models import VarAnnoSetEntryV1, VarAnnoSetV1
 from varfish_cli.common import strip_trailing_slash
 
@@ -31,6 +30,7 @@ def varannoset_list(
     api_token: str,
     project_uuid: typing.Union[str, uuid.UUID],
     verify_ssl: bool = True,
+    client: typing.Optional[VarfishClient] = None,
 ) -> typing.List[VarAnnoSetV1]:
     """Listing of varannosets from a project UUID."""
     server_url = strip_trailing_slash(server_url)
@@ -39,10 +39,10 @@ def varannoset_list(
         ENDPOINT_VARANNOSET_LISTCREATE.format(project_uuid=project_uuid),
     )
     logger.debug("Sending GET request to end point %s", endpoint)
-    headers = {"Authorization": "Token %s" % api_token}
-    result = requests.get(endpoint, headers=headers, verify=verify_ssl)
+    client = client or get_client(server_url, api_token, verify_ssl)
+    result = client.cached_get(endpoint)
     raise_for_status(result)
-    return pydantic.TypeAdapter(typing.List[VarAnnoSetV1]).validate_python(result.json())
+    return validate_response(typing.List[VarAnnoSetV1], result)
 
 
 def varannoset_create(
@@ -51,6 +51,7 @@ def varannoset_create(
     project_uuid: typing.Union[str, uuid.UUID],
     payload: VarAnnoSetV1,
     verify_ssl: bool = True,
+    client: typing.Optional[VarfishClient] = None,
 ) -> VarAnnoSetV1:
     """Creating of of varannosets inside a project."""
     server_url = strip_trailing_slash(server_url)
@@ -59,13 +60,11 @@ def varannoset_create(
         ENDPOINT_VARANNOSET_LISTCREATE.format(project_uuid=project_uuid),
     )
     logger.debug("Sending POST request to end point %s", endpoint)
-    headers = {"Authorization": "Token %s" % api_token}
-    result = requests.post(
-        endpoint, headers=headers, data=payload.model_dump(mode="json"), verify=verify_ssl
-    )
+    client = client or get_client(server_url, api_token, verify_ssl)
+    result = client.post(endpoint, data=payload.model_dump(mode="json"))
     raise_for_status(result)
     print(result.json())
-    return pydantic.TypeAdapter(VarAnnoSetV1).validate_python(result.json())
+    return validate_response(VarAnnoSetV1, result)
 
 
 def varannoset_retrieve(
@@ -73,6 +72,7 @@ def varannoset_retrieve(
     api_token: str,
     varannoset_uuid: typing.Union[str, uuid.UUID],
     verify_ssl: bool = True,
+    client: typing.Optional[VarfishClient] = None,
 ) -> VarAnnoSetV1:
     """Retrieve varannoset from its UUID."""
     server_url = strip_trailing_slash(server_url)
@@ -81,10 +81,10 @@ def varannoset_retrieve(
         ENDPOINT_VARANNOSET_RETRIEVEUPDATEDESTROY.format(varannoset_uuid=varannoset_uuid),
     )
     logger.debug("Sending GET request to end point %s", endpoint)
-    headers = {"Authorization": "Token %s" % api_token}
-    result = requests.get(endpoint, headers=headers, verify=verify_ssl)
+    client = client or get_client(server_url, api_token, verify_ssl)
+    result = client.get(endpoint)
     raise_for_status(result)
-    return pydantic.TypeAdapter(VarAnnoSetV1).validate_python(result.json())
+    return validate_response(VarAnnoSetV1, result)
 
 
 def varannoset_update(
@@ -93,6 +93,7 @@ def varannoset_update(
     varannoset_uuid: typing.Union[str, uuid.UUID],
     payload: VarAnnoSetV1,
     verify_ssl: bool = True,
+    client: typing.Optional[VarfishClient] = None,
 ) -> VarAnnoSetV1:
     """Update single varannoset at its UUID."""
     server_url = strip_trailing_slash(server_url)
@@ -101,12 +102,10 @@ def varannoset_update(
         ENDPOINT_VARANNOSET_RETRIEVEUPDATEDESTROY.format(varannoset_uuid=varannoset_uuid),
     )
     logger.debug("Sending PATCH request to end point %s", endpoint)
-    headers = {"Authorization": "Token %s" % api_token}
-    result = requests.patch(
-        endpoint, headers=headers, data=payload.model_dump(mode="json"), verify=verify_ssl
-    )
+    client = client or get_client(server_url, api_token, verify_ssl)
+    result = client.patch(endpoint, data=payload.model_dump(mode="json"))
     raise_for_status(result)
-    return pydantic.TypeAdapter(VarAnnoSetV1).validate_python(result.json())
+    return validate_response(VarAnnoSetV1, result)
 
 
 def varannoset_destroy(
@@ -114,6 +113,7 @@ def varannoset_destroy(
     api_token: str,
     varannoset_uuid: typing.Union[str, uuid.UUID],
     verify_ssl: bool = True,
+    client: typing.Optional[VarfishClient] = None,
 ) -> None:
     """Delete varannoset at its UUID."""
     server_url = strip_trailing_slash(server_url)
@@ -122,8 +122,8 @@ def varannoset_destroy(
         ENDPOINT_VARANNOSET_RETRIEVEUPDATEDESTROY.format(varannoset_uuid=varannoset_uuid),
     )
     logger.debug("Sending DELETE request to end point %s", endpoint)
-    headers = {"Authorization": "Token %s" % api_token}
-    result = requests.delete(endpoint, headers=headers, verify=verify_ssl)
+    client = client or get_client(server_url, api_token, verify_ssl)
+    result = client.delete(endpoint)
     raise_for_status(result)
 
 
@@ -132,6 +132,7 @@ def varannosetentry_list(
     api_token: str,
     varannoset_uuid: typing.Union[str, uuid.UUID],
     verify_ssl: bool = True,
+    client: typing.Optional[VarfishClient] = None,
 ) -> typing.List[VarAnnoSetEntryV1]:
     """Listing of varannosetentries from a project UUID."""
     server_url = strip_trailing_slash(server_url)
@@ -140,10 +141,10 @@ def varannosetentry_list(
         ENDPOINT_VARANNOSETENTRY_LISTCREATE.format(varannoset_uuid=varannoset_uuid),
     )
     logger.debug("Sending GET request to end point %s", endpoint)
-    headers = {"Authorization": "Token %s" % api_token}
-    result = requests.get(endpoint, headers=headers, verify=verify_ssl)
+    client = client or get_client(server_url, api_token, verify_ssl)
+    result = client.get(endpoint)
     raise_for_status(result)
-    return pydantic.TypeAdapter(typing.List[VarAnnoSetEntryV1]).validate_python(result.json())
+    return validate_response(typing.List[VarAnnoSetEntryV1], result)
 
 
 def varannosetentry_create(
@@ -152,6 +153,7 @@ def varannosetentry_create(
     varannoset_uuid: typing.Union[str, uuid.UUID],
     payload: VarAnnoSetEntryV1,
     verify_ssl: bool = True,
+    client: typing.Optional[VarfishClient] = None,
 ) -> VarAnnoSetEntryV1:
     """Creating of of varannosetentries inside a project."""
     server_url = strip_trailing_slash(server_url)
@@ -160,12 +162,10 @@ def varannosetentry_create(
         ENDPOINT_VARANNOSETENTRY_LISTCREATE.format(varannoset_uuid=varannoset_uuid),
     )
     logger.debug("Sending POST request to end point %s", endpoint)
-    headers = {"Authorization": "Token %s" % api_token}
-    result = requests.post(
-        endpoint, headers=headers, data=payload.model_dump(mode="json"), verify=verify_ssl
-    )
+    client = client or get_client(server_url, api_token, verify_ssl)
+    result = client.post(endpoint, data=payload.model_dump(mode="json"))
     raise_for_status(result)
-    return pydantic.TypeAdapter(VarAnnoSetEntryV1).validate_python(result.json())
+    return validate_response(VarAnnoSetEntryV1, result)
 
 
 def varannosetentry_retrieve(
@@ -173,6 +173,7 @@ def varannosetentry_retrieve(
     api_token: str,
     varannosetentry_uuid: typing.Union[str, uuid.UUID],
     verify_ssl: bool = True,
+    client: typing.Optional[VarfishClient] = None,
 ) -> VarAnnoSetEntryV1:
     """Retrieve varannosetentry from its UUID."""
     server_url = strip_trailing_slash(server_url)
@@ -183,10 +184,10 @@ def varannosetentry_retrieve(
         ),
     )
     logger.debug("Sending GET request to end point %s", endpoint)
-    headers = {"Authorization": "Token %s" % api_token}
-    result = requests.get(endpoint, headers=headers, verify=verify_ssl)
+    client = client or get_client(server_url, api_token, verify_ssl)
+    result = client.get(endpoint)
     raise_for_status(result)
-    return pydantic.TypeAdapter(VarAnnoSetEntryV1).validate_python(result.json())
+    return validate_response(VarAnnoSetEntryV1, result)
 
 
 def varannosetentry_update(
@@ -195,6 +196,7 @@ def varannosetentry_update(
     varannosetentry_uuid: typing.Union[str, uuid.UUID],
     payload: VarAnnoSetEntryV1,
     verify_ssl: bool = True,
+    client: typing.Optional[VarfishClient] = None,
 ) -> VarAnnoSetEntryV1:
     """Update single varannosetentry at its UUID."""
     server_url = strip_trailing_slash(server_url)
@@ -205,12 +207,10 @@ def varannosetentry_update(
         ),
     )
     logger.debug("Sending PATCH request to end point %s", endpoint)
-    headers = {"Authorization": "Token %s" % api_token}
-    result = requests.patch(
-        endpoint, headers=headers, data=payload.model_dump(mode="json"), verify=verify_ssl
-    )
+    client = client or get_client(server_url, api_token, verify_ssl)
+    result = client.patch(endpoint, data=payload.model_dump(mode="json"))
     raise_for_status(result)
-    return pydantic.TypeAdapter(VarAnnoSetEntryV1).validate_python(result.json())
+    return validate_response(VarAnnoSetEntryV1, result)
 
 
 def varannosetentry_destroy(
@@ -218,6 +218,7 @@ def varannosetentry_destroy(
     api_token: str,
     varannosetentry_uuid: typing.Union[str, uuid.UUID],
     verify_ssl: bool = True,
+    client: typing.Optional[VarfishClient] = None,
 ) -> None:
     """Delete varannosetentry at its UUID."""
     server_url = strip_trailing_slash(server_url)
@@ -228,6 +229,6 @@ def varannosetentry_destroy(
         ),
     )
     logger.debug("Sending DELETE request to end point %s", endpoint)
-    headers = {"Authorization": "Token %s" % api_token}
-    result = requests.delete(endpoint, headers=headers, verify=verify_ssl)
+    client = client or get_client(server_url, api_token, verify_ssl)
+    result = client.delete(endpoint)
     raise_for_status(result)
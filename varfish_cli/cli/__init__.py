@@ -8,7 +8,13 @@ import typer
 
 from varfish_cli import __version__
 from varfish_cli.cli import cases, importer, projects, tools, varannos
-from varfish_cli.config import CommonOptions, load_config
+from varfish_cli.config import (
+    CommonOptions,
+    load_cache_options,
+    load_config,
+    load_http_options,
+    load_rate_limit_options,
+)
 from varfish_cli.exceptions import InvalidConfiguration
 
 #: Paths to search the global configuration in.
@@ -22,6 +28,10 @@ def version_callback(value: bool):
         raise typer.Exit()
 
 
+#: Sub command groups that check for server URL and API token themselves as some of their
+#: commands work offline.
+OFFLINE_CAPABLE_GROUPS = ("importer",)
+
 #: Main CLI ``Typer`` object.
 app = typer.Typer(no_args_is_help=True, pretty_exceptions_enable=False)
 
@@ -51,6 +61,19 @@ def main(
     verify_ssl: typing.Annotated[
         bool, typer.Option("--verify-ssl/--no-verify-ssl", help="Disable SSL verification")
     ] = True,
+    no_cache: typing.Annotated[
+        bool, typer.Option("--no-cache", help="Bypass the on-disk response cache")
+    ] = False,
+    record_cassette: typing.Annotated[
+        typing.Optional[str],
+        typer.Option("--record-cassette", help="Record API exchanges to this cassette file"),
+    ] = None,
+    replay_cassette: typing.Annotated[
+        typing.Optional[str],
+        typer.Option(
+            "--replay-cassette", help="Replay API exchanges from this cassette file (offline)"
+        ),
+    ] = None,
     config_path: typing.Annotated[
         str,
         typer.Option("--config-path", help="Path to configuration file", envvar="VARFISH_RC_PATH"),
@@ -104,7 +127,12 @@ def main(
         varfish_api_token = toml_varfish_api_token
 
     if not varfish_server_url or not varfish_api_token:
-        raise InvalidConfiguration("Need to specify server URL and API token")
+        if ctx.invoked_subcommand not in OFFLINE_CAPABLE_GROUPS:
+            raise InvalidConfiguration("Need to specify server URL and API token")
+
+    cache_options = load_cache_options(config_path)
+    if no_cache:
+        cache_options = cache_options.model_copy(update={"enabled": False})
 
     # Construct common options
     ctx.obj = CommonOptions(
@@ -113,7 +141,13 @@ def main(
         config_path=config_path,
         varfish_server_url=varfish_server_url,
         varfish_api_token=varfish_api_token,
+        http_options=load_http_options(config_path),
+        cache_options=cache_options,
+        rate_limit_options=load_rate_limit_options(config_path, varfish_server_url or ""),
+        record_cassette=record_cassette,
+        replay_cassette=replay_cassette,
     )
+    ctx.call_on_close(ctx.obj.close)
 
 
 #: Define ``typer`` object that can be called from ``__main__.py``.
@@ -45,7 +45,7 @@ def cli_case_list(
     list_objects = ListObjects(api.Case)
     return list_objects.run(
         common_options=common_options,
-        callable=api.case_list,
+        callable=api.case_list_iter,
         output_file=output_file,
         output_format=output_format,
         output_delimiter=output_delimiter,
@@ -49,6 +49,7 @@ class ListObjects(typing.Generic[ModelType]):
                 server_url=common_options.varfish_server_url,
                 api_token=common_options.varfish_api_token.get_secret_value(),
                 verify_ssl=common_options.verify_ssl,
+                client=common_options.client,
                 **kwargs,
             )
 
@@ -105,6 +106,7 @@ class RetrieveObject(typing.Generic[ModelType]):
                 server_url=common_options.varfish_server_url,
                 api_token=common_options.varfish_api_token.get_secret_value(),
                 verify_ssl=common_options.verify_ssl,
+                client=common_options.client,
                 **kwargs,
             )
             res_json = res.model_dump(mode="json")
@@ -148,6 +150,7 @@ class CreateObject(typing.Generic[ModelType]):
                 server_url=common_options.varfish_server_url,
                 api_token=common_options.varfish_api_token.get_secret_value(),
                 verify_ssl=common_options.verify_ssl,
+                client=common_options.client,
                 payload=payload,
                 **kwargs,
             )
@@ -192,6 +195,7 @@ class UpdateObject(typing.Generic[ModelType]):
                 server_url=common_options.varfish_server_url,
                 api_token=common_options.varfish_api_token.get_secret_value(),
                 verify_ssl=common_options.verify_ssl,
+                client=common_options.client,
                 payload=payload,
                 **kwargs,
             )
@@ -234,6 +238,7 @@ class DeleteObject(typing.Generic[ModelType]):
                 server_url=common_options.varfish_server_url,
                 api_token=common_options.varfish_api_token.get_secret_value(),
                 verify_ssl=common_options.verify_ssl,
+                client=common_options.client,
                 **kwargs,
             )
             logger.info("All done. Have a nice day!")
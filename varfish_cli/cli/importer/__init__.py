@@ -1,5 +1,6 @@
 """Implementation of varfish-cli subcommand "importer *"."""
 
+import concurrent.futures
 import sys
 import typing
 import uuid
@@ -9,12 +10,43 @@ import typer
 
 from varfish_cli import api
 from varfish_cli.api import GenomeBuild
-from varfish_cli.cli.importer.create import CaseImporter, CaseImportOptions
+from varfish_cli.cli.importer.batch import (
+    DEFAULT_PARALLEL_CASES,
+    BatchCaseImporter,
+    format_results,
+    load_manifest,
+)
+from varfish_cli.cli.importer.create import (
+    DEFAULT_UPLOAD_JOBS,
+    CaseImporter,
+    CaseImportOptions,
+    FileType,
+    FileTypeGuesser,
+    probe_paths,
+)
+from varfish_cli.cli.importer.validate import (
+    format_results as format_validation_results,
+)
+from varfish_cli.cli.importer.validate import FileValidator
 from varfish_cli.config import CommonOptions
+from varfish_cli.exceptions import InvalidConfiguration
 
 #: The ``Typer`` instance to use for the ``importer`` sub command.
 app = typer.Typer(no_args_is_help=True)
 
+#: Commands that work offline and thus need no server URL and API token.
+OFFLINE_COMMANDS = ("validate",)
+
+
+@app.callback()
+def callback(ctx: typer.Context):
+    """Check that server URL and API token are given unless the command works offline."""
+    common_options: CommonOptions = ctx.obj
+    if ctx.invoked_subcommand not in OFFLINE_COMMANDS and (
+        not common_options.varfish_server_url or not common_options.varfish_api_token
+    ):
+        raise InvalidConfiguration("Need to specify server URL and API token")
+
 
 @app.command("caseimportinfo-list")
 def run(
@@ -44,6 +76,7 @@ def run(
         project_uuid=project_uuid,
         owner=owner,
         verify_ssl=common_options.verify_ssl,
+        client=common_options.client,
     )
 
     def do_print(file: typing.TextIO):
@@ -102,7 +135,8 @@ def cli_caseimportinfo_create(
         typing.List[str],
         typer.Argument(
             ...,
-            help="Path(s) to files to use for the import. Must include PED, and annotation TSV files",
+            help="Path(s) to files, directories, or glob patterns to use for the import. "
+            "Must include PED, and annotation TSV files",
         ),
     ] = None,
     strip_family_regex: typing.Annotated[
@@ -141,6 +175,31 @@ def cli_caseimportinfo_create(
             "defaults to the first affected member of the pedigree file.",
         ),
     ] = None,
+    jobs: typing.Annotated[
+        int,
+        typer.Option("--jobs", "-j", min=1, help="Number of files to upload in parallel"),
+    ] = DEFAULT_UPLOAD_JOBS,
+    resumable: typing.Annotated[
+        bool,
+        typer.Option(
+            "--resumable/--no-resumable",
+            help="Upload files in resumable chunks if the server supports it",
+        ),
+    ] = False,
+    validate_files: typing.Annotated[
+        bool,
+        typer.Option(
+            "--validate/--no-validate",
+            help="Validate all rows of the genotype files before uploading",
+        ),
+    ] = False,
+    plan: typing.Annotated[
+        bool,
+        typer.Option(
+            "--plan",
+            help="Only print the changes that the import would make on the server",
+        ),
+    ] = False,
 ):
     logger.info("Creating CaseImportInfo object...")
     common_options: CommonOptions = ctx.obj
@@ -154,8 +213,170 @@ def cli_caseimportinfo_create(
             resubmit=resubmit,
             project_uuid=project_uuid,
             index=index,
+            jobs=jobs,
+            resumable=resumable,
+            validate_files=validate_files,
+        ),
+        common_options=common_options,
+    )
+    if plan:
+        import_plan = case_importer.plan()
+        if import_plan is None:
+            raise typer.Exit(1)
+        print(import_plan.format())
+    else:
+        result = case_importer.run()
+        if result:
+            raise typer.Exit(result)
+    logger.info("All done. Have a nice day!")
+
+
+@app.command("caseimportinfo-create-batch")
+def cli_caseimportinfo_create_batch(
+    ctx: typer.Context,
+    project_uuid: typing.Annotated[
+        uuid.UUID, typer.Argument(..., help="UUID of project to import the cases into")
+    ],
+    manifest: typing.Annotated[
+        str,
+        typer.Argument(
+            ...,
+            help="Path to TSV or JSON manifest with the paths of the files of each case",
+        ),
+    ],
+    strip_family_regex: typing.Annotated[
+        str,
+        typer.Option("--strip-family-regex", help="Regular expression to process family name with"),
+    ] = "^FAM_",
+    case_name_suffix: typing.Annotated[
+        str, typer.Option("--case-name-suffix", help="Suffix to append to case name")
+    ] = "",
+    force_fresh: typing.Annotated[
+        bool,
+        typer.Option(
+            "--force-fresh/--no-force-fresh",
+            help="Force using fresh case import even if old draft found",
+        ),
+    ] = False,
+    resubmit: typing.Annotated[
+        bool,
+        typer.Option(
+            "--resubmit/--no-resubmit",
+            help="Force resubmission of cases in submit state",
+        ),
+    ] = False,
+    genomebuild: typing.Annotated[
+        GenomeBuild,
+        typer.Option(
+            "--genomebuild",
+            help="The genome build (GRCh37/GRCh38) of the cases, defaults to GRCh37.",
+        ),
+    ] = GenomeBuild.GRCH37.value,
+    jobs: typing.Annotated[
+        int,
+        typer.Option("--jobs", "-j", min=1, help="Number of files to upload in parallel"),
+    ] = DEFAULT_UPLOAD_JOBS,
+    parallel_cases: typing.Annotated[
+        int,
+        typer.Option("--parallel-cases", min=1, help="Number of cases to import in parallel"),
+    ] = DEFAULT_PARALLEL_CASES,
+    resumable: typing.Annotated[
+        bool,
+        typer.Option(
+            "--resumable/--no-resumable",
+            help="Upload files in resumable chunks if the server supports it",
+        ),
+    ] = False,
+    validate_files: typing.Annotated[
+        bool,
+        typer.Option(
+            "--validate/--no-validate",
+            help="Validate all rows of the genotype files before uploading",
+        ),
+    ] = False,
+):
+    """Create case import infos for all cases of a manifest."""
+    common_options: CommonOptions = ctx.obj
+    entries = load_manifest(manifest)
+    logger.info("Importing %d cases from %s ...", len(entries), manifest)
+    batch_importer = BatchCaseImporter(
+        entries=entries,
+        options=CaseImportOptions(
+            paths=[],
+            genomebuild=genomebuild,
+            strip_family_regex=strip_family_regex,
+            case_name_suffix=case_name_suffix,
+            force_fresh=force_fresh,
+            resubmit=resubmit,
+            project_uuid=project_uuid,
+            index=None,
+            jobs=jobs,
+            resumable=resumable,
+            validate_files=validate_files,
         ),
         common_options=common_options,
+        parallel_cases=parallel_cases,
+    )
+    results = batch_importer.run()
+    print(format_results(results))
+    failed = [result.name for result in results if not result.ok]
+    if failed:
+        logger.error("Import failed for %d of %d cases", len(failed), len(results))
+        raise typer.Exit(1)
+    logger.info("All done. Have a nice day!")
+
+
+@app.command("validate")
+def cli_validate(
+    ctx: typer.Context,
+    paths: typing.Annotated[
+        typing.List[str],
+        typer.Argument(
+            ...,
+            help="Path(s) to genotype TSV files, directories, or glob patterns to validate, "
+            "optionally with a PED file to check the samples against",
+        ),
+    ],
+    genomebuild: typing.Annotated[
+        GenomeBuild,
+        typer.Option(
+            "--genomebuild",
+            help="The genome build (GRCh37/GRCh38) of the files, defaults to GRCh37.",
+        ),
+    ] = GenomeBuild.GRCH37.value,
+    jobs: typing.Annotated[
+        typing.Optional[int],
+        typer.Option(
+            "--jobs", "-j", min=1, help="Number of processes to use, defaults to number of CPUs"
+        ),
+    ] = None,
+):
+    """Validate all rows of genotype TSV files before their import.
+
+    With PED files of several families, each genotype file is checked against the PED
+    file that shares the most samples with it.
+    """
+    paths_ped = []
+    paths_genotype = []
+    guesser = FileTypeGuesser()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=jobs) as executor:
+        probes, _ = probe_paths(paths, executor)
+    for path, probe in probes.items():
+        guessed = guesser.guess_probe(probe)
+        if guessed == FileType.PED:
+            paths_ped.append(path)
+        elif guessed in (FileType.GTS, FileType.GTS_SV):
+            paths_genotype.append(path)
+    logger.info(
+        "Validating %d genotype files against %d PED files ...",
+        len(paths_genotype),
+        len(paths_ped),
+    )
+    validator = FileValidator(
+        paths=paths_genotype, genomebuild=genomebuild, paths_ped=paths_ped, jobs=jobs
     )
-    case_importer.run()
+    results = validator.run()
+    print(format_validation_results(results, validator.rows_per_second))
+    if not all(result.ok for result in results):
+        raise typer.Exit(1)
     logger.info("All done. Have a nice day!")
@@ -0,0 +1,247 @@
+"""Import of many cases from a manifest in one process.
+
+The manifest is a JSON list of objects or a TSV file with header, each entry
+describing one case with the keys/columns
+
+``paths``
+    paths of the files to import, comma-separated in TSV files; relative paths are
+    interpreted relative to the manifest
+``name`` (optional)
+    label of the case in the summary, defaults to the name of the PED file
+``index`` (optional)
+    name of the index in the pedigree
+"""
+
+import concurrent.futures
+import contextlib
+import csv
+import json
+import os
+import time
+import typing
+
+from logzero import logger
+import pydantic
+from tabulate import tabulate
+import tqdm
+
+from varfish_cli import api
+from varfish_cli.api.case import PAGINATION_MAX_WORKERS
+from varfish_cli.cli.importer.create import CaseImporter, CaseImportOptions
+from varfish_cli.config import CommonOptions
+from varfish_cli.exceptions import (
+    InconsistentGenomeBuild,
+    InconsistentSamplesDataException,
+    Md5Mismatch,
+    MissingFileOnImport,
+    RestApiCallException,
+)
+from varfish_cli.hashing import MD5_CACHE_FILENAME, Md5Cache
+
+#: Default number of cases to import in parallel.
+DEFAULT_PARALLEL_CASES = 1
+
+#: Exceptions that make the import of one case fail but not the whole batch.  The exceptions
+#: of ``varfish_cli.exceptions`` derive from ``BaseException`` and are not caught by
+#: ``Exception``, so they are listed explicitly.
+CASE_IMPORT_ERRORS = (
+    Exception,
+    MissingFileOnImport,
+    RestApiCallException,
+    InconsistentSamplesDataException,
+    InconsistentGenomeBuild,
+    Md5Mismatch,
+)
+
+
+class BatchImportEntry(pydantic.BaseModel):
+    """One case of a batch import manifest."""
+
+    #: Paths to the files to import.
+    paths: typing.List[str]
+    #: Label of the case in the summary, defaults to the PED file name.
+    name: typing.Optional[str] = None
+    #: Name of the index in the pedigree.
+    index: typing.Optional[str] = None
+
+    @pydantic.field_validator("paths", mode="before")
+    @classmethod
+    def _split_paths(cls, value: typing.Any) -> typing.Any:
+        if isinstance(value, str):
+            return [path.strip() for path in value.split(",") if path.strip()]
+        return value
+
+    @property
+    def label(self) -> str:
+        if self.name:
+            return self.name
+        path = next((p for p in self.paths if p.endswith(".ped")), None)
+        return os.path.basename(path or (self.paths[0] if self.paths else "<empty>"))
+
+
+class BatchImportResult(pydantic.BaseModel):
+    """Outcome of importing one case of a batch."""
+
+    #: Label of the case.
+    name: str
+    #: Whether the import succeeded.
+    ok: bool
+    #: Wall-clock time of the import in seconds.
+    seconds: float
+    #: Number of bytes uploaded.
+    bytes_sent: int = 0
+    #: Number of bytes not uploaded as files with the same md5 sums existed.
+    bytes_skipped: int = 0
+    #: Error message if the import failed.
+    message: str = ""
+
+
+def load_manifest(path: str) -> typing.List[BatchImportEntry]:
+    """Load batch import manifest from JSON or TSV file at ``path``."""
+    with open(path, "rt") as inputf:
+        if path.endswith(".json"):
+            records = json.load(inputf)
+        else:
+            records = [
+                {key: value for key, value in record.items() if value}
+                for record in csv.DictReader(inputf, delimiter="\t")
+            ]
+    entries = pydantic.TypeAdapter(typing.List[BatchImportEntry]).validate_python(records)
+    base_dir = os.path.dirname(os.path.abspath(path))
+    return [
+        entry.model_copy(
+            update={"paths": [os.path.join(base_dir, os.path.expanduser(p)) for p in entry.paths]}
+        )
+        for entry in entries
+    ]
+
+
+class BatchCaseImporter:
+    """Import of the cases of a manifest with shared client, upload pool, and MD5 cache.
+
+    The case import infos of the project are listed once for all cases.  A failing
+    case is reported in the results and does not stop the import of the others.
+    """
+
+    def __init__(
+        self,
+        entries: typing.List[BatchImportEntry],
+        options: CaseImportOptions,
+        common_options: CommonOptions,
+        parallel_cases: int = DEFAULT_PARALLEL_CASES,
+    ):
+        #: The cases to import.
+        self.entries = entries
+        #: Import options shared by all cases; ``paths`` and ``index`` are set per case.
+        self.options = options
+        #: Common configuration.
+        self.common_options = common_options
+        #: Number of cases to import in parallel.
+        self.parallel_cases = parallel_cases
+        # one connection per upload worker and case, and for listing the pages of file lists
+        common_options.reserve_connections(options.jobs + parallel_cases + PAGINATION_MAX_WORKERS)
+
+    def run(self) -> typing.List[BatchImportResult]:
+        """Import all cases and return the results in manifest order."""
+        md5_cache = Md5Cache(self.common_options.cache_options.state_path(MD5_CACHE_FILENAME))
+        with contextlib.closing(md5_cache):
+            return self._run(md5_cache)
+
+    def _run(self, md5_cache: Md5Cache) -> typing.List[BatchImportResult]:
+        case_import_infos = api.case_import_info_list(
+            server_url=self.common_options.varfish_server_url,
+            api_token=self.common_options.varfish_api_token.get_secret_value(),
+            project_uuid=self.options.project_uuid,
+            verify_ssl=self.common_options.verify_ssl,
+            client=self.common_options.client,
+        )
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.options.jobs
+        ) as upload_executor, concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.parallel_cases
+        ) as case_executor, tqdm.tqdm(
+            desc="all cases",
+            total=0,
+            unit="B",
+            unit_scale=True,
+            unit_divisor=1024,
+            disable=None,  # only on terminals
+        ) as progress_bar:
+            futures = [
+                case_executor.submit(
+                    self._import_case,
+                    entry,
+                    upload_executor,
+                    md5_cache,
+                    case_import_infos,
+                    progress_bar,
+                )
+                for entry in self.entries
+            ]
+            return [future.result() for future in futures]
+
+    def _import_case(
+        self,
+        entry: BatchImportEntry,
+        upload_executor: concurrent.futures.Executor,
+        md5_cache: Md5Cache,
+        case_import_infos: typing.List[api.CaseImportInfo],
+        progress_bar: tqdm.tqdm,
+    ) -> BatchImportResult:
+        logger.info("Importing case %s ...", entry.label)
+        importer = CaseImporter(
+            options=self.options.model_copy(
+                update={"paths": entry.paths, "index": entry.index or self.options.index}
+            ),
+            common_options=self.common_options,
+            executor=upload_executor,
+            md5_cache=md5_cache,
+            case_import_infos=case_import_infos,
+            progress_bar=progress_bar,
+        )
+        started = time.monotonic()
+        try:
+            ok, message = importer.run() == 0, ""
+            if not ok:
+                message = "import failed, see log"
+        except CASE_IMPORT_ERRORS as e:
+            logger.error("Import of case %s failed: %s", entry.label, e)
+            ok, message = False, str(e) or e.__class__.__name__
+        return BatchImportResult(
+            name=entry.label,
+            ok=ok,
+            seconds=time.monotonic() - started,
+            bytes_sent=importer.stats.bytes_sent,
+            bytes_skipped=importer.stats.bytes_skipped,
+            message=message,
+        )
+
+
+def format_results(results: typing.List[BatchImportResult]) -> str:
+    """Format batch import results as a table with totals."""
+    rows = [
+        [
+            result.name,
+            "ok" if result.ok else "FAILED",
+            "%.1f" % result.seconds,
+            result.bytes_sent,
+            result.bytes_skipped,
+            result.message,
+        ]
+        for result in results
+    ]
+    rows.append(
+        [
+            "total",
+            "%d of %d ok" % (sum(result.ok for result in results), len(results)),
+            "",
+            sum(result.bytes_sent for result in results),
+            sum(result.bytes_skipped for result in results),
+            "",
+        ]
+    )
+    return tabulate(
+        rows,
+        headers=["case", "status", "seconds", "bytes sent", "bytes skipped", "message"],
+        tablefmt="grid",
+    )
@@ -1,19 +1,26 @@
 """Implementation for creating a ``CaseImportInfo``."""
 
+import collections
+import concurrent.futures
+import contextlib
 import enum
+import glob
 import gzip
-from itertools import chain
-import json
+from itertools import chain, islice
 import os
 import re
 import sys
+import threading
+import time
 import typing
 import uuid
 
 from logzero import logger
 import polyleven
 import pydantic
+import requests
 from tabulate import tabulate
+import tqdm
 
 from varfish_cli import api
 from varfish_cli.api import (
@@ -29,6 +36,8 @@ from varfish_cli.api import (
     VariantSetImportState,
     models,
 )
+from varfish_cli.api.case import PAGINATION_MAX_WORKERS
+from varfish_cli.api.resumable import UPLOAD_JOURNAL_FILENAME, ResumeJournal
 from varfish_cli.config import CommonOptions
 
 #: Regular expressions of suffixes to remove.
@@ -38,11 +47,16 @@ from varfish_cli.exceptions import (
     MissingFileOnImport,
     RestApiCallException,
 )
+from varfish_cli.hashing import MD5_CACHE_FILENAME, HashingReader, Md5Cache
+from varfish_cli.parse_gts import decode_json_col
 from varfish_cli.parse_ped import DISEASE_MAP, SEX_MAP, parse_ped
 
 #: Regular expressions of suffixes to remove.
 REMOVE_SUFFIX_RES = (r"-N.-DNA.-.*$",)
 
+#: Default number of files to upload in parallel.
+DEFAULT_UPLOAD_JOBS = 4
+
 #: Expected header for small variant genotypes.
 EXPECTED_GTS = [
     "release",
@@ -211,6 +225,53 @@ class FileType(enum.Enum):
     GENE_ANNOTATION = "case_gene_annotation"
 
 
+class FileProbe:
+    """Header and first records of a TSV file, read with a single open of the file.
+
+    The parsed values are cached so the file type guessing and the consistency checks
+    of the import do not need to open and decompress the file again.
+    """
+
+    def __init__(self, path: str, num_records: int = 1):
+        #: Path to the probed file.
+        self.path = path
+        opener = gzip.open if path.endswith(".gz") else open
+        try:
+            with opener(path, "rt") as inputf:
+                lines = [line.rstrip("\r\n") for line in islice(inputf, num_records + 1)]
+        except (UnicodeDecodeError, gzip.BadGzipFile, OSError) as e:
+            logger.debug("Could not read %s as text, treating it as unknown: %s", path, e)
+            lines = []
+        #: Header line split by tabs, empty for empty or unreadable files.
+        self.header: typing.List[str] = lines[0].split("\t") if lines else []
+        #: The first records as dicts from header to value.
+        self.records: typing.List[typing.Dict[str, str]] = [
+            dict(zip(self.header, line.split("\t"))) for line in lines[1:] if line
+        ]
+        self._dict_cols: typing.Dict[str, typing.Optional[typing.Dict[str, typing.Any]]] = {}
+
+    @property
+    def release(self) -> typing.Optional[str]:
+        """Value of the ``release`` column in the first record, if any."""
+        return self.records[0].get("release") if self.records else None
+
+    def dict_col(self, column: str) -> typing.Optional[typing.Dict[str, typing.Any]]:
+        """Parsed triple-quoted JSON of ``column`` in the first record, ``None`` if no records."""
+        if column not in self._dict_cols:
+            if self.records:
+                value = decode_json_col(self.records[0][column])
+            else:
+                value = None
+            self._dict_cols[column] = value
+        return self._dict_cols[column]
+
+    @property
+    def sample_keys(self) -> typing.Optional[typing.Set[str]]:
+        """Sample names from the ``genotype`` column of the first record, if any."""
+        gts = self.dict_col("genotype")
+        return None if gts is None else set(gts.keys())
+
+
 class FileTypeGuesser:
     """Helper class for implementing file type guessing."""
 
@@ -219,16 +280,11 @@ class FileTypeGuesser:
 
     def guess(self, path) -> typing.Optional[FileType]:
         """Guess file type, return ``None`` if not successful."""
-        if path.endswith(".gz"):
-            with gzip.open(path, "rt") as inputf:
-                return self._guess_content(inputf)
-        else:
-            with open(path, "rt") as inputf:
-                return self._guess_content(inputf)
+        return self.guess_probe(FileProbe(path))
 
-    def _guess_content(self, file):
-        """Guess file type by content."""
-        first_line = file.readline().splitlines(keepends=False)[0].split("\t")
+    def guess_probe(self, probe: FileProbe) -> typing.Optional[FileType]:
+        """Guess file type from the header of an already probed file."""
+        first_line = probe.header
         matchers = {
             FileType.PED: self._looks_like_ped,
             FileType.MD5: self._looks_like_md5,
@@ -271,6 +327,142 @@ class FileTypeGuesser:
         return arr == EXPECTED_GENE_ANNOTATIONS
 
 
+#: Suffixes of the files found in directories that are classified by their content.
+CLASSIFIABLE_SUFFIXES = (".ped", ".ped.gz", ".tsv", ".tsv.gz", ".md5")
+
+
+def _walk_files(path: str) -> typing.Iterator[str]:
+    """Yield the paths of the non-hidden files below directory ``path`` in name order.
+
+    Only files with one of ``CLASSIFIABLE_SUFFIXES`` are yielded, skipping, e.g., BAM files.
+    """
+    with os.scandir(path) as it:
+        entries = sorted(
+            (entry for entry in it if not entry.name.startswith(".")), key=lambda e: e.name
+        )
+    for entry in entries:
+        if entry.is_dir():
+            yield from _walk_files(entry.path)
+        elif entry.is_file() and entry.name.endswith(CLASSIFIABLE_SUFFIXES):
+            yield entry.path
+
+
+def expand_paths(paths: typing.Iterable[str]) -> typing.List[str]:
+    """Expand directories and glob patterns in ``paths`` to the files to import.
+
+    Directories are walked recursively, skipping hidden files and directories and files
+    without one of ``CLASSIFIABLE_SUFFIXES``.  For files that are not found in a directory
+    walk, their ``.md5`` sidecar is added if it exists.
+    """
+    result: typing.List[str] = []
+    for path in paths:
+        matches = sorted(glob.glob(path, recursive=True)) if glob.has_magic(path) else [path]
+        if not matches:
+            logger.warn("Pattern %s did not match any file", path)
+        for match in matches:
+            if os.path.isdir(match):
+                result += _walk_files(match)
+            else:
+                result.append(match)
+                if not match.endswith(".md5") and os.path.exists(match + ".md5"):
+                    result.append(match + ".md5")
+    return list(dict.fromkeys(result))  # remove duplicates, keep order
+
+
+def pair_md5_sidecars(
+    paths: typing.Iterable[str],
+) -> typing.Tuple[typing.List[str], typing.Dict[str, typing.Optional[str]]]:
+    """Pair the files in ``paths`` with their ``.md5`` sidecar files by name.
+
+    :returns: pair of the paths without paired sidecars and the dict from each of these
+        paths to its sidecar path or ``None``
+    """
+    paths = list(paths)
+    names = set(paths)
+    sidecars = {path[:-4] for path in paths if path.endswith(".md5")} & names
+    result = [path for path in paths if not path.endswith(".md5") or path[:-4] not in names]
+    return result, {path: (path + ".md5" if path in sidecars else None) for path in result}
+
+
+def probe_paths(
+    paths: typing.Iterable[str],
+    executor: concurrent.futures.Executor,
+    probes: typing.Optional[typing.Dict[str, FileProbe]] = None,
+) -> typing.Tuple[typing.Dict[str, FileProbe], typing.Dict[str, typing.Optional[str]]]:
+    """Expand ``paths``, pair ``.md5`` sidecars, and probe the other files on ``executor``.
+
+    Files already in ``probes`` are not probed again.
+
+    :returns: pair of the probes by path in the order of the expanded paths and the dict
+        from each path to its ``.md5`` sidecar path or ``None``
+    """
+    probes = probes or {}
+    paths, md5_sidecars = pair_md5_sidecars(expand_paths(paths))
+    to_probe = [path for path in paths if path not in probes]
+    new_probes = dict(zip(to_probe, executor.map(FileProbe, to_probe)))
+    return {
+        path: probes[path] if path in probes else new_probes[path] for path in paths
+    }, md5_sidecars
+
+
+#: Suffixes of the pipeline output files, stripped to get the common name stem of a sample.
+PIPELINE_SUFFIX_RE = re.compile(r"\.(db-infos|gts|feature-effects|bam-qc)\.tsv(\.gz)?$")
+
+
+class GenotypeFileIndex:
+    """Index of genotype files for matching DB info files to them by file name.
+
+    The pipeline names its files ``{mapper}.{caller}.{steps}.{sample}.{kind}.tsv.gz``.  A DB
+    info file is matched to the genotype file with the same path up to the kind, then the
+    same file name in another directory, then the same caller and sample.  Only if all of
+    this fails, the edit distance to the genotype files of the same sample (or to all if
+    there are none) is used.  On ties, the first genotype file wins.
+    """
+
+    def __init__(self, paths: typing.Iterable[typing.Tuple[bool, str]]):
+        #: Pairs of ``is_sv`` and path of the genotype files, in order.
+        self.paths = list(paths)
+        self._by_stem: typing.Dict[str, bool] = {}
+        self._by_name: typing.Dict[str, bool] = {}
+        self._by_caller_sample: typing.Dict[typing.Tuple[str, str], bool] = {}
+        self._by_sample: typing.Dict[str, typing.List[typing.Tuple[bool, str]]] = {}
+        for is_sv, path in self.paths:
+            stem, name, caller_sample = self._keys(path)
+            self._by_stem.setdefault(stem, is_sv)
+            self._by_name.setdefault(name, is_sv)
+            if caller_sample:
+                self._by_caller_sample.setdefault(caller_sample, is_sv)
+            self._by_sample.setdefault(name.split(".")[-1], []).append((is_sv, path))
+
+    @staticmethod
+    def _keys(
+        path: str,
+    ) -> typing.Tuple[str, str, typing.Optional[typing.Tuple[str, str]]]:
+        stem = PIPELINE_SUFFIX_RE.sub("", path)
+        name = os.path.basename(stem)
+        tokens = name.split(".")
+        return stem, name, (tokens[1], tokens[-1]) if len(tokens) >= 3 else None
+
+    def is_sv(self, path: str) -> typing.Optional[bool]:
+        """Return whether the DB info file at ``path`` belongs to SVs, ``None`` if no files."""
+        stem, name, caller_sample = self._keys(path)
+        if stem in self._by_stem:
+            return self._by_stem[stem]
+        elif name in self._by_name:
+            return self._by_name[name]
+        elif caller_sample in self._by_caller_sample:
+            return self._by_caller_sample[caller_sample]
+        candidates = self._by_sample.get(name.split(".")[-1]) or self.paths
+        best_is_sv = None
+        best_dist = None
+        for is_sv, candidate in candidates:
+            dist = polyleven.levenshtein(path, candidate)
+            if best_dist is None or best_dist > dist:
+                best_is_sv = is_sv
+                best_dist = dist
+        return best_is_sv
+
+
 class CaseImportOptions(pydantic.BaseModel):
     paths: typing.List[str]
     genomebuild: GenomeBuild
@@ -280,6 +472,195 @@ class CaseImportOptions(pydantic.BaseModel):
     force_fresh: bool
     case_name_suffix: str
     index: typing.Union[str, None]
+    jobs: pydantic.PositiveInt = DEFAULT_UPLOAD_JOBS
+    resumable: bool = False
+    validate_files: bool = False
+
+
+class PlannedAction(pydantic.BaseModel):
+    """One change that an import would make on the server."""
+
+    #: One of ``"create"``, ``"update"``, ``"reuse"``, ``"upload"``, ``"skip"``, ``"delete"``.
+    action: str
+    #: Kind of the object, e.g., ``"genotype file"``.
+    kind: str
+    #: Name of the object.
+    name: str
+    #: Number of bytes to upload.
+    size: int = 0
+
+
+class ImportPlan(pydantic.BaseModel):
+    """The changes that an import would make on the server, see ``CaseImporter.plan()``."""
+
+    #: The planned actions, in the order they would be performed.
+    actions: typing.List[PlannedAction] = []
+
+    def add(self, action: str, kind: str, name: str, size: int = 0):
+        self.actions.append(PlannedAction(action=action, kind=kind, name=name, size=size))
+
+    @property
+    def upload_bytes(self) -> int:
+        return sum(action.size for action in self.actions if action.action == "upload")
+
+    def format(self) -> str:
+        """Format plan as a table with a summary line."""
+        counts = collections.Counter(action.action for action in self.actions)
+        table = tabulate(
+            [
+                [a.action, a.kind, a.name, a.size if a.action == "upload" else ""]
+                for a in self.actions
+            ],
+            headers=["action", "kind", "name", "bytes"],
+            tablefmt="grid",
+        )
+        return "%s\n%s, %d bytes to upload" % (
+            table,
+            ", ".join("%d %s" % (counts[key], key) for key in sorted(counts)),
+            self.upload_bytes,
+        )
+
+
+class ImportStats:
+    """Thread-safe counters and phase timings of an import, for the summary at the end."""
+
+    def __init__(self):
+        #: Number of files and bytes uploaded.
+        self.files_sent = 0
+        self.bytes_sent = 0
+        #: Number of files and bytes not uploaded as a file with the same md5 sum existed.
+        self.files_skipped = 0
+        self.bytes_skipped = 0
+        #: Seconds spent computing MD5 sums, summed over all threads.
+        self.md5_seconds = 0.0
+        #: Wall-clock seconds by phase of ``CaseImporter.run()``.
+        self.phases: typing.Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def record_upload(self, size: int):
+        with self._lock:
+            self.files_sent += 1
+            self.bytes_sent += size
+
+    def record_skip(self, size: int):
+        with self._lock:
+            self.files_skipped += 1
+            self.bytes_skipped += size
+
+    def record_md5(self, seconds: float):
+        with self._lock:
+            self.md5_seconds += seconds
+
+    @contextlib.contextmanager
+    def phase(self, name: str) -> typing.Iterator[None]:
+        """Measure the wall-clock time of the phase ``name``."""
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.monotonic() - started
+
+    def summary(self) -> str:
+        """Return table of the transferred bytes and phase timings."""
+        upload_seconds = self.phases.get("upload files", 0.0)
+        rows = [
+            ["bytes sent", "%d (%d files)" % (self.bytes_sent, self.files_sent)],
+            [
+                "bytes skipped (md5 exists)",
+                "%d (%d files)" % (self.bytes_skipped, self.files_skipped),
+            ],
+            [
+                "upload throughput",
+                "%.1f MB/s" % (self.bytes_sent / upload_seconds / 1e6 if upload_seconds else 0.0),
+            ],
+            ["md5 computation", "%.2f s" % self.md5_seconds],
+        ]
+        rows += [["phase: %s" % name, "%.2f s" % seconds] for name, seconds in self.phases.items()]
+        return tabulate(rows, tablefmt="grid")
+
+
+#: Exceptions of single API calls that are collected while purging old files.
+PURGE_ERRORS = (RestApiCallException, requests.RequestException)
+
+#: Exceptions on problems with the files or the server when planning an import.
+PLAN_ERRORS = (
+    MissingFileOnImport,
+    InconsistentGenomeBuild,
+    InconsistentSamplesDataException,
+    RestApiCallException,
+)
+
+
+class RemoteFileIndex:
+    """Index of the files on the server by container and md5 sum.
+
+    The files of each container (case import info or variant set import info) are
+    listed with one API call per file type on first access and the index is kept up
+    to date on upload and removal.  The index is thread-safe.
+    """
+
+    def __init__(self, common_options: CommonOptions):
+        #: Common configuration.
+        self.common_options = common_options
+        #: Remote files by ``(api_list_func, container UUID)`` and md5 sum.
+        self._files: typing.Dict[
+            typing.Tuple[typing.Callable, str], typing.Dict[str, typing.List[typing.Any]]
+        ] = {}
+        self._lock = threading.Lock()
+        self._container_locks: typing.Dict[
+            typing.Tuple[typing.Callable, str], threading.Lock
+        ] = collections.defaultdict(threading.Lock)
+
+    def files(
+        self,
+        api_list_func: typing.Callable,
+        func_uuid_arg: str,
+        uuid_value: typing.Union[str, uuid.UUID],
+    ) -> typing.Dict[str, typing.List[typing.Any]]:
+        """Return remote files of the container ``uuid_value`` by md5 sum, listing them once."""
+        key = (api_list_func, str(uuid_value))
+        with self._lock:
+            container_lock = self._container_locks[key]
+        with container_lock:
+            if key not in self._files:
+                by_md5 = collections.defaultdict(list)
+                for file_obj in api_list_func(
+                    server_url=self.common_options.varfish_server_url,
+                    api_token=self.common_options.varfish_api_token.get_secret_value(),
+                    **{func_uuid_arg: uuid_value},
+                    verify_ssl=self.common_options.verify_ssl,
+                    client=self.common_options.client,
+                ):
+                    by_md5[file_obj.md5].append(file_obj)
+                with self._lock:
+                    self._files[key] = by_md5
+        with self._lock:
+            return {md5: list(file_objs) for md5, file_objs in self._files[key].items()}
+
+    def add(
+        self,
+        api_list_func: typing.Callable,
+        uuid_value: typing.Union[str, uuid.UUID],
+        file_obj: typing.Any,
+    ):
+        """Register uploaded ``file_obj`` in the container ``uuid_value``."""
+        with self._lock:
+            by_md5 = self._files.setdefault((api_list_func, str(uuid_value)), {})
+            by_md5.setdefault(file_obj.md5, []).append(file_obj)
+
+    def remove(
+        self,
+        api_list_func: typing.Callable,
+        uuid_value: typing.Union[str, uuid.UUID],
+        file_obj: typing.Any,
+    ):
+        """Unregister removed ``file_obj`` from the container ``uuid_value``."""
+        with self._lock:
+            by_md5 = self._files.get((api_list_func, str(uuid_value)), {})
+            if file_obj in by_md5.get(file_obj.md5, []):
+                by_md5[file_obj.md5].remove(file_obj)
+                if not by_md5[file_obj.md5]:
+                    del by_md5[file_obj.md5]
 
 
 class CaseImporter:
@@ -291,11 +672,33 @@ class CaseImporter:
     does not match.  Otherwise, it is kept intact.  Finally, start the import by updating its status.
     """
 
-    def __init__(self, options: CaseImportOptions, common_options: CommonOptions):
+    def __init__(
+        self,
+        options: CaseImportOptions,
+        common_options: CommonOptions,
+        executor: typing.Optional[concurrent.futures.Executor] = None,
+        md5_cache: typing.Optional[Md5Cache] = None,
+        case_import_infos: typing.Optional[typing.List[CaseImportInfo]] = None,
+        progress_bar: typing.Optional[tqdm.tqdm] = None,
+    ):
         #: Local configuration.
         self.options = options
         #: Common configuration.
         self.common_options = common_options
+        # one connection per upload worker and for listing the pages of file lists
+        common_options.reserve_connections(options.jobs + PAGINATION_MAX_WORKERS)
+        #: Worker pool for uploads shared with other importers, if any.
+        self.executor = executor
+        #: Case import infos of the project if already known, e.g., in batch imports.
+        self.case_import_infos = case_import_infos
+        #: Aggregate progress bar shared with other importers, if any.
+        self.progress_bar = progress_bar
+        #: Transferred bytes and timings.
+        self.stats = ImportStats()
+        #: Probes of the input files by path, so each file is only opened once for checks.
+        self.probes: typing.Dict[str, FileProbe] = {}
+        #: The ``.md5`` sidecar file for each input file, ``None`` if there is none.
+        self.md5_sidecars: typing.Dict[str, typing.Optional[str]] = {}
 
         #: The path to the pedigree file to parse.
         self.path_ped: typing.Optional[PathWithTimestamp] = None
@@ -314,10 +717,29 @@ class CaseImporter:
         #: The paths to the database info files to import for SVs.
         self.paths_database_info_sv: typing.List[PathWithTimestamp] = []
 
+        #: Index of the files on the server.
+        self.remote_files = RemoteFileIndex(common_options)
+        #: Cache of locally computed MD5 sums, persistent unless disabled.
+        self.md5_cache = md5_cache or Md5Cache(
+            common_options.cache_options.state_path(MD5_CACHE_FILENAME)
+        )
+        #: Journal of chunked uploads, if they are enabled.
+        self.upload_journal: typing.Optional[ResumeJournal] = None
+        if options.resumable:
+            self.upload_journal = ResumeJournal(
+                common_options.cache_options.state_path(UPLOAD_JOURNAL_FILENAME)
+            )
+
         #: The pedigree members.
         self.pedigree: typing.List[PedigreeMember] = None
         self.index: typing.Union[str, None] = options.index
 
+    def _pool(self) -> typing.ContextManager[concurrent.futures.Executor]:
+        """Return the shared worker pool or a new one with ``options.jobs`` workers."""
+        if self.executor is not None:
+            return contextlib.nullcontext(self.executor)
+        return concurrent.futures.ThreadPoolExecutor(max_workers=self.options.jobs)
+
     def _log_exception(self, e):
         logger.exception(e, exc_info=self.common_options.verbose)
 
@@ -327,7 +749,8 @@ class CaseImporter:
 
         logger.info("... find out role of input paths ...")
         try:
-            self._split_files_by_role()
+            with self.stats.phase("classify files"):
+                self._split_files_by_role()
         except MissingFileOnImport as e:
             self._log_exception(e)
             logger.error("Problem during file to role assignment, giving up!")
@@ -335,97 +758,248 @@ class CaseImporter:
 
         logger.info("... checking genomebuild consistency ...")
         try:
-            self._check_genomebuild_consistency()
+            with self.stats.phase("check genome build"):
+                self._check_genomebuild_consistency()
         except InconsistentGenomeBuild as e:
             self._log_exception(e)
             logger.error("Inconsistent genome builds, giving up!")
             return 1
 
+        if self.options.validate_files:
+            logger.info("... validating genotype files ...")
+            with self.stats.phase("validate files"):
+                valid = self._validate_files()
+            if not valid:
+                logger.error("Invalid genotype files, giving up!")
+                return 1
+
         logger.info("... creating case import info ...")
         try:
-            case_import_info = self._create_case_import_info()
+            with self.stats.phase("create case import info"):
+                case_import_info = self._create_case_import_info()
         except RestApiCallException as e:
             self._log_exception(e)
             logger.error("Problem creating case import info on remote side.")
             return 1
 
         logger.info("... uploading files (if necessary) ...")
-        good_md5s = self._upload_files(case_import_info)
+        with self.stats.phase("upload files"):
+            good_md5s = self._upload_files(case_import_info)
         logger.info("... purging old files (if necessary) ...")
-        self._purge_old_files(case_import_info, good_md5s)
+        try:
+            with self.stats.phase("purge old files"):
+                self._purge_old_files(case_import_info, good_md5s)
+        except RestApiCallException as e:
+            self._log_exception(e)
+            logger.error("Problem purging old files on remote side.")
+            return 1
         logger.info("... and updating state to 'submitted'")
-        self._submit_import(case_import_info)
+        with self.stats.phase("submit"):
+            self._submit_import(case_import_info)
+        logger.info("Import summary =\n%s", self.stats.summary())
         return 0
 
+    def plan(self) -> typing.Optional[ImportPlan]:
+        """Check the files and compute the changes that ``run()`` would make on the server.
+
+        The remote state is listed once and nothing is changed on the server.  Like
+        ``run()``, problems are logged and ``None`` is returned.
+        """
+        try:
+            return self._plan()
+        except PLAN_ERRORS as e:
+            self._log_exception(e)
+            logger.error("Problem planning the import, giving up!")
+            return None
+
+    def _plan(self) -> ImportPlan:
+        self._split_files_by_role()
+        self._check_genomebuild_consistency()
+        plan = ImportPlan()
+        action, case_info = self._find_case_import_info()
+        plan.add(action, "case import info", case_info.name)
+        exists = action != "create"
+        variant_set_infos = []
+        if exists:
+            variant_set_infos = api.variant_set_import_info_list(
+                server_url=self.common_options.varfish_server_url,
+                api_token=self.common_options.varfish_api_token.get_secret_value(),
+                case_import_info_uuid=case_info.sodar_uuid,
+                verify_ssl=self.common_options.verify_ssl,
+                client=self.common_options.client,
+            )
+
+        good_md5s = set()
+
+        def plan_uploads(paths, api_list_func, func_uuid_arg, uuid_value, kind, remote):
+            remote_files = {}
+            if remote:
+                remote_files = self.remote_files.files(api_list_func, func_uuid_arg, uuid_value)
+            for path in paths:
+                md5 = self._file_md5(path.path)
+                good_md5s.add(md5)
+                if md5 in remote_files:
+                    plan.add("skip", kind, path.basename)
+                else:
+                    plan.add("upload", kind, path.basename, os.path.getsize(path.path))
+
+        for paths, api_list_func, kind in (
+            (self.paths_bam_qc, api.bam_qc_file_list, "BAM QC file"),
+            (
+                self.paths_case_gene_annotations,
+                api.case_gene_annotation_file_list,
+                "gene annotation",
+            ),
+        ):
+            if paths:
+                plan_uploads(
+                    paths,
+                    api_list_func,
+                    "case_import_info_uuid",
+                    case_info.sodar_uuid,
+                    kind,
+                    exists,
+                )
+        for variant_type, paths_genotype, paths_database_info, label in (
+            (CaseVariantType.SMALL, self.paths_genotype, self.paths_database_info, "small"),
+            (
+                CaseVariantType.STRUCTURAL,
+                self.paths_genotype_sv,
+                self.paths_database_info_sv,
+                "structural",
+            ),
+        ):
+            if not paths_genotype:
+                continue
+            action, variant_set_info = self._find_variant_set_import_info(
+                case_info, variant_type, variant_set_infos
+            )
+            plan.add(action, "variant set import info", label)
+            for paths, api_list_func, kind in (
+                (paths_genotype, api.genotype_file_list, "genotype file"),
+                (paths_database_info, api.db_info_file_list, "db info file"),
+            ):
+                if paths:
+                    plan_uploads(
+                        paths,
+                        api_list_func,
+                        "variant_set_import_info_uuid",
+                        variant_set_info.sodar_uuid,
+                        kind,
+                        action != "create",
+                    )
+            plan.add("update", "variant set import info", "%s: state uploaded" % label)
+
+        # Stale files, as removed by ``_purge_old_files()``.
+        if exists:
+            file_kinds = [(api.bam_qc_file_list, "case_import_info_uuid", case_info, "BAM QC file")]
+            for variant_set_info in variant_set_infos:
+                file_kinds += [
+                    (api_list_func, "variant_set_import_info_uuid", variant_set_info, kind)
+                    for api_list_func, kind in (
+                        (api.genotype_file_list, "genotype file"),
+                        (api.effects_file_list, "effects file"),
+                        (api.db_info_file_list, "db info file"),
+                    )
+                ]
+            for api_list_func, func_uuid_arg, container, kind in file_kinds:
+                remote_files = self.remote_files.files(
+                    api_list_func, func_uuid_arg, container.sodar_uuid
+                )
+                for md5, file_objs in remote_files.items():
+                    if md5 not in good_md5s:
+                        for file_obj in file_objs:
+                            plan.add("delete", kind, file_obj.name)
+        plan.add("update", "case import info", "%s: state submitted" % case_info.name)
+        return plan
+
     def _purge_old_files(self, case_import_info: CaseImportInfo, good_md5s: typing.Collection[str]):
-        bam_qc_files = api.bam_qc_file_list(
+        """Remove remote files whose md5 sum is not in ``good_md5s``.
+
+        The files are listed and removed concurrently.  Failing calls do not stop the
+        others; their errors are collected in a fixed order and raised together.
+        """
+        good_md5s = set(good_md5s)
+        # (func_uuid_arg, uuid_value, api_list_func, api_destroy_func, file_uuid_arg)
+        file_kinds = [
+            (
+                "case_import_info_uuid",
+                case_import_info.sodar_uuid,
+                api.bam_qc_file_list,
+                api.bam_qc_file_destroy,
+                "bam_qc_file_uuid",
+            )
+        ]
+        for variant_set in api.variant_set_import_info_list(
             server_url=self.common_options.varfish_server_url,
             api_token=self.common_options.varfish_api_token.get_secret_value(),
             case_import_info_uuid=case_import_info.sodar_uuid,
             verify_ssl=self.common_options.verify_ssl,
-        )
-        for bam_qc_file in bam_qc_files:
-            if bam_qc_file.md5 not in good_md5s:
-                api.bam_qc_file_destroy(
-                    server_url=self.common_options.varfish_server_url,
-                    api_token=self.common_options.varfish_api_token.get_secret_value(),
-                    case_import_info_uuid=case_import_info.sodar_uuid,
-                    bam_qc_file_uuid=bam_qc_file.sodar_uuid,
-                    verify_ssl=self.common_options.verify_ssl,
+            client=self.common_options.client,
+        ):
+            for api_list_func, api_destroy_func, file_uuid_arg in (
+                (api.genotype_file_list, api.genotype_file_destroy, "genotype_file_uuid"),
+                (api.effects_file_list, api.effects_file_destroy, "effects_file_uuid"),
+                (api.db_info_file_list, api.db_info_file_destroy, "db_info_file_uuid"),
+            ):
+                file_kinds.append(
+                    (
+                        "variant_set_import_info_uuid",
+                        variant_set.sodar_uuid,
+                        api_list_func,
+                        api_destroy_func,
+                        file_uuid_arg,
+                    )
                 )
 
-        variant_sets = api.variant_set_import_info_list(
+        errors = []
+        with self._pool() as executor:
+            listings = [
+                executor.submit(self.remote_files.files, api_list_func, func_uuid_arg, uuid_value)
+                for func_uuid_arg, uuid_value, api_list_func, _, _ in file_kinds
+            ]
+            destroys = []
+            for file_kind, listing in zip(file_kinds, listings):
+                try:
+                    remote_files = listing.result()
+                except PURGE_ERRORS as e:
+                    errors.append("listing files of %s: %s" % (file_kind[1], e))
+                    continue
+                destroys += [
+                    (file_obj, executor.submit(self._destroy_file, *file_kind, file_obj))
+                    for md5, file_objs in remote_files.items()
+                    if md5 not in good_md5s
+                    for file_obj in file_objs
+                ]
+            for file_obj, destroy in destroys:
+                try:
+                    destroy.result()
+                except PURGE_ERRORS as e:
+                    errors.append("removing %s (%s): %s" % (file_obj.name, file_obj.sodar_uuid, e))
+        if errors:
+            raise RestApiCallException(
+                "Problem(s) purging old files:\n%s" % "\n".join("- %s" % e for e in errors)
+            )
+
+    def _destroy_file(
+        self,
+        func_uuid_arg: str,
+        uuid_value: typing.Union[str, uuid.UUID],
+        api_list_func: typing.Callable,
+        api_destroy_func: typing.Callable,
+        file_uuid_arg: str,
+        file_obj: typing.Any,
+    ):
+        """Destroy remote ``file_obj`` and remove it from the index."""
+        logger.debug("- removing old file %s", file_obj.name)
+        api_destroy_func(
             server_url=self.common_options.varfish_server_url,
             api_token=self.common_options.varfish_api_token.get_secret_value(),
-            case_import_info_uuid=case_import_info.sodar_uuid,
+            **{func_uuid_arg: uuid_value, file_uuid_arg: file_obj.sodar_uuid},
             verify_ssl=self.common_options.verify_ssl,
+            client=self.common_options.client,
         )
-        for variant_set in variant_sets:
-            genotype_files = api.genotype_file_list(
-                server_url=self.common_options.varfish_server_url,
-                api_token=self.common_options.varfish_api_token.get_secret_value(),
-                variant_set_import_info_uuid=variant_set.sodar_uuid,
-                verify_ssl=self.common_options.verify_ssl,
-            )
-            for gt_file in genotype_files:
-                if gt_file.md5 not in good_md5s:
-                    api.genotype_file_destroy(
-                        server_url=self.common_options.varfish_server_url,
-                        api_token=self.common_options.varfish_api_token.get_secret_value(),
-                        variant_set_import_info_uuid=variant_set.sodar_uuid,
-                        genotype_file_uuid=gt_file.sodar_uuid,
-                        verify_ssl=self.common_options.verify_ssl,
-                    )
-            effect_files = api.effects_file_list(
-                server_url=self.common_options.varfish_server_url,
-                api_token=self.common_options.varfish_api_token.get_secret_value(),
-                variant_set_import_info_uuid=variant_set.sodar_uuid,
-                verify_ssl=self.common_options.verify_ssl,
-            )
-            for eff_file in effect_files:
-                if eff_file.md5 not in good_md5s:
-                    api.effects_file_destroy(
-                        server_url=self.common_options.varfish_server_url,
-                        api_token=self.common_options.varfish_api_token.get_secret_value(),
-                        variant_set_import_info_uuid=variant_set.sodar_uuid,
-                        effects_file_uuid=eff_file.sodar_uuid,
-                        verify_ssl=self.common_options.verify_ssl,
-                    )
-            db_info_files = api.db_info_file_list(
-                server_url=self.common_options.varfish_server_url,
-                api_token=self.common_options.varfish_api_token.get_secret_value(),
-                variant_set_import_info_uuid=variant_set.sodar_uuid,
-                verify_ssl=self.common_options.verify_ssl,
-            )
-            for db_info_file in db_info_files:
-                if db_info_file.md5 not in good_md5s:
-                    api.db_info_file_destroy(
-                        server_url=self.common_options.varfish_server_url,
-                        api_token=self.common_options.varfish_api_token.get_secret_value(),
-                        variant_set_import_info_uuid=variant_set.sodar_uuid,
-                        db_info_file_uuid=db_info_file.sodar_uuid,
-                        verify_ssl=self.common_options.verify_ssl,
-                    )
+        self.remote_files.remove(api_list_func, uuid_value, file_obj)
 
     def _split_files_by_role(self):  # noqa
         """Split out files by their role into ``self.path_ped`` and ``self.paths_*``."""
@@ -439,8 +1013,13 @@ class CaseImporter:
             FileType.EFFECTS_SV: self.paths_effect_sv,
         }
 
-        for path in self.options.paths:
-            guessed = FileTypeGuesser().guess(path)
+        with self._pool() as pool:
+            probes, self.md5_sidecars = probe_paths(self.options.paths, pool, self.probes)
+        self.probes.update(probes)
+
+        guesser = FileTypeGuesser()
+        for path, probe in probes.items():
+            guessed = guesser.guess_probe(probe)
             if guessed == FileType.PED:
                 if self.path_ped:
                     logger.warn("Overwriting PED path %s vs. %s", self.path_ped, path)
@@ -452,23 +1031,18 @@ class CaseImporter:
             else:
                 logger.error("Could not assign %s of type %s", path, guessed)
 
-        paths_database_info = list(self.paths_database_info)
-
         # Match DB info files to small/large variants by file name match/mismatch.
+        index = GenotypeFileIndex(
+            [(False, path.path) for path in self.paths_genotype]
+            + [(True, path.path) for path in self.paths_genotype_sv]
+        )
+        paths_database_info = list(self.paths_database_info)
+        self.paths_database_info.clear()
         for db_info_file in paths_database_info:
-            best_is_sv = None
-            best_dist = None
-
-            for is_sv, paths in (False, self.paths_genotype), (True, self.paths_genotype_sv):
-                for path in paths:
-                    dist = polyleven.levenshtein(db_info_file.path, path.path)
-                    if best_dist is None or best_dist > dist:
-                        best_is_sv = is_sv
-                        best_dist = dist
-
-            if best_is_sv:
+            if index.is_sv(db_info_file.path):
                 self.paths_database_info_sv.append(db_info_file)
-                self.paths_database_info.remove(db_info_file)
+            else:
+                self.paths_database_info.append(db_info_file)
 
         guessed = []
         for key, lst in file_type_to_list.items():
@@ -498,22 +1072,58 @@ class CaseImporter:
         """Check consistency with genomebuild."""
 
         for path_gt in self.paths_genotype + self.paths_genotype_sv:
-            if path_gt.path.endswith(".gz"):
-                openf = gzip.open(path_gt.path, "rt")
-            else:
-                openf = open(path_gt.path, "rt")
-            with openf as inputf:
-                header = inputf.readline().splitlines(keepends=False)[0].split("\t")
-                line = inputf.readline().splitlines(keepends=False)[0].split("\t")
-                rec = dict(zip(header, line))
-                if rec["release"] != self.options.genomebuild.value:
-                    raise InconsistentGenomeBuild(
-                        "Inconsistent genome build from file (%s): %s and from args: %s"
-                        % (path_gt.path, rec["release"], self.options.genomebuild.value)
-                    )
+            release = self._probe(path_gt.path).release
+            if release != self.options.genomebuild.value:
+                raise InconsistentGenomeBuild(
+                    "Inconsistent genome build from file (%s): %s and from args: %s"
+                    % (path_gt.path, release, self.options.genomebuild.value)
+                )
+
+    def _validate_files(self) -> bool:
+        """Validate all rows of the genotype files, return whether they are valid."""
+        from varfish_cli.cli.importer.validate import (
+            FileValidator,  # avoid circular import
+        )
+
+        results = FileValidator(
+            paths=[path.path for path in self.paths_genotype + self.paths_genotype_sv],
+            genomebuild=self.options.genomebuild,
+            paths_ped=[self.path_ped.path],
+            jobs=self.options.jobs,
+        ).run()
+        return all(result.ok for result in results)
 
     def _create_case_import_info(self):
         """Create case if necessary."""
+        action, case_info = self._find_case_import_info()
+        if action == "update":
+            logger.info("Updating state existing case draft info: %s", case_info)
+            api.case_import_info_update(
+                server_url=self.common_options.varfish_server_url,
+                api_token=self.common_options.varfish_api_token.get_secret_value(),
+                project_uuid=self.options.project_uuid,
+                case_import_info_uuid=case_info.sodar_uuid,
+                data=case_info,
+                verify_ssl=self.common_options.verify_ssl,
+                client=self.common_options.client,
+            )
+        elif action == "create":
+            case_info = api.case_import_info_create(
+                server_url=self.common_options.varfish_server_url,
+                api_token=self.common_options.varfish_api_token.get_secret_value(),
+                project_uuid=self.options.project_uuid,
+                data=case_info,
+                verify_ssl=self.common_options.verify_ssl,
+                client=self.common_options.client,
+            )
+        return case_info
+
+    def _find_case_import_info(self) -> typing.Tuple[str, CaseImportInfo]:
+        """Check the case and find the case import info to use, without changing anything.
+
+        :returns: pair of action (``"create"``, ``"update"``, or ``"reuse"``) and the case
+            import info, not yet saved for ``"create"``
+        """
 
         def strip_suffix(x):
             for pattern in [self.options.strip_family_regex] + list(REMOVE_SUFFIX_RES):
@@ -543,12 +1153,15 @@ class CaseImporter:
             ),
         )
 
-        for case_info in api.case_import_info_list(
-            server_url=self.common_options.varfish_server_url,
-            api_token=self.common_options.varfish_api_token.get_secret_value(),
-            project_uuid=self.options.project_uuid,
-            verify_ssl=self.common_options.verify_ssl,
-        ):
+        if self.case_import_infos is None:
+            self.case_import_infos = api.case_import_info_list(
+                server_url=self.common_options.varfish_server_url,
+                api_token=self.common_options.varfish_api_token.get_secret_value(),
+                project_uuid=self.options.project_uuid,
+                verify_ssl=self.common_options.verify_ssl,
+                client=self.common_options.client,
+            )
+        for case_info in self.case_import_infos:
             if strip_suffix(case_info.name) == name:
                 logger.info("Found existing case info: %s", case_info)
                 # Make sure to update index and pedigree to current value.
@@ -565,31 +1178,16 @@ class CaseImporter:
                             "state": CaseImportState.DRAFT,
                         }
                     )
-                    logger.info("Updating state existing case draft info: %s", case_info)
-                    api.case_import_info_update(
-                        server_url=self.common_options.varfish_server_url,
-                        api_token=self.common_options.varfish_api_token.get_secret_value(),
-                        project_uuid=self.options.project_uuid,
-                        case_import_info_uuid=case_info.sodar_uuid,
-                        data=case_info,
-                        verify_ssl=self.common_options.verify_ssl,
-                    )
-                    return case_info
+                    return "update", case_info
                 elif case_info.state == CaseImportState.DRAFT and not self.options.force_fresh:
                     logger.info("Found existing case draft info: %s", case_info)
-                    return case_info
+                    return "reuse", case_info
         # else: found no match
-        return api.case_import_info_create(
-            server_url=self.common_options.varfish_server_url,
-            api_token=self.common_options.varfish_api_token.get_secret_value(),
-            project_uuid=self.options.project_uuid,
-            data=models.CaseImportInfo(
-                release=GenomeBuild(self.options.genomebuild),
-                name=name,
-                index=index,
-                pedigree=self.pedigree,
-            ),
-            verify_ssl=self.common_options.verify_ssl,
+        return "create", models.CaseImportInfo(
+            release=GenomeBuild(self.options.genomebuild),
+            name=name,
+            index=index,
+            pedigree=self.pedigree,
         )
 
     def _check_genotypes(self):
@@ -597,11 +1195,10 @@ class CaseImporter:
         with_gts = {m.name for m in self.pedigree if m.has_gt_entries}
         for path in chain(self.paths_genotype, self.paths_genotype_sv):
             logger.debug("Checking genotype vs. pedigree samples for %s", path.path)
-            dict_col = self._load_dict_col(path.path, "genotype")
-            if not dict_col:
+            gts = self._probe(path.path).sample_keys
+            if not gts:
                 print("INFO: empty file %s" % path.path, file=sys.stderr)
                 continue
-            gts = dict_col.keys()
             if gts != with_gts:
                 tpl = "Inconsistent samples in %s vs. %s (exclusive %s vs. %s)"
                 args = (path.path, self.path_ped.path, gts - with_gts, with_gts - gts)
@@ -661,24 +1258,32 @@ class CaseImporter:
 
         return case_name, pedigree
 
+    def _probe(self, path: str) -> FileProbe:
+        """Return the cached probe of the file at ``path``."""
+        if path not in self.probes:
+            self.probes[path] = FileProbe(path)
+        return self.probes[path]
+
     def _load_dict_col(self, genotype_file, column):
-        try:
-            handle = gzip.open(genotype_file, "rt")
-        except OSError:
-            handle = open(genotype_file, "rt")
-        with handle as inputf:
-            first_line = inputf.readline().strip()
-            second_line = inputf.readline().strip()
-            if not second_line:
-                return None
-            else:
-                vals = dict(zip(first_line.split("\t"), second_line.split("\t")))
-                return json.loads(vals[column].replace('"""', '"'))
+        return self._probe(genotype_file).dict_col(column)
 
     def _load_md5(self, path):
         with open(path, "rt") as inputf:
             return inputf.read().splitlines(False)[0].split()[0]
 
+    def _file_md5(self, path: str) -> str:
+        """Return MD5 sum of ``path`` from its ``.md5`` sidecar file or compute it."""
+        if path in self.md5_sidecars:
+            sidecar = self.md5_sidecars[path]
+        else:
+            sidecar = path + ".md5" if os.path.exists(path + ".md5") else None
+        if sidecar:
+            return self._load_md5(sidecar)
+        started = time.monotonic()
+        md5 = self.md5_cache.md5(path)
+        self.stats.record_md5(time.monotonic() - started)
+        return md5
+
     def _perform_file_upload(
         self,
         path: str,
@@ -689,138 +1294,155 @@ class CaseImporter:
         file_type: typing.Type,
         api_create_func: typing.Callable,
     ) -> typing.Any:
-        """Perform file upload through the API."""
-        md5 = self._load_md5(path + ".md5")
-        for file_obj in api_list_func(
-            server_url=self.common_options.varfish_server_url,
-            api_token=self.common_options.varfish_api_token.get_secret_value(),
-            **{func_uuid_arg: uuid_value},
-            verify_ssl=self.common_options.verify_ssl,
-        ):
-            if file_obj.md5 == md5:
-                logger.debug("- found %s with md5 %s", obj_type, md5)
-                return md5
-        else:  # found no match
-            logger.info("- uploading %s %s", obj_type, path)
-            with open(path, "rb") as handle:
-                api_create_func(
-                    server_url=self.common_options.varfish_server_url,
-                    api_token=self.common_options.varfish_api_token.get_secret_value(),
-                    **{func_uuid_arg: uuid_value},
-                    data=file_type(name=os.path.basename(path), md5=md5),
-                    files={"file": handle},
-                    verify_ssl=self.common_options.verify_ssl,
-                )
-                return md5
-
-    def _upload_files(self, case_import_info: models.CaseImportInfo):
-        """Upload files where necessary."""
-        # First, BAM QC files.
-        good_md5s = [
-            self._perform_file_upload(
-                path=path.path,
-                api_list_func=api.bam_qc_file_list,
-                func_uuid_arg="case_import_info_uuid",
-                uuid_value=case_import_info.sodar_uuid,
-                obj_type="BAM QC file",
-                file_type=BamQcFile,
-                api_create_func=api.bam_qc_file_upload,
-            )
-            for path in self.paths_bam_qc
-        ]
-        # Then gene annotations
-        good_md5s += [
-            self._perform_file_upload(
-                path=path.path,
-                api_list_func=api.case_gene_annotation_file_list,
-                func_uuid_arg="case_import_info_uuid",
-                uuid_value=case_import_info.sodar_uuid,
-                obj_type="Gene Annotation",
-                file_type=CaseGeneAnnotationFile,
-                api_create_func=api.case_gene_annotation_file_upload,
-            )
-            for path in self.paths_case_gene_annotations
-        ]
-
-        if self.paths_genotype:
-            logger.info("- create new small variant set if necessary")
-            variant_set_import_info = self._create_variant_set_import_info(
-                case_import_info, CaseVariantType.SMALL
-            )
-            good_md5s += [
-                self._perform_file_upload(
-                    path=path.path,
-                    api_list_func=api.genotype_file_list,
-                    func_uuid_arg="variant_set_import_info_uuid",
-                    uuid_value=variant_set_import_info.sodar_uuid,
-                    obj_type="genotype file",
-                    file_type=GenotypeFile,
-                    api_create_func=api.genotype_file_upload,
-                )
-                for path in self.paths_genotype
-            ]
-            good_md5s += [
-                self._perform_file_upload(
-                    path=path.path,
-                    api_list_func=api.db_info_file_list,
-                    func_uuid_arg="variant_set_import_info_uuid",
-                    uuid_value=variant_set_import_info.sodar_uuid,
-                    obj_type="db info file",
-                    file_type=DatabaseInfoFile,
-                    api_create_func=api.db_info_file_upload,
-                )
-                for path in self.paths_database_info
-            ]
-            api.variant_set_import_info_update(
+        """Perform file upload through the API unless a file with the same md5 exists."""
+        md5 = self._file_md5(path)
+        size = os.path.getsize(path)
+        if md5 in self.remote_files.files(api_list_func, func_uuid_arg, uuid_value):
+            logger.debug("- found %s with md5 %s", obj_type, md5)
+            self.stats.record_skip(size)
+            if self.progress_bar is not None:
+                self.progress_bar.update(size)
+            return md5
+        logger.info("- uploading %s %s", obj_type, path)
+        with open(path, "rb") as handle, tqdm.tqdm(
+            desc=os.path.basename(path),
+            total=size,
+            unit="B",
+            unit_scale=True,
+            unit_divisor=1024,
+            leave=False,
+            disable=None,  # only on terminals
+        ) as file_bar:
+
+            def progress(count: int):
+                file_bar.update(count)
+                if self.progress_bar is not None:
+                    self.progress_bar.update(count)
+
+            # verify the MD5 sum while uploading such that the file is read only once
+            file_obj = api_create_func(
                 server_url=self.common_options.varfish_server_url,
                 api_token=self.common_options.varfish_api_token.get_secret_value(),
-                case_import_info_uuid=case_import_info.sodar_uuid,
-                variant_set_import_info_uuid=variant_set_import_info.sodar_uuid,
-                data=variant_set_import_info.model_copy(
-                    update={"state": VariantSetImportState.UPLOADED}
-                ),
+                **{func_uuid_arg: uuid_value},
+                data=file_type(name=os.path.basename(path), md5=md5),
+                files={"file": HashingReader(handle, expected_md5=md5, callback=progress)},
                 verify_ssl=self.common_options.verify_ssl,
+                client=self.common_options.client,
+                journal=self.upload_journal,
             )
+        self.stats.record_upload(size)
+        self.remote_files.add(api_list_func, uuid_value, file_obj)
+        return md5
 
-        if self.paths_genotype_sv:
-            logger.info("- create new structural variant set if necessary")
-            variant_set_import_info = self._create_variant_set_import_info(
-                case_import_info, CaseVariantType.STRUCTURAL
+    def _upload_files(self, case_import_info: models.CaseImportInfo):
+        """Upload files where necessary.
+
+        The files are uploaded concurrently with ``options.jobs`` workers or in the shared
+        ``executor``.  Each variant set is marked as uploaded only after all of its files
+        have been uploaded.
+        """
+        if self.progress_bar is not None:
+            paths = chain(
+                self.paths_bam_qc,
+                self.paths_case_gene_annotations,
+                self.paths_genotype,
+                self.paths_database_info,
+                self.paths_genotype_sv,
+                self.paths_database_info_sv,
             )
-            good_md5s += [
-                self._perform_file_upload(
+            size = sum(os.path.getsize(path.path) for path in paths)
+            with self.progress_bar.get_lock():
+                self.progress_bar.total += size
+            self.progress_bar.refresh()
+        with self._pool() as executor:
+            # First, BAM QC files.
+            case_uploads = [
+                executor.submit(
+                    self._perform_file_upload,
                     path=path.path,
-                    api_list_func=api.genotype_file_list,
-                    func_uuid_arg="variant_set_import_info_uuid",
-                    uuid_value=variant_set_import_info.sodar_uuid,
-                    obj_type="genotype file",
-                    file_type=GenotypeFile,
-                    api_create_func=api.genotype_file_upload,
+                    api_list_func=api.bam_qc_file_list,
+                    func_uuid_arg="case_import_info_uuid",
+                    uuid_value=case_import_info.sodar_uuid,
+                    obj_type="BAM QC file",
+                    file_type=BamQcFile,
+                    api_create_func=api.bam_qc_file_upload,
                 )
-                for path in self.paths_genotype_sv
+                for path in self.paths_bam_qc
             ]
-            good_md5s += [
-                self._perform_file_upload(
+            # Then gene annotations
+            case_uploads += [
+                executor.submit(
+                    self._perform_file_upload,
                     path=path.path,
-                    api_list_func=api.db_info_file_list,
-                    func_uuid_arg="variant_set_import_info_uuid",
-                    uuid_value=variant_set_import_info.sodar_uuid,
-                    obj_type="db info file",
-                    file_type=DatabaseInfoFile,
-                    api_create_func=api.db_info_file_upload,
+                    api_list_func=api.case_gene_annotation_file_list,
+                    func_uuid_arg="case_import_info_uuid",
+                    uuid_value=case_import_info.sodar_uuid,
+                    obj_type="Gene Annotation",
+                    file_type=CaseGeneAnnotationFile,
+                    api_create_func=api.case_gene_annotation_file_upload,
                 )
-                for path in self.paths_database_info_sv
+                for path in self.paths_case_gene_annotations
             ]
-            api.variant_set_import_info_update(
-                server_url=self.common_options.varfish_server_url,
-                api_token=self.common_options.varfish_api_token.get_secret_value(),
-                case_import_info_uuid=case_import_info.sodar_uuid,
-                variant_set_import_info_uuid=variant_set_import_info.sodar_uuid,
-                data=variant_set_import_info.model_copy(
-                    update={"state": VariantSetImportState.UPLOADED}
+
+            # Then the genotype and db info files of the small and structural variant sets.
+            variant_set_uploads = []
+            for variant_type, paths_genotype, paths_database_info, label in (
+                (CaseVariantType.SMALL, self.paths_genotype, self.paths_database_info, "small"),
+                (
+                    CaseVariantType.STRUCTURAL,
+                    self.paths_genotype_sv,
+                    self.paths_database_info_sv,
+                    "structural",
                 ),
-                verify_ssl=self.common_options.verify_ssl,
-            )
+            ):
+                if not paths_genotype:
+                    continue
+                logger.info("- create new %s variant set if necessary", label)
+                variant_set_import_info = self._create_variant_set_import_info(
+                    case_import_info, variant_type
+                )
+                uploads = [
+                    executor.submit(
+                        self._perform_file_upload,
+                        path=path.path,
+                        api_list_func=api.genotype_file_list,
+                        func_uuid_arg="variant_set_import_info_uuid",
+                        uuid_value=variant_set_import_info.sodar_uuid,
+                        obj_type="genotype file",
+                        file_type=GenotypeFile,
+                        api_create_func=api.genotype_file_upload,
+                    )
+                    for path in paths_genotype
+                ]
+                uploads += [
+                    executor.submit(
+                        self._perform_file_upload,
+                        path=path.path,
+                        api_list_func=api.db_info_file_list,
+                        func_uuid_arg="variant_set_import_info_uuid",
+                        uuid_value=variant_set_import_info.sodar_uuid,
+                        obj_type="db info file",
+                        file_type=DatabaseInfoFile,
+                        api_create_func=api.db_info_file_upload,
+                    )
+                    for path in paths_database_info
+                ]
+                variant_set_uploads.append((variant_set_import_info, uploads))
+
+            good_md5s = [future.result() for future in case_uploads]
+            for variant_set_import_info, uploads in variant_set_uploads:
+                good_md5s += [future.result() for future in uploads]
+                api.variant_set_import_info_update(
+                    server_url=self.common_options.varfish_server_url,
+                    api_token=self.common_options.varfish_api_token.get_secret_value(),
+                    case_import_info_uuid=case_import_info.sodar_uuid,
+                    variant_set_import_info_uuid=variant_set_import_info.sodar_uuid,
+                    data=variant_set_import_info.model_copy(
+                        update={"state": VariantSetImportState.UPLOADED}
+                    ),
+                    verify_ssl=self.common_options.verify_ssl,
+                    client=self.common_options.client,
+                )
 
         return good_md5s
 
@@ -828,13 +1450,52 @@ class CaseImporter:
         self, case_import_info: models.CaseImportInfo, variant_type: CaseVariantType
     ):
         """Create variant set import info necessary."""
+        action, variant_set_info = self._find_variant_set_import_info(
+            case_import_info, variant_type
+        )
+        if action == "update":
+            logger.info("Updating state existing variant set draft info: %s", variant_set_info)
+            api.variant_set_import_info_update(
+                server_url=self.common_options.varfish_server_url,
+                api_token=self.common_options.varfish_api_token.get_secret_value(),
+                case_import_info_uuid=case_import_info.sodar_uuid,
+                variant_set_import_info_uuid=variant_set_info.sodar_uuid,
+                data=variant_set_info,
+                verify_ssl=self.common_options.verify_ssl,
+                client=self.common_options.client,
+            )
+        elif action == "create":
+            variant_set_info = api.variant_set_import_info_create(
+                server_url=self.common_options.varfish_server_url,
+                api_token=self.common_options.varfish_api_token.get_secret_value(),
+                case_import_info_uuid=case_import_info.sodar_uuid,
+                data=variant_set_info,
+                verify_ssl=self.common_options.verify_ssl,
+                client=self.common_options.client,
+            )
+        return variant_set_info
 
-        for variant_set_info in api.variant_set_import_info_list(
-            server_url=self.common_options.varfish_server_url,
-            api_token=self.common_options.varfish_api_token.get_secret_value(),
-            case_import_info_uuid=case_import_info.sodar_uuid,
-            verify_ssl=self.common_options.verify_ssl,
-        ):
+    def _find_variant_set_import_info(
+        self,
+        case_import_info: models.CaseImportInfo,
+        variant_type: CaseVariantType,
+        variant_set_infos: typing.Optional[typing.List[models.VariantSetImportInfo]] = None,
+    ) -> typing.Tuple[str, models.VariantSetImportInfo]:
+        """Find the variant set import info to use, without changing anything.
+
+        :param variant_set_infos: the variant set import infos of the case, listed if ``None``
+        :returns: pair of action (``"create"``, ``"update"``, or ``"reuse"``) and the variant
+            set import info, not yet saved for ``"create"``
+        """
+        if variant_set_infos is None:
+            variant_set_infos = api.variant_set_import_info_list(
+                server_url=self.common_options.varfish_server_url,
+                api_token=self.common_options.varfish_api_token.get_secret_value(),
+                case_import_info_uuid=case_import_info.sodar_uuid,
+                verify_ssl=self.common_options.verify_ssl,
+                client=self.common_options.client,
+            )
+        for variant_set_info in variant_set_infos:
             if not variant_set_info.variant_type == variant_type:
                 continue
             if self.options.resubmit and variant_set_info.state in (
@@ -843,39 +1504,23 @@ class CaseImporter:
                 VariantSetImportState.FAILED,
             ):
                 logger.info("Variant set is submitted and --resubmit given, marking as draft.")
-                variant_set_info = variant_set_info.model_copy(
+                return "update", variant_set_info.model_copy(
                     update={
                         "genomebuild": GenomeBuild(self.options.genomebuild),
                         "state": VariantSetImportState.DRAFT,
                     }
                 )
-                logger.info("Updating state existing variant set draft info: %s", variant_set_info)
-                api.variant_set_import_info_update(
-                    server_url=self.common_options.varfish_server_url,
-                    api_token=self.common_options.varfish_api_token.get_secret_value(),
-                    case_import_info_uuid=case_import_info.sodar_uuid,
-                    variant_set_import_info_uuid=variant_set_info.sodar_uuid,
-                    data=variant_set_info,
-                    verify_ssl=self.common_options.verify_ssl,
-                )
-                return variant_set_info
             elif (
                 variant_set_info.state == VariantSetImportState.DRAFT
                 and not self.options.force_fresh
             ):
                 logger.info("Found existing variant_set draft info: %s", variant_set_info)
-                return variant_set_info
-        else:  # found no match
-            return api.variant_set_import_info_create(
-                server_url=self.common_options.varfish_server_url,
-                api_token=self.common_options.varfish_api_token.get_secret_value(),
-                case_import_info_uuid=case_import_info.sodar_uuid,
-                data=models.VariantSetImportInfo(
-                    genomebuild=GenomeBuild(self.options.genomebuild),
-                    variant_type=variant_type,
-                ),
-                verify_ssl=self.common_options.verify_ssl,
-            )
+                return "reuse", variant_set_info
+        # else: found no match
+        return "create", models.VariantSetImportInfo(
+            genomebuild=GenomeBuild(self.options.genomebuild),
+            variant_type=variant_type,
+        )
 
     def _submit_import(self, case_import_info: models.CaseImportInfo):
         """Submit the case import."""
@@ -886,4 +1531,5 @@ class CaseImporter:
             case_import_info_uuid=case_import_info.sodar_uuid,
             data=case_import_info.model_copy(update={"state": CaseImportState.SUBMITTED}),
             verify_ssl=self.common_options.verify_ssl,
+            client=self.common_options.client,
         )
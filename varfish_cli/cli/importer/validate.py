@@ -0,0 +1,381 @@
+"""Streaming validation of genotype TSV files before their import.
+
+The files are checked row by row for the number of columns, the genome ``release``, and
+the samples in the ``genotype`` column.  Files are split into chunks that are validated in
+separate processes.  Bgzipped files are split at bgzip block boundaries, plain text files
+at arbitrary offsets, and other gzipped files are validated as a whole.
+"""
+
+import concurrent.futures
+import gzip
+from itertools import islice
+import os
+import time
+import typing
+import zlib
+
+from logzero import logger
+import pydantic
+from tabulate import tabulate
+
+from varfish_cli.api import GenomeBuild
+from varfish_cli.cli.importer.create import (
+    EXPECTED_GTS,
+    EXPECTED_GTS_SV,
+    EXPECTED_GTS_SV_OLD,
+    FileProbe,
+)
+from varfish_cli.parse_gts import BATCH_SIZE, decode_genotypes
+from varfish_cli.parse_ped import parse_ped
+
+#: Default size of the chunks of the files to validate in one process.
+DEFAULT_CHUNK_SIZE = 16 * 1024 * 1024
+
+#: Maximal number of error messages to keep per chunk.
+MAX_ERRORS = 10
+
+#: Size of reads from plain text and gzip files.
+READ_SIZE = 1024 * 1024
+
+#: Start of the header of a bgzip block, followed by MTIME, XFL, OS, and XLEN.
+BGZF_MAGIC = b"\x1f\x8b\x08\x04"
+
+#: The ``BC`` subfield of the extra field in the header of bgzip blocks.
+BGZF_SUBFIELD = b"BC\x02\x00"
+
+#: Length of the header of a bgzip block including ``BSIZE``.
+BGZF_HEADER_SIZE = 18
+
+
+class ChunkTask(pydantic.BaseModel):
+    """A chunk of a file to validate in a worker process."""
+
+    #: Path to the file.
+    path: str
+    #: One of ``"plain"``, ``"gzip"``, or ``"bgzip"``.
+    compression: str
+    #: Offset of the chunk in the (compressed) file.
+    start: int
+    #: Offset of the end of the chunk in the (compressed) file.
+    end: int
+    #: Number of columns of each row.
+    num_columns: int
+    #: Index of the ``release`` column.
+    release_column: int
+    #: Index of the ``genotype`` column.
+    genotype_column: int
+    #: Expected genome release.
+    release: str
+    #: Expected samples in the ``genotype`` column, ``None`` to skip the check.
+    samples: typing.Optional[typing.List[str]] = None
+
+
+class ChunkResult(pydantic.BaseModel):
+    """Outcome of validating one chunk."""
+
+    #: Number of rows in the chunk.
+    rows: int = 0
+    #: Number of invalid rows.
+    error_count: int = 0
+    #: Pairs of row index in the chunk and error message, at most ``MAX_ERRORS``.
+    errors: typing.List[typing.Tuple[int, str]] = []
+
+
+class FileValidationResult(pydantic.BaseModel):
+    """Outcome of validating one file."""
+
+    #: Path to the file.
+    path: str
+    #: Number of data rows.
+    rows: int = 0
+    #: Number of errors.
+    error_count: int = 0
+    #: The first error messages with line numbers.
+    errors: typing.List[str] = []
+
+    @property
+    def ok(self) -> bool:
+        return not self.error_count
+
+
+def detect_compression(path: str) -> str:
+    """Return ``"bgzip"``, ``"gzip"``, or ``"plain"`` for the file at ``path``."""
+    with open(path, "rb") as inputf:
+        header = inputf.read(BGZF_HEADER_SIZE)
+    if header.startswith(BGZF_MAGIC) and header[12:16] == BGZF_SUBFIELD:
+        return "bgzip"
+    elif header.startswith(b"\x1f\x8b"):
+        return "gzip"
+    else:
+        return "plain"
+
+
+def _read_bgzf_block(inputf: typing.BinaryIO) -> typing.Optional[bytes]:
+    """Read and decompress the bgzip block at the current offset, ``None`` at EOF."""
+    header = inputf.read(BGZF_HEADER_SIZE)
+    if len(header) < BGZF_HEADER_SIZE:
+        return None
+    if not header.startswith(BGZF_MAGIC) or header[12:16] != BGZF_SUBFIELD:
+        raise zlib.error("no bgzip block at offset %d" % (inputf.tell() - len(header)))
+    block_size = int.from_bytes(header[16:18], "little") + 1
+    return zlib.decompress(header + inputf.read(block_size - BGZF_HEADER_SIZE), 31)
+
+
+def _find_bgzf_block(inputf: typing.BinaryIO, offset: int, size: int) -> int:
+    """Return the offset of the first bgzip block at or after ``offset``, ``size`` if none."""
+    while offset < size:
+        inputf.seek(offset)
+        window = inputf.read(READ_SIZE + BGZF_HEADER_SIZE)
+        pos = window.find(BGZF_MAGIC)
+        while pos != -1:
+            inputf.seek(offset + pos)
+            try:
+                _read_bgzf_block(inputf)
+                return offset + pos
+            except zlib.error:
+                pos = window.find(BGZF_MAGIC, pos + 1)
+        offset += READ_SIZE
+    return size
+
+
+def split_file(path: str, compression: str, chunk_size: int) -> typing.List[typing.Tuple[int, int]]:
+    """Split the file at ``path`` into chunks of about ``chunk_size`` bytes.
+
+    Bgzipped files are split at block boundaries and other gzipped files are not split.
+    """
+    size = os.path.getsize(path)
+    if compression == "gzip" or size <= chunk_size:
+        return [(0, size)]
+    starts = list(range(0, size, chunk_size))
+    if compression == "bgzip":
+        with open(path, "rb") as inputf:
+            starts = [0] + [_find_bgzf_block(inputf, start, size) for start in starts[1:]]
+        starts = sorted(set(start for start in starts if start < size))
+    return list(zip(starts, starts[1:] + [size]))
+
+
+def _iter_blocks(
+    inputf: typing.BinaryIO, compression: str, end: int
+) -> typing.Iterator[typing.Tuple[bytes, bool]]:
+    """Yield pairs of decompressed data and whether it starts before ``end``."""
+    if compression == "gzip":
+        with gzip.GzipFile(fileobj=inputf) as gzipf:
+            while data := gzipf.read(READ_SIZE):
+                yield data, True
+    elif compression == "bgzip":
+        while True:
+            offset = inputf.tell()
+            data = _read_bgzf_block(inputf)
+            if data is None:
+                return
+            yield data, offset < end
+    else:
+        while True:
+            offset = inputf.tell()
+            size = min(READ_SIZE, end - offset) if offset < end else READ_SIZE
+            data = inputf.read(size)
+            if not data:
+                return
+            yield data, offset < end
+
+
+def iter_chunk_lines(path: str, compression: str, start: int, end: int) -> typing.Iterator[str]:
+    """Yield the lines of a chunk, without the header or a line started in the chunk before.
+
+    A chunk owns the lines that start after its first uncompressed byte and not after its
+    last.  The last line is read to its end from the following chunk.
+    """
+    with open(path, "rb") as inputf:
+        inputf.seek(start)
+        limit = None  # uncompressed length of the chunk, once known
+        total = 0  # uncompressed bytes read
+        pos = 0  # start of the next line
+        first = True
+        carry = b""
+        for data, in_chunk in _iter_blocks(inputf, compression, end):
+            if not in_chunk and limit is None:
+                limit = total
+            total += len(data)
+            lines = (carry + data).split(b"\n")
+            carry = lines.pop()
+            for line in lines:
+                line_start, pos = pos, pos + len(line) + 1
+                if limit is not None and line_start > limit:
+                    return
+                if not first:
+                    yield line.decode("utf-8").rstrip("\r")
+                first = False
+            if limit is not None and pos > limit:
+                return
+        if carry and not first and (limit is None or pos <= limit):
+            yield carry.decode("utf-8").rstrip("\r")
+
+
+def _check_batch(task: ChunkTask, lines: typing.List[str], result: ChunkResult):
+    """Validate a batch of rows and add them to ``result``."""
+    messages: typing.Dict[int, str] = {}
+    genotypes: typing.List[typing.Tuple[int, str]] = []
+    for no, line in enumerate(lines, result.rows):
+        values = line.split("\t")
+        if len(values) != task.num_columns:
+            messages[no] = "expected %d columns but found %d" % (task.num_columns, len(values))
+        elif values[task.release_column] != task.release:
+            messages[no] = "expected release %s but found %s" % (
+                task.release,
+                values[task.release_column],
+            )
+        elif task.samples is not None:
+            genotypes.append((no, values[task.genotype_column]))
+
+    if genotypes:
+        try:
+            decoded = decode_genotypes([value for _, value in genotypes], fields=())
+        except ValueError:  # find the invalid values one by one
+            decoded = [_decode_genotype(value) for _, value in genotypes]
+        samples = set(task.samples)
+        for (no, _), gts in zip(genotypes, decoded):
+            if gts is None:
+                messages[no] = "invalid JSON in genotype column"
+            elif gts.keys() != samples:
+                messages[no] = "samples in genotype column %s do not match %s" % (
+                    sorted(gts.keys()),
+                    task.samples,
+                )
+
+    result.rows += len(lines)
+    result.error_count += len(messages)
+    for no in sorted(messages)[: MAX_ERRORS - len(result.errors)]:
+        result.errors.append((no, messages[no]))
+
+
+def _decode_genotype(value: str) -> typing.Optional[typing.Dict[str, typing.Any]]:
+    try:
+        return decode_genotypes([value], fields=())[0]
+    except ValueError:
+        return None
+
+
+def validate_chunk(task: ChunkTask) -> ChunkResult:
+    """Validate the rows of one chunk of a file in batches."""
+    result = ChunkResult()
+    lines = iter_chunk_lines(task.path, task.compression, task.start, task.end)
+    while batch := list(islice(lines, BATCH_SIZE)):
+        _check_batch(task, batch, result)
+    return result
+
+
+class FileValidator:
+    """Validation of genotype TSV files with a pool of worker processes."""
+
+    def __init__(
+        self,
+        paths: typing.List[str],
+        genomebuild: GenomeBuild,
+        paths_ped: typing.Optional[typing.List[str]] = None,
+        jobs: typing.Optional[int] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ):
+        #: Paths to the genotype files to validate.
+        self.paths = paths
+        #: Expected genome build.
+        self.genomebuild = genomebuild
+        #: Paths to the PED files to check the samples against, each genotype file is
+        #: checked against the one sharing the most samples with it.
+        self.paths_ped = paths_ped or []
+        #: Number of worker processes, defaults to the number of CPUs.
+        self.jobs = jobs or os.cpu_count()
+        #: Size of the chunks of the files in bytes.
+        self.chunk_size = chunk_size
+        #: Number of rows validated per second in the last run.
+        self.rows_per_second = 0.0
+
+    def _ped_samples(self) -> typing.List[typing.Set[str]]:
+        result = []
+        for path_ped in self.paths_ped:
+            opener = gzip.open if path_ped.endswith(".gz") else open
+            with opener(path_ped, "rt") as inputf:
+                result.append({donor.name for donor in parse_ped(inputf)})
+        return result
+
+    def _tasks(
+        self, path: str, ped_samples: typing.List[typing.Set[str]]
+    ) -> typing.Tuple[typing.List[ChunkTask], typing.List[str]]:
+        """Return the chunks of the file at ``path`` and problems with its header."""
+        probe = FileProbe(path)
+        if probe.header not in (EXPECTED_GTS, EXPECTED_GTS_SV, EXPECTED_GTS_SV_OLD):
+            return [], ["line 1: not a genotype file header"]
+        errors = []
+        samples = probe.sample_keys
+        if samples is not None and ped_samples:
+            family = max(ped_samples, key=lambda names: len(samples & names))
+            if samples - family:
+                errors.append(
+                    "line 2: samples %s are not in the PED file" % sorted(samples - family)
+                )
+        compression = detect_compression(path)
+        tasks = [
+            ChunkTask(
+                path=path,
+                compression=compression,
+                start=start,
+                end=end,
+                num_columns=len(probe.header),
+                release_column=probe.header.index("release"),
+                genotype_column=probe.header.index("genotype"),
+                release=self.genomebuild.value,
+                samples=None if samples is None else sorted(samples),
+            )
+            for start, end in split_file(path, compression, self.chunk_size)
+        ]
+        return tasks, errors
+
+    def run(self) -> typing.List[FileValidationResult]:
+        """Validate all files and return the results in the order of ``paths``."""
+        started = time.monotonic()
+        ped_samples = self._ped_samples()
+        results = []
+        with concurrent.futures.ProcessPoolExecutor(max_workers=self.jobs) as executor:
+            file_futures = []
+            for path in self.paths:
+                tasks, errors = self._tasks(path, ped_samples)
+                file_futures.append(
+                    (path, errors, [executor.submit(validate_chunk, t) for t in tasks])
+                )
+            for path, errors, futures in file_futures:
+                result = FileValidationResult(path=path, error_count=len(errors), errors=errors)
+                for future in futures:
+                    chunk_result = future.result()
+                    result.errors += [
+                        "line %d: %s" % (result.rows + no + 2, message)
+                        for no, message in chunk_result.errors
+                    ]
+                    result.rows += chunk_result.rows
+                    result.error_count += chunk_result.error_count
+                results.append(result)
+        seconds = time.monotonic() - started
+        rows = sum(result.rows for result in results)
+        self.rows_per_second = rows / seconds if seconds else 0.0
+        logger.info(
+            "Validated %d rows of %d files in %.1f s (%.0f rows/s)",
+            rows,
+            len(results),
+            seconds,
+            self.rows_per_second,
+        )
+        for result in results:
+            for message in result.errors:
+                logger.error("%s: %s", result.path, message)
+        return results
+
+
+def format_results(results: typing.List[FileValidationResult], rows_per_second: float) -> str:
+    """Format validation results as a table with totals."""
+    rows = [[os.path.basename(result.path), result.rows, result.error_count] for result in results]
+    rows.append(
+        [
+            "total (%.0f rows/s)" % rows_per_second,
+            sum(result.rows for result in results),
+            sum(result.error_count for result in results),
+        ]
+    )
+    return tabulate(rows, headers=["file", "rows", "errors"], tablefmt="grid")
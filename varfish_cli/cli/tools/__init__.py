@@ -4,12 +4,17 @@ import csv
 import fnmatch
 import gzip
 import json
-from typing import Annotated, Dict, List
+from typing import Annotated, Dict, List, Optional
 
 from logzero import logger
 import typer
 
 from varfish_cli.cli.tools.models import BamQc, BamQcData
+from varfish_cli.cli.tools.recompress import (
+    DEFAULT_LEVEL,
+    format_results,
+    recompress_files,
+)
 from varfish_cli.config import CommonOptions
 from varfish_cli.parse_ped import parse_ped
 
@@ -221,3 +226,35 @@ def dragen_to_bam_qc(
     logger.debug("... done writing output file.")
 
     logger.info("All done. Have a nice day! 😊")
+
+
+@app.command("recompress")
+def recompress(
+    ctx: typer.Context,
+    paths: Annotated[
+        List[str],
+        typer.Argument(
+            ...,
+            help="Path(s) to gzipped gts, db-infos, and bam-qc TSV files, directories, "
+            "or glob patterns",
+        ),
+    ],
+    level: Annotated[
+        int, typer.Option("--level", min=1, max=9, help="The gzip compression level")
+    ] = DEFAULT_LEVEL,
+    jobs: Annotated[
+        Optional[int],
+        typer.Option(
+            "--jobs", "-j", min=1, help="Number of threads to use, defaults to number of CPUs"
+        ),
+    ] = None,
+):
+    """Recompress import files in place with a higher gzip level and write ``.md5`` files.
+
+    Files that do not get smaller and files compressed with ``bgzip`` are kept as they are.
+    """
+    common_options: CommonOptions = ctx.obj
+    _ = common_options
+    results = recompress_files(paths, level=level, jobs=jobs)
+    print(format_results(results))
+    logger.info("All done. Have a nice day! 😊")
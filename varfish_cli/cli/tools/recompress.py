@@ -0,0 +1,224 @@
+"""Recompression of import files with a higher gzip compression level.
+
+The files are compressed in blocks on multiple threads like ``pigz`` does.  Each block is
+deflated with the end of the previous block as dictionary and ends with a sync flush, so
+the concatenated blocks form one ordinary gzip member that any gzip reader accepts.
+Files compressed with ``bgzip`` are skipped as this would lose their block structure.
+"""
+
+import collections
+import concurrent.futures
+import gzip
+import hashlib
+import os
+import typing
+import zlib
+
+from logzero import logger
+import pydantic
+from tabulate import tabulate
+
+from varfish_cli.cli.importer.create import (
+    FileType,
+    FileTypeGuesser,
+    expand_paths,
+    pair_md5_sidecars,
+)
+from varfish_cli.cli.importer.validate import detect_compression
+from varfish_cli.hashing import compute_md5
+
+#: Size of the uncompressed blocks that are compressed in parallel.
+DEFAULT_BLOCK_SIZE = 1024 * 1024
+
+#: Default compression level.
+DEFAULT_LEVEL = 9
+
+#: Size of the chunks read when checking the recompressed data.
+CHECK_CHUNK_SIZE = 1024 * 1024
+
+#: Size of the deflate window, the end of the previous block used as dictionary.
+WINDOW_SIZE = 32 * 1024
+
+#: Types of the files to recompress.
+RECOMPRESS_FILE_TYPES = (
+    FileType.GTS,
+    FileType.GTS_SV,
+    FileType.DB_INFOS,
+    FileType.BAM_QC,
+)
+
+
+class RecompressResult(pydantic.BaseModel):
+    """Outcome of recompressing one file."""
+
+    #: Path to the file.
+    path: str
+    #: Size of the file before in bytes.
+    size_before: int
+    #: Size of the file after in bytes.
+    size_after: int
+    #: Whether the recompressed data decompressed to the original data.
+    verified: bool = True
+
+    @property
+    def replaced(self) -> bool:
+        return self.verified and self.size_after < self.size_before
+
+
+class _HashingReader:
+    """Binary file wrapper that computes the MD5 sum of the data read."""
+
+    def __init__(self, inputf: typing.BinaryIO):
+        self.inputf = inputf
+        self.md5 = hashlib.md5()
+
+    def read(self, size: int = -1) -> bytes:
+        data = self.inputf.read(size)
+        self.md5.update(data)
+        return data
+
+
+def _content_md5(path: str) -> str:
+    """Return the MD5 sum of the decompressed data of the gzip file at ``path``."""
+    md5 = hashlib.md5()
+    with gzip.open(path, "rb") as inputf:
+        for chunk in iter(lambda: inputf.read(CHECK_CHUNK_SIZE), b""):
+            md5.update(chunk)
+    return md5.hexdigest()
+
+
+def _deflate_block(data: bytes, dictionary: bytes, level: int, last: bool) -> bytes:
+    """Deflate ``data`` as part of a larger stream, finishing the stream if ``last``."""
+    args = (level, zlib.DEFLATED, -zlib.MAX_WBITS, 9, zlib.Z_DEFAULT_STRATEGY)
+    compressor = zlib.compressobj(*args, dictionary) if dictionary else zlib.compressobj(*args)
+    return compressor.compress(data) + compressor.flush(
+        zlib.Z_FINISH if last else zlib.Z_SYNC_FLUSH
+    )
+
+
+def compress_parallel(
+    inputf: typing.BinaryIO,
+    outputf: typing.BinaryIO,
+    executor: concurrent.futures.Executor,
+    level: int = DEFAULT_LEVEL,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+    max_in_flight: int = 8,
+) -> str:
+    """Write the data of ``inputf`` gzip-compressed to ``outputf`` and return its MD5 sum.
+
+    Blocks are deflated on ``executor`` with at most ``max_in_flight`` blocks in memory.
+    """
+    md5 = hashlib.md5()
+
+    def write(data: bytes):
+        outputf.write(data)
+        md5.update(data)
+
+    write(b"\x1f\x8b\x08\x00\x00\x00\x00\x00" + (b"\x02" if level == 9 else b"\x00") + b"\xff")
+    crc = 0
+    size = 0
+    pending: typing.Deque[concurrent.futures.Future] = collections.deque()
+    block = inputf.read(block_size)
+    dictionary = b""
+    while True:
+        next_block = inputf.read(block_size) if block else b""
+        crc = zlib.crc32(block, crc)
+        size += len(block)
+        last = not next_block
+        pending.append(executor.submit(_deflate_block, block, dictionary, level, last))
+        while len(pending) > max_in_flight or (last and pending):
+            write(pending.popleft().result())
+        if last:
+            break
+        dictionary = block[-WINDOW_SIZE:]
+        block = next_block
+    write(crc.to_bytes(4, "little") + (size & 0xFFFFFFFF).to_bytes(4, "little"))
+    return md5.hexdigest()
+
+
+def recompress_file(
+    path: str,
+    executor: concurrent.futures.Executor,
+    level: int = DEFAULT_LEVEL,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+    max_in_flight: int = 8,
+) -> RecompressResult:
+    """Recompress the gzip file at ``path`` in place if it gets smaller and write ``.md5``.
+
+    The recompressed file only replaces the original one after checking that it decompresses
+    to the same data.
+    """
+    tmp_path = path + ".recompress.tmp"
+    try:
+        with gzip.open(path, "rb") as inputf, open(tmp_path, "wb") as outputf:
+            reader = _HashingReader(inputf)
+            md5 = compress_parallel(reader, outputf, executor, level, block_size, max_in_flight)
+        result = RecompressResult(
+            path=path, size_before=os.path.getsize(path), size_after=os.path.getsize(tmp_path)
+        )
+        if result.size_after < result.size_before:
+            result.verified = _content_md5(tmp_path) == reader.md5.hexdigest()
+        if result.replaced:
+            os.replace(tmp_path, path)
+        elif not result.verified:
+            logger.error("Keeping %s as the recompressed data differs from the original", path)
+            md5 = compute_md5(path)
+        else:
+            logger.info("Keeping %s as recompressing does not make it smaller", path)
+            md5 = compute_md5(path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    with open(path + ".md5", "wt") as outputf:
+        print("%s  %s" % (md5, os.path.basename(path)), file=outputf)
+    return result
+
+
+def recompress_files(
+    paths: typing.List[str],
+    level: int = DEFAULT_LEVEL,
+    jobs: typing.Optional[int] = None,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+) -> typing.List[RecompressResult]:
+    """Recompress the gzipped genotype, DB info, and BAM QC files in ``paths``.
+
+    Directories and glob patterns are expanded as for the import, other files and files
+    compressed with ``bgzip`` are skipped.
+    """
+    jobs = jobs or os.cpu_count()
+    guesser = FileTypeGuesser()
+    results = []
+    with concurrent.futures.ThreadPoolExecutor(max_workers=jobs) as executor:
+        for path in pair_md5_sidecars(expand_paths(paths))[0]:
+            if not path.endswith(".gz") or guesser.guess(path) not in RECOMPRESS_FILE_TYPES:
+                logger.debug("Skipping %s", path)
+                continue
+            elif detect_compression(path) != "gzip":
+                logger.info("Skipping %s as it is not plain gzip compressed", path)
+                continue
+            logger.info("Recompressing %s ...", path)
+            results.append(recompress_file(path, executor, level, block_size, 2 * jobs))
+    return results
+
+
+def format_results(results: typing.List[RecompressResult]) -> str:
+    """Format recompression results as a table with totals."""
+
+    def reduction(before: int, after: int) -> str:
+        return "%.1f%%" % (100.0 * (before - after) / before) if before else "-"
+
+    rows = [
+        [
+            os.path.basename(result.path),
+            result.size_before,
+            min(result.size_before, result.size_after),
+            reduction(result.size_before, min(result.size_before, result.size_after)),
+        ]
+        for result in results
+    ]
+    before = sum(row[1] for row in rows)
+    after = sum(row[2] for row in rows)
+    rows.append(["total", before, after, reduction(before, after)])
+    return tabulate(
+        rows, headers=["file", "bytes before", "bytes after", "reduction"], tablefmt="grid"
+    )
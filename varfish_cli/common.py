@@ -35,35 +35,48 @@ class OutputFormat(Enum):
 
 
 def write_output(
-    output: typing.List[typing.List[typing.Any]],
+    output: typing.Iterable[typing.List[typing.Any]],
     output_file: io.TextIOBase,
     output_format: OutputFormat,
     delimiter: str,
 ):
-    """Write output to ``output_file``"""
+    """Write output to ``output_file``
+
+    The first row of ``output`` is the header.  For CSV and JSON output, the rows
+    are written as they are generated, only table output needs all rows at once.
+    """
+    rows = iter(output)
+    header = next(rows)
     if output_format == OutputFormat.CSV:
         writer = csv.writer(output_file, delimiter=delimiter)
-        for row in output:
+        writer.writerow(header)
+        for row in rows:
             writer.writerow(row)
     elif output_format == OutputFormat.JSON:
-        header = output[0]
-        output_json = []
-        for obj in output[1:]:
-            output_json.append(dict(zip(header, obj)))
-        json.dump(output_json, output_file, cls=CustomEncoder, indent=2)
+        # Equivalent to ``json.dump(..., indent=2)`` of the whole list.
+        output_file.write("[")
+        no = -1
+        for no, obj in enumerate(rows):
+            obj_json = json.dumps(dict(zip(header, obj)), cls=CustomEncoder, indent=2)
+            output_file.write(",\n  " if no else "\n  ")
+            output_file.write(obj_json.replace("\n", "\n  "))
+        output_file.write("\n]" if no >= 0 else "]")
     else:
-        output_file.write(tabulate(output[1:], headers=output[0], tablefmt="grid"))
+        output_file.write(tabulate(list(rows), headers=header, tablefmt="grid"))
     output_file.write("\n")
     output_file.flush()
 
 
 def tabular_output(
-    values: typing.List[typing.Any],
+    values: typing.Iterable[typing.Any],
     header: typing.List[str],
     field_formatters: typing.Dict[str, typing.Callable[[typing.Any], str]] = {},
-) -> typing.List[typing.List[str]]:
-    """Convert list of values to list of strings for output."""
-    output = [header]
+) -> typing.Iterator[typing.List[typing.Any]]:
+    """Convert values to rows of strings for output, starting with the header.
+
+    Rows are generated lazily such that ``values`` may be a generator.
+    """
+    yield header
     for value in values:
         row = []
         for field in header:
@@ -72,8 +85,7 @@ def tabular_output(
             else:
                 the_value = getattr(value, field)
             row.append(the_value)
-        output.append(row)
-    return output
+        yield row
 
 
 def strip_trailing_slash(s: str) -> str:
@@ -13,8 +13,16 @@ import typing
 
 from logzero import logger
 import pydantic
+from requests.adapters import BaseAdapter
 import typer
 
+from varfish_cli.api.cache import CacheOptions, ResponseCache
+from varfish_cli.api.cassette import RecordingAdapter, ReplayAdapter
+from varfish_cli.api.client import DEFAULT_POOL_MAXSIZE, HttpOptions, VarfishClient
+from varfish_cli.api.ratelimit import RateLimitOptions, get_rate_limiter
+from varfish_cli.common import strip_trailing_slash
+from varfish_cli.exceptions import InvalidConfiguration
+
 
 class CommonOptions(pydantic.BaseModel):
     """Shared options for all subcommands."""
@@ -29,6 +37,78 @@ class CommonOptions(pydantic.BaseModel):
     varfish_server_url: typing.Optional[str] = None
     #: VarFish API token to use.
     varfish_api_token: typing.Optional[pydantic.SecretStr] = None
+    #: HTTP retry and timeout settings.
+    http_options: HttpOptions = HttpOptions()
+    #: Cache settings.
+    cache_options: CacheOptions = CacheOptions()
+    #: Rate limit settings for the server.
+    rate_limit_options: RateLimitOptions = RateLimitOptions()
+    #: Path to cassette file to record API exchanges to.
+    record_cassette: typing.Optional[str] = None
+    #: Path to cassette file to replay API exchanges from instead of contacting the server.
+    replay_cassette: typing.Optional[str] = None
+    #: Number of connections kept alive per host, see ``reserve_connections()``.
+    pool_maxsize: int = DEFAULT_POOL_MAXSIZE
+
+    #: HTTP client, constructed on first use and then shared by all API calls.
+    _client: typing.Optional[VarfishClient] = pydantic.PrivateAttr(default=None)
+
+    @property
+    def client(self) -> VarfishClient:
+        """Return the shared ``VarfishClient``, constructing it on first access."""
+        if self._client is None:
+            self._client = VarfishClient(
+                server_url=self.varfish_server_url,
+                api_token=self.varfish_api_token.get_secret_value(),
+                verify_ssl=self.verify_ssl,
+                pool_maxsize=self.pool_maxsize,
+                http_options=self.http_options,
+                cache=ResponseCache(self.cache_options) if self.cache_options.enabled else None,
+                rate_limiter=(
+                    get_rate_limiter(self.varfish_server_url, self.rate_limit_options)
+                    if self.rate_limit_options.enabled
+                    else None
+                ),
+                transport=self._transport(),
+            )
+        return self._client
+
+    def reserve_connections(self, count: int):
+        """Make the client keep at least ``count`` connections alive, e.g., for worker threads."""
+        self.pool_maxsize = max(self.pool_maxsize, count)
+        if self._client is not None:
+            self._client.reserve_connections(self.pool_maxsize)
+
+    def _transport(self) -> typing.Optional[BaseAdapter]:
+        """Return transport adapter for recording or replaying, if configured."""
+        if self.record_cassette and self.replay_cassette:
+            raise InvalidConfiguration("Cannot record and replay cassette at the same time")
+        elif self.record_cassette:
+            return RecordingAdapter(self.record_cassette)
+        elif self.replay_cassette:
+            return ReplayAdapter(self.replay_cassette)
+        else:
+            return None
+
+    def close(self):
+        """Close the client, if any, and log the transfer statistics."""
+        if self._client is not None:
+            logger.info("HTTP transfer: %s", self._client.stats.summary())
+            self._client.close()
+            self._client = None
+
+
+def _load_toml(config_path: str) -> typing.Dict[str, typing.Any]:
+    """Load configuration file, returning an empty ``dict`` if it does not exist."""
+    config_path = os.path.expanduser(os.path.expandvars(config_path))
+    if not os.path.exists(config_path):
+        return {}
+    with open(config_path, "rt") as tomlf:
+        try:
+            return tomllib.loads(tomlf.read())
+        except TOMLDecodeError as e:
+            logger.error("could not parse configuration file %s: %s", config_path, e)
+            raise typer.Exit(1)
 
 
 def load_config(config_path: str) -> typing.Tuple[typing.Optional[str], typing.Optional[str]]:
@@ -63,3 +143,36 @@ def load_config(config_path: str) -> typing.Tuple[typing.Optional[str], typing.O
                 logger.debug("global/varfish_api_token not set in %s", config_path)
 
     return toml_varfish_server_url, toml_varfish_api_token
+
+
+def load_http_options(config_path: str) -> HttpOptions:
+    """Load HTTP settings from the ``[http]`` section of the configuration file."""
+    try:
+        return HttpOptions(**_load_toml(config_path).get("http", {}))
+    except pydantic.ValidationError as e:
+        raise InvalidConfiguration(f"Invalid [http] section in {config_path}: {e}") from e
+
+
+def load_cache_options(config_path: str) -> CacheOptions:
+    """Load cache settings from the ``[cache]`` section of the configuration file."""
+    try:
+        return CacheOptions(**_load_toml(config_path).get("cache", {}))
+    except pydantic.ValidationError as e:
+        raise InvalidConfiguration(f"Invalid [cache] section in {config_path}: {e}") from e
+
+
+def load_rate_limit_options(config_path: str, server_url: str) -> RateLimitOptions:
+    """Load rate limit settings for ``server_url`` from the configuration file.
+
+    The settings in ``[rate_limit]`` apply to all servers and may be overridden for
+    a server in ``[rate_limit.servers."<server URL>"]``.
+    """
+    section = dict(_load_toml(config_path).get("rate_limit", {}))
+    servers = {
+        strip_trailing_slash(url): values for url, values in section.pop("servers", {}).items()
+    }
+    section.update(servers.get(strip_trailing_slash(server_url), {}))
+    try:
+        return RateLimitOptions(**section)
+    except pydantic.ValidationError as e:
+        raise InvalidConfiguration(f"Invalid [rate_limit] section in {config_path}: {e}") from e
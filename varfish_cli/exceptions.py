@@ -27,3 +27,7 @@ class InconsistentSamplesDataException(BaseException):
 
 class InconsistentGenomeBuild(BaseException):
     """Raised when genome builds are inconsistent."""
+
+
+class Md5Mismatch(BaseException):
+    """Raised when the MD5 sum of uploaded data does not match the expected one."""
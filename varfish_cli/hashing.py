@@ -0,0 +1,166 @@
+"""Computation of MD5 sums with a persistent cache.
+
+The cache is an SQLite database in the cache directory that maps the path, size,
+and modification time of a file to its MD5 sum such that unchanged files are not
+hashed again in later runs.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import typing
+
+from logzero import logger
+
+from varfish_cli.exceptions import Md5Mismatch
+
+#: Size of the buffer for reading files when hashing.
+HASH_BUFFER_SIZE = 8 * 1024 * 1024
+
+#: File name of the MD5 sum cache database in the cache directory.
+MD5_CACHE_FILENAME = "md5sums.sqlite3"
+
+
+def compute_md5(path: str, buffer_size: int = HASH_BUFFER_SIZE) -> str:
+    """Compute MD5 sum of the file at ``path`` and return it as hex digest."""
+    md5 = hashlib.md5()
+    buffer = bytearray(buffer_size)
+    view = memoryview(buffer)
+    with open(path, "rb", buffering=0) as inputf:
+        while True:
+            count = inputf.readinto(buffer)
+            if not count:
+                break
+            md5.update(view[:count])
+    return md5.hexdigest()
+
+
+class HashingReader:
+    """Wrapper for a binary file that computes the MD5 sum of the data as it is read.
+
+    When the end of the file is reached, the MD5 sum is compared to ``expected_md5``
+    and ``Md5Mismatch`` is raised on a difference.  This allows verifying a file while
+    uploading it, reading it only once.
+    """
+
+    def __init__(
+        self,
+        fileobj: typing.BinaryIO,
+        expected_md5: typing.Optional[str] = None,
+        callback: typing.Optional[typing.Callable[[int], None]] = None,
+    ):
+        #: The wrapped file.
+        self.fileobj = fileobj
+        #: The expected MD5 sum, if any.
+        self.expected_md5 = expected_md5
+        #: Called with the number of bytes of each read, e.g., to update a progress bar.
+        self.callback = callback
+        #: The MD5 sum as hex digest once the end of file has been reached.
+        self.md5: typing.Optional[str] = None
+        self._hash = hashlib.md5()
+
+    @property
+    def name(self) -> str:
+        return self.fileobj.name
+
+    def fileno(self) -> int:
+        return self.fileobj.fileno()
+
+    def tell(self) -> int:
+        return self.fileobj.tell()
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        """Seek to absolute ``offset``, hashing skipped data and rehashing on going back."""
+        if whence != os.SEEK_SET:
+            raise ValueError("HashingReader only supports absolute seeking")
+        if offset < self.fileobj.tell():
+            self.fileobj.seek(0)
+            self._hash = hashlib.md5()
+            self.md5 = None
+        while self.fileobj.tell() < offset:
+            data = self.fileobj.read(min(HASH_BUFFER_SIZE, offset - self.fileobj.tell()))
+            if not data:
+                break
+            self._hash.update(data)
+        return self.fileobj.tell()
+
+    def read(self, size: typing.Optional[int] = -1) -> bytes:
+        data = self.fileobj.read(size)
+        self._hash.update(data)
+        if self.callback is not None and data:
+            self.callback(len(data))
+        if size is None or size < 0 or not data:
+            self._finish()
+        return data
+
+    def _finish(self):
+        if self.md5 is not None:
+            return
+        self.md5 = self._hash.hexdigest()
+        if self.expected_md5 is not None and self.md5 != self.expected_md5.lower():
+            raise Md5Mismatch(
+                "MD5 sum of %s is %s but expected %s" % (self.name, self.md5, self.expected_md5)
+            )
+
+
+class Md5Cache:
+    """Persistent, thread-safe cache of MD5 sums keyed by path, size, and modification time."""
+
+    def __init__(self, path: str):
+        #: Path to the SQLite database.
+        self.path = os.path.expanduser(path)
+        self._lock = threading.Lock()
+        self._conn: typing.Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS md5sums "
+                "(path TEXT PRIMARY KEY, size INTEGER, mtime REAL, md5 TEXT)"
+            )
+        return self._conn
+
+    def get(self, path: str, size: int, mtime: float) -> typing.Optional[str]:
+        """Return cached MD5 sum or ``None`` if there is none or the file has changed."""
+        with self._lock:
+            row = (
+                self._connect()
+                .execute(
+                    "SELECT md5 FROM md5sums WHERE path = ? AND size = ? AND mtime = ?",
+                    (path, size, mtime),
+                )
+                .fetchone()
+            )
+        return row[0] if row else None
+
+    def put(self, path: str, size: int, mtime: float, md5: str):
+        """Store MD5 sum for the file."""
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO md5sums (path, size, mtime, md5) VALUES (?, ?, ?, ?)",
+                    (path, size, mtime, md5),
+                )
+
+    def md5(self, path: str) -> str:
+        """Return MD5 sum of the file at ``path``, computing and caching it if necessary."""
+        real_path = os.path.realpath(path)
+        stat = os.stat(real_path)
+        md5 = self.get(real_path, stat.st_size, stat.st_mtime)
+        if md5 is None:
+            logger.info("- computing MD5 sum of %s", path)
+            md5 = compute_md5(real_path)
+            self.put(real_path, stat.st_size, stat.st_mtime, md5)
+        else:
+            logger.debug("- using cached MD5 sum of %s", path)
+        return md5
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
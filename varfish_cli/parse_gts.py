@@ -0,0 +1,66 @@
+"""Code for parsing the JSON columns of the genotype TSV files.
+
+Strings in the JSON columns such as ``genotype`` and ``bam_stats`` are quoted with three
+double quotes instead of one.  Values of many rows are decoded from one joined string to
+save the per-row overhead.
+"""
+
+import json
+import re
+import typing
+
+#: Per-sample fields extracted from the ``genotype`` column by default.
+DEFAULT_FIELDS = ("gt", "dp", "gq")
+
+#: Number of values decoded in one pass.
+BATCH_SIZE = 1000
+
+_raw_decode = json.JSONDecoder().raw_decode
+
+#: JSON whitespace around values, except for the tab used to join them.
+_whitespace = re.compile(r"[ \n\r]*")
+
+
+def decode_json_col(value: str) -> typing.Any:
+    """Decode one value of a triple-quoted JSON column."""
+    return json.loads(value.replace('"""', '"'))
+
+
+def decode_json_cols(values: typing.Sequence[str]) -> typing.List[typing.Any]:
+    """Decode values of a triple-quoted JSON column, raise ``ValueError`` if one is invalid.
+
+    The values are joined by tabs, which cannot occur in TSV values, and each is decoded
+    from the joined string, so a value must end where the next one starts, apart from
+    surrounding whitespace as accepted by ``json.loads()``.
+    """
+    result = []
+    for offset in range(0, len(values), BATCH_SIZE):
+        batch = values[offset : offset + BATCH_SIZE]
+        text = "\t".join(batch).replace('"""', '"')
+        pos = 0
+        for _ in batch:
+            value, pos = _raw_decode(text, _whitespace.match(text, pos).end())
+            pos = _whitespace.match(text, pos).end()
+            if pos < len(text) and text[pos] != "\t":
+                raise ValueError("extra data at position %d" % pos)
+            result.append(value)
+            pos += 1
+    return result
+
+
+def decode_genotypes(
+    values: typing.Sequence[str], fields: typing.Iterable[str] = DEFAULT_FIELDS
+) -> typing.List[typing.Dict[str, typing.Dict[str, typing.Any]]]:
+    """Decode values of the ``genotype`` column keeping only ``fields`` of each sample.
+
+    Missing fields are ``None``.  Raise ``ValueError`` if a value is not a JSON object.
+    """
+    fields = tuple(fields)
+    result = []
+    for value in decode_json_cols(values):
+        if not isinstance(value, dict) or not all(isinstance(v, dict) for v in value.values()):
+            raise ValueError("genotype value is not an object of objects: %r" % value)
+        result.append(
+            {sample: {field: gts.get(field) for field in fields} for sample, gts in value.items()}
+        )
+    return result
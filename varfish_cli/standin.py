@@ -0,0 +1,556 @@
+"""Local stand-in for the VarFish Server API for offline testing and benchmarking.
+
+The server keeps all data in memory and implements the end points used by
+``varfish_cli.api.case``, ``varfish_cli.api.project``, and ``varfish_cli.api.varannos``.
+Latency and errors can be injected to model a real server.  Run it with::
+
+    python -m varfish_cli.standin --port 8080 --latency 0.05 --error-rate 0.01
+"""
+
+import base64
+import datetime
+import email.parser
+import email.policy
+import gzip
+import http.server
+import json
+import random
+import re
+import threading
+import time
+import typing
+import urllib.parse
+import uuid
+
+from logzero import logger
+import pydantic
+import typer
+
+from varfish_cli.api import case, project, varannos
+from varfish_cli.api.resumable import TUS_VERSION
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+#: Default page size of paginated end points.
+DEFAULT_PAGE_SIZE = 100
+#: Path prefix of the URLs of chunked uploads.
+UPLOAD_PATH = "/standin/uploads/"
+
+
+class StandInOptions(pydantic.BaseModel):
+    """Settings for the stand-in server."""
+
+    model_config = pydantic.ConfigDict(frozen=True)
+
+    #: Host to listen on.
+    host: str = "127.0.0.1"
+    #: Port to listen on, ``0`` to pick a free port.
+    port: int = 0
+    #: Latency in seconds added to each response.
+    latency: float = 0.0
+    #: Maximal random jitter in seconds added to the latency.
+    jitter: float = 0.0
+    #: Fraction of requests that fail with ``error_status``.
+    error_rate: float = 0.0
+    #: Status code of injected errors.
+    error_status: int = 503
+    #: Seed for the random number generator, for reproducible error injection.
+    seed: typing.Optional[int] = None
+    #: Whether file end points accept resumable chunked uploads, see ``varfish_cli.api.resumable``.
+    chunked_uploads: bool = False
+
+
+class Resource(pydantic.BaseModel):
+    """A collection of objects below a parent object, e.g., case import infos of a project."""
+
+    model_config = pydantic.ConfigDict(frozen=True)
+
+    #: Name of the collection.
+    name: str
+    #: End point for listing and creating, with the parent UUID as the only parameter.
+    list_endpoint: typing.Optional[str]
+    #: End point for retrieving, updating, and destroying, with the object UUID as last parameter.
+    detail_endpoint: typing.Optional[str]
+    #: Attribute of the objects that holds the parent UUID, if any.
+    parent_field: typing.Optional[str] = None
+    #: Whether the list end point is paginated.
+    paginated: bool = False
+    #: Whether objects are created by uploading a file.
+    upload: bool = False
+
+
+#: The resources implemented by the stand-in server.
+RESOURCES = (
+    Resource(
+        name="project",
+        list_endpoint=project.ENDPOINT_PROJECT_LIST,
+        detail_endpoint=project.ENDPOINT_PROJECT_RETRIEVE,
+    ),
+    Resource(
+        name="case",
+        list_endpoint=case.ENDPOINT_CASE_LIST,
+        detail_endpoint=case.ENDPOINT_CASE_RETRIEVE,
+        paginated=True,
+    ),
+    Resource(
+        name="caseimportinfo",
+        list_endpoint=case.ENDPOINT_CASE_IMPORT_INFO_LIST,
+        detail_endpoint=case.ENDPOINT_CASE_IMPORT_INFO_UPDATE,
+        parent_field="project",
+    ),
+    Resource(
+        name="variantsetimportinfo",
+        list_endpoint=case.ENDPOINT_VARIANT_SET_IMPORT_INFO_LIST,
+        detail_endpoint=case.ENDPOINT_VARIANT_SET_IMPORT_INFO_UPDATE,
+        parent_field="case_import_info",
+    ),
+    Resource(
+        name="bamqcfile",
+        list_endpoint=case.ENDPOINT_BAM_QC_FILE_LIST,
+        detail_endpoint=case.ENDPOINT_BAM_QC_FILE_DESTROY,
+        parent_field="case_import_info",
+        upload=True,
+    ),
+    Resource(
+        name="casegeneannotationfile",
+        list_endpoint=case.ENDPOINT_CASE_GENE_ANNOTATION_FILE_LIST,
+        detail_endpoint=case.ENDPOINT_CASE_GENE_ANNOTATION_FILE_DESTROY,
+        parent_field="case_import_info",
+        upload=True,
+    ),
+    Resource(
+        name="genotypefile",
+        list_endpoint=case.ENDPOINT_GENOTYPE_FILE_LIST,
+        detail_endpoint=case.ENDPOINT_GENOTYPE_FILE_DESTROY,
+        upload=True,
+    ),
+    Resource(
+        name="effectsfile",
+        list_endpoint=case.ENDPOINT_EFFECTS_FILE_LIST,
+        detail_endpoint=case.ENDPOINT_EFFECTS_FILE_DESTROY,
+        upload=True,
+    ),
+    Resource(
+        name="databaseinfofile",
+        list_endpoint=case.ENDPOINT_DB_INFO_FILE_LIST,
+        detail_endpoint=case.ENDPOINT_DB_INFO_FILE_DESTROY,
+        upload=True,
+    ),
+    Resource(
+        name="varannoset",
+        list_endpoint=varannos.ENDPOINT_VARANNOSET_LISTCREATE,
+        detail_endpoint=varannos.ENDPOINT_VARANNOSET_RETRIEVEUPDATEDESTROY,
+        parent_field="project",
+    ),
+    Resource(
+        name="varannosetentry",
+        list_endpoint=varannos.ENDPOINT_VARANNOSETENTRY_LISTCREATE,
+        detail_endpoint=varannos.ENDPOINT_VARANNOSETENTRY_RETRIEVEUPDATEDESTROY,
+        parent_field="varannoset",
+    ),
+)
+
+
+def _endpoint_regex(endpoint: str) -> typing.Pattern:
+    """Convert end point format string into regular expression with one group per UUID."""
+    pattern = re.sub(r"\\{[a-z_]+\\}", "([0-9a-f-]+)", re.escape(endpoint.rstrip("/")))
+    return re.compile(f"^{pattern}/?$")
+
+
+def _now() -> str:
+    return datetime.datetime.now(datetime.timezone.utc).isoformat()
+
+
+class StandInStore:
+    """Thread-safe in-memory storage of the objects by resource name."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        #: Objects by resource name and UUID, with their parent UUID.
+        self.objects: typing.Dict[str, typing.Dict[str, typing.Tuple[str, dict]]] = {
+            resource.name: {} for resource in RESOURCES
+        }
+
+    def add(self, resource: str, parent: typing.Optional[str], obj: dict) -> dict:
+        """Add ``obj`` below ``parent``, filling in UUID and dates as needed."""
+        obj = {
+            **obj,
+            "sodar_uuid": obj.get("sodar_uuid") or str(uuid.uuid4()),
+            "date_created": obj.get("date_created") or _now(),
+            "date_modified": obj.get("date_modified") or _now(),
+        }
+        with self.lock:
+            self.objects[resource][obj["sodar_uuid"]] = (parent, obj)
+        return obj
+
+    def add_project(self, title: str = "Project", **kwargs: typing.Any) -> dict:
+        """Add a project and return it."""
+        obj = {
+            "sodar_uuid": str(uuid.uuid4()),
+            "parent": None,
+            "title": title,
+            "type": "PROJECT",
+            "description": None,
+            "readme": None,
+            "public_guest_access": False,
+            "archive": False,
+            **kwargs,
+        }
+        with self.lock:
+            self.objects["project"][obj["sodar_uuid"]] = (None, obj)
+        return obj
+
+    def add_case(self, project_uuid: str, name: str, **kwargs: typing.Any) -> dict:
+        """Add a singleton case to the project and return it."""
+        return self.add(
+            "case",
+            project_uuid,
+            {
+                "name": name,
+                "index": name,
+                "pedigree": [
+                    {
+                        "name": name,
+                        "father": "0",
+                        "mother": "0",
+                        "sex": 1,
+                        "affected": 2,
+                        "has_gt_entries": True,
+                    }
+                ],
+                **kwargs,
+            },
+        )
+
+
+class StandInServer:
+    """In-memory stand-in for the VarFish Server API, served from a background thread.
+
+    Use as a context manager; ``url`` then points to the running server.
+    """
+
+    def __init__(self, options: typing.Optional[StandInOptions] = None):
+        #: Server settings.
+        self.options = options or StandInOptions()
+        #: The stored objects.
+        self.store = StandInStore()
+        #: Number of requests handled, including injected errors.
+        self.request_count = 0
+        #: Chunked uploads in progress, by ID.
+        self.uploads: typing.Dict[str, dict] = {}
+        #: Number of bytes received in chunks of resumable uploads.
+        self.upload_bytes_received = 0
+        self._random = random.Random(self.options.seed)
+        self._lock = threading.Lock()
+        self._routes = []
+        for resource in RESOURCES:
+            if resource.list_endpoint:
+                self._routes.append((_endpoint_regex(resource.list_endpoint), resource, False))
+            if resource.detail_endpoint:
+                self._routes.append((_endpoint_regex(resource.detail_endpoint), resource, True))
+        self._httpd = http.server.ThreadingHTTPServer(
+            (self.options.host, self.options.port), _StandInRequestHandler
+        )
+        self._httpd.daemon_threads = True
+        self._httpd.standin = self
+        self._thread: typing.Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def serve_forever(self):
+        self._httpd.serve_forever()
+
+    def __enter__(self) -> "StandInServer":
+        self.start()
+        return self
+
+    def __exit__(self, *args: typing.Any):
+        self.stop()
+
+    def _inject(self) -> typing.Optional[int]:
+        """Sleep for the configured latency and return error status to inject, if any."""
+        with self._lock:
+            self.request_count += 1
+            delay = self.options.latency + self._random.uniform(0, self.options.jitter)
+            fail = self._random.random() < self.options.error_rate
+        if delay > 0:
+            time.sleep(delay)
+        return self.options.error_status if fail else None
+
+    def handle(
+        self, method: str, path: str, query: typing.Dict[str, typing.List[str]], data: dict
+    ) -> typing.Tuple[int, typing.Any]:
+        """Handle API request and return status code and JSON response."""
+        route = self._route(path)
+        if route is None:
+            return 404, {"detail": "Not found."}
+        resource, is_detail, key = route
+        objects = self.store.objects[resource.name]
+        if not is_detail:
+            if method == "GET":
+                with self.store.lock:
+                    items = [o for p, o in objects.values() if p == key]
+                if resource.paginated:
+                    return 200, self._paginate(path, query, items)
+                return 200, items
+            elif method == "POST":
+                if resource.parent_field:
+                    data[resource.parent_field] = key
+                return 201, self.store.add(resource.name, key, data)
+        else:
+            with self.store.lock:
+                parent, obj = objects.get(key, (None, None))
+                if obj is None:
+                    return 404, {"detail": "Not found."}
+                if method == "GET":
+                    return 200, obj
+                elif method in ("PUT", "PATCH"):
+                    obj = {**obj, **data, "sodar_uuid": key, "date_modified": _now()}
+                    objects[key] = (parent, obj)
+                    return 200, obj
+                elif method == "DELETE":
+                    del objects[key]
+                    return 204, None
+        return 405, {"detail": f'Method "{method}" not allowed.'}
+
+    def _route(self, path: str) -> typing.Optional[typing.Tuple[Resource, bool, str]]:
+        """Return resource, whether ``path`` is a detail end point, and the last UUID."""
+        for regex, resource, is_detail in self._routes:
+            match = regex.match(path)
+            if match:
+                return resource, is_detail, match.groups()[-1] if match.groups() else None
+        return None
+
+    def handle_upload(
+        self, method: str, path: str, headers: typing.Mapping[str, str], body: bytes
+    ) -> typing.Tuple[int, typing.Dict[str, str], typing.Any]:
+        """Handle request of the tus protocol and return status code, headers, and JSON response."""
+        tus_headers = {"Tus-Resumable": TUS_VERSION, "Cache-Control": "no-store"}
+        if method == "OPTIONS":
+            route = self._route(path)
+            if route is None:
+                return 404, {}, {"detail": "Not found."}
+            elif self.options.chunked_uploads and route[0].upload and not route[1]:
+                return 204, {**tus_headers, "Tus-Version": TUS_VERSION}, None
+            return 200, {}, {"name": route[0].name}
+        elif method == "POST":
+            route = self._route(path)
+            if route is None or not route[0].upload or route[1]:
+                return 404, {}, {"detail": "Not found."}
+            upload_id = str(uuid.uuid4())
+            fields = {}
+            for item in filter(None, headers.get("Upload-Metadata", "").split(",")):
+                key, value = item.strip().split(" ")
+                fields[key] = base64.b64decode(value).decode("utf-8")
+            with self._lock:
+                self.uploads[upload_id] = {
+                    "resource": route[0],
+                    "parent": route[2],
+                    "length": int(headers["Upload-Length"]),
+                    "offset": 0,
+                    "fields": fields,
+                }
+            return 201, {**tus_headers, "Location": f"{UPLOAD_PATH}{upload_id}/"}, None
+        with self._lock:
+            upload = self.uploads.get(path[len(UPLOAD_PATH) :].strip("/"))
+            if upload is None:
+                return 404, {}, {"detail": "Not found."}
+            if method == "HEAD":
+                return (
+                    200,
+                    {
+                        **tus_headers,
+                        "Upload-Offset": str(upload["offset"]),
+                        "Upload-Length": str(upload["length"]),
+                    },
+                    None,
+                )
+            elif method != "PATCH":
+                return 405, {}, {"detail": f'Method "{method}" not allowed.'}
+            elif int(headers.get("Upload-Offset", -1)) != upload["offset"]:
+                return 409, tus_headers, {"detail": "Offset mismatch."}
+            upload["offset"] += len(body)
+            self.upload_bytes_received += len(body)
+            tus_headers["Upload-Offset"] = str(upload["offset"])
+            if upload["offset"] < upload["length"]:
+                return 204, tus_headers, None
+            del self.uploads[path[len(UPLOAD_PATH) :].strip("/")]
+        resource = upload["resource"]
+        data = {**upload["fields"], "file": upload["length"]}
+        if resource.parent_field:
+            data[resource.parent_field] = upload["parent"]
+        return 200, tus_headers, self.store.add(resource.name, upload["parent"], data)
+
+    def _paginate(self, path: str, query: typing.Dict[str, typing.List[str]], items: list):
+        page_size = int(query.get("page_size", [DEFAULT_PAGE_SIZE])[0])
+        page = int(query.get("page", [1])[0])
+        results = items[(page - 1) * page_size : page * page_size]
+        if page * page_size < len(items):
+            next_query = urllib.parse.urlencode({"page": page + 1, "page_size": page_size})
+            next_url = f"{self.url}{path}?{next_query}"
+        else:
+            next_url = None
+        return {"count": len(items), "next": next_url, "previous": None, "results": results}
+
+
+def _decode_body(content_type: str, body: bytes) -> dict:
+    """Decode JSON, multipart, or form request ``body``; uploaded files are replaced by their size."""
+    if not body:
+        return {}
+    elif content_type.startswith("application/json"):
+        return json.loads(body)
+    elif content_type.startswith("multipart/form-data"):
+        message = email.parser.BytesParser(policy=email.policy.HTTP).parsebytes(
+            f"Content-Type: {content_type}\r\n\r\n".encode("utf-8") + body
+        )
+        return {
+            part.get_param("name", header="content-disposition"): (
+                part.get_content()
+                if part.get_filename() is None
+                else len(part.get_payload(decode=True))
+            )
+            for part in message.iter_parts()
+        }
+    else:
+        return {
+            k: v[0] if len(v) == 1 else v
+            for k, v in urllib.parse.parse_qs(body.decode("utf-8")).items()
+        }
+
+
+class _StandInRequestHandler(http.server.BaseHTTPRequestHandler):
+    """Request handler that delegates to the ``StandInServer`` in ``self.server.standin``."""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, format: str, *args: typing.Any):
+        logger.debug("stand-in server: " + format, *args)
+
+    def _respond(
+        self,
+        status: int,
+        payload: typing.Any,
+        extra_headers: typing.Optional[typing.Dict[str, str]] = None,
+    ):
+        body = b"" if payload is None or self.command == "HEAD" else json.dumps(payload).encode()
+        headers = {"Content-Type": "application/json", **(extra_headers or {})}
+        if status == self.server.standin.options.error_status:
+            headers["Retry-After"] = "0"
+        if len(body) > 1024 and "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = gzip.compress(body)
+            headers["Content-Encoding"] = "gzip"
+        headers["Content-Length"] = str(len(body))
+        self.send_response(status)
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_body(self) -> bytes:
+        if self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int(self.rfile.readline().split(b";")[0], 16)
+                chunks.append(self.rfile.read(size))
+                self.rfile.readline()  # CRLF after chunk
+                if not size:
+                    break
+            body = b"".join(chunks)
+        else:
+            body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        encoding = self.headers.get("Content-Encoding")
+        if encoding == "gzip":
+            return gzip.decompress(body)
+        elif encoding == "zstd" and zstandard is not None:
+            return zstandard.ZstdDecompressor().decompress(body)
+        else:
+            return body
+
+    def _dispatch(self):
+        standin = self.server.standin
+        body = self._read_body() if self.command in ("POST", "PUT", "PATCH") else b""
+        if not self.headers.get("Authorization", "").startswith("Token "):
+            self._respond(401, {"detail": "Authentication credentials were not provided."})
+            return
+        error_status = standin._inject()
+        if error_status:
+            self._respond(error_status, {"detail": "Injected error."})
+            return
+        url = urllib.parse.urlsplit(self.path)
+        if self.command in ("HEAD", "OPTIONS") or "Tus-Resumable" in self.headers:
+            status, headers, payload = standin.handle_upload(
+                self.command, url.path, self.headers, body
+            )
+            self._respond(status, payload, headers)
+            return
+        data = _decode_body(self.headers.get("Content-Type", ""), body)
+        status, payload = standin.handle(
+            self.command, url.path, urllib.parse.parse_qs(url.query), data
+        )
+        self._respond(status, payload)
+
+    do_GET = do_HEAD = do_OPTIONS = do_POST = do_PUT = do_PATCH = do_DELETE = _dispatch
+
+
+#: ``Typer`` object for running the stand-in server.
+app = typer.Typer(no_args_is_help=False, pretty_exceptions_enable=False)
+
+
+@app.command()
+def main(
+    host: typing.Annotated[str, typer.Option(help="Host to listen on")] = "127.0.0.1",
+    port: typing.Annotated[int, typer.Option(help="Port to listen on")] = 8080,
+    latency: typing.Annotated[float, typer.Option(help="Latency of responses in seconds")] = 0.0,
+    jitter: typing.Annotated[float, typer.Option(help="Maximal random extra latency")] = 0.0,
+    error_rate: typing.Annotated[float, typer.Option(help="Fraction of failing requests")] = 0.0,
+    error_status: typing.Annotated[int, typer.Option(help="Status of failing requests")] = 503,
+    seed: typing.Annotated[typing.Optional[int], typer.Option(help="Random seed")] = None,
+    cases: typing.Annotated[int, typer.Option(help="Number of cases in the test project")] = 0,
+    chunked_uploads: typing.Annotated[
+        bool, typer.Option(help="Accept resumable chunked uploads")
+    ] = False,
+):
+    """Run the stand-in VarFish server with one test project until interrupted."""
+    server = StandInServer(
+        StandInOptions(
+            host=host,
+            port=port,
+            latency=latency,
+            jitter=jitter,
+            error_rate=error_rate,
+            error_status=error_status,
+            seed=seed,
+            chunked_uploads=chunked_uploads,
+        )
+    )
+    test_project = server.store.add_project("Test Project")
+    for i in range(cases):
+        server.store.add_case(test_project["sodar_uuid"], f"case-{i}")
+    logger.info("serving at %s, test project %s", server.url, test_project["sodar_uuid"])
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:  # pragma: no cover
+        pass
+
+
+if __name__ == "__main__":  # pragma: no cover
+    app()